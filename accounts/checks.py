@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backends whose entries never leave the process that wrote them
+_PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Token, MLflow and notification caching rely on one cache for the web and qcluster processes."""
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if settings.DEBUG or backend not in _PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f"The default cache ({backend}) is not shared between processes.",
+            hint=(
+                "Refreshed Keycloak tokens, MLflow cache generations and "
+                "notification invalidations would only reach the process "
+                "that made them. Set REDIS_URL or use DatabaseCache."
+            ),
+            id="accounts.W001",
+        )
+    ]
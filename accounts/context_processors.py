@@ -1,5 +1,14 @@
-from django.urls import reverse
-from .models import Notification, Profile
+from django.utils.functional import SimpleLazyObject
+
+from .models import Profile
+from .services.notifications import notification_summary
+
+
+def _current_user_profile(user):
+    try:
+        return user.profile
+    except Profile.DoesNotExist:
+        return None
 
 
 def header_notifications(request):
@@ -8,52 +17,14 @@ def header_notifications(request):
             "header_notifications": [],
             "header_notifications_count": 0,
             "current_user_profile": None,
+            "current_user_avatar_url": "",
         }
 
-    notifications = []
-
-    try:
-        profile = request.user.profile
-    except Profile.DoesNotExist:
-        profile = None
-
-    unread = Notification.objects.filter(recipient=request.user, is_read=False)
-    for n in unread:
-        notifications.append(
-            {
-                "message": n.message,
-                "url": reverse("read_notification", args=[n.id]),
-                "icon": n.icon,
-            }
-        )
-
-    team_missing = profile is None or profile.team_id is None
-    if team_missing:
-        notifications.append(
-            {
-                "message": "Add Team to collaborate with people",
-                "url": reverse("team_management"),
-                "icon": "users",
-            }
-        )
-
-    profile_details_missing = (
-        profile is None
-        or not profile.position
-        or not profile.birth_date
-        or not profile.bio
-    )
-    if profile_details_missing:
-        notifications.append(
-            {
-                "message": "Complete your profile for better experience",
-                "url": reverse("profile"),
-                "icon": "user",
-            }
-        )
-
+    summary = notification_summary(request.user)
     return {
-        "header_notifications": notifications,
-        "header_notifications_count": len(notifications),
-        "current_user_profile": profile,
+        "header_notifications": summary["items"],
+        "header_notifications_count": summary["count"],
+        # Only loaded if a template actually uses it; the header itself reads the cached avatar URL
+        "current_user_profile": SimpleLazyObject(lambda: _current_user_profile(request.user)),
+        "current_user_avatar_url": summary["avatar_url"],
     }
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from accounts.services.notifications import prune_notifications
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete old notifications in batches. Runs daily as the 'prune_notifications' django-q schedule; "
+        "use this command for one-off cleanups with different retention."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--read-days", type=int, default=30, help="Keep read notifications this many days.")
+        parser.add_argument("--unread-days", type=int, default=180, help="Keep unread notifications this many days.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows deleted per statement.")
+
+    def handle(self, *args, **options):
+        deleted = prune_notifications(
+            read_days=options["read_days"],
+            unread_days=options["unread_days"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} notifications."))
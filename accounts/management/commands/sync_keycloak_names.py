@@ -0,0 +1,38 @@
+from itertools import batched
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services.keycloak_user_sync import KeycloakUserSyncClient
+
+
+class Command(BaseCommand):
+    help = (
+        "Push every Keycloak user's first and last name from this application to Keycloak. "
+        "Users are sent in batches of concurrent admin API calls that share one service-account token."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200, help="Users loaded and synced per batch.")
+
+    def handle(self, *args, **options):
+        client = KeycloakUserSyncClient()
+        if not client.token:
+            raise CommandError("Keycloak user sync client is not authenticated; check KEYCLOAK_USER_SYNC_* settings.")
+
+        users = (
+            get_user_model().objects
+            .filter(socialaccount__provider="keycloak")
+            .distinct()
+            .order_by("pk")
+            .only("pk", "first_name", "last_name")
+        )
+        synced = failed = 0
+        for batch in batched(users.iterator(chunk_size=options["batch_size"]), options["batch_size"]):
+            for user_id, result in client.sync_user_names(batch).items():
+                if result.get("error"):
+                    failed += 1
+                    self.stderr.write(f"User {user_id}: {result['error']}")
+                else:
+                    synced += 1
+        self.stdout.write(self.style.SUCCESS(f"Synced {synced} users to Keycloak ({failed} failed)."))
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.get_or_create(
+        name="prune_notifications",
+        defaults={
+            "func": "accounts.services.notifications.prune_notifications",
+            "schedule_type": "D",
+            "repeats": -1,
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name="prune_notifications").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_notification_unread_index"),
+        ("django_q", "0018_task_success_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
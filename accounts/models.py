@@ -4,10 +4,11 @@ from django.core.exceptions import ValidationError
 from django.dispatch import receiver
 from django.conf import settings
 import os, uuid
+from functools import partial
 
 from django.db import models, transaction
 from django.db.models import Q
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.utils import timezone
 
 from core.models import TimeStampedModel
@@ -211,6 +212,7 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['recipient', 'is_read', 'created_at'], name='notification_unread_idx')]
 
     def __str__(self):
         return f"Notification for {self.recipient}: {self.message}"
@@ -238,4 +240,33 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def save_user_profile(sender, instance, **kwargs):
     if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+        instance.profile.save()
+
+
+# Drop the cached Keycloak token whenever allauth stores or removes one (login, refresh, logout)
+@receiver(post_save, sender='socialaccount.SocialToken')
+@receiver(post_delete, sender='socialaccount.SocialToken')
+def invalidate_cached_keycloak_token(sender, instance, **kwargs):
+    from allauth.socialaccount.models import SocialAccount
+    from accounts.services.tokens import invalidate_user_token_cache
+
+    user_id = SocialAccount.objects.filter(pk=instance.account_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        invalidate_user_token_cache(user_id)
+
+
+# Keep the cached header summary in step with notifications and profile details.
+# Dropped on commit, like create_notifications does, so a concurrent render
+# cannot re-cache the state from before the change.
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_notification_summary_for_recipient(sender, instance, **kwargs):
+    from accounts.services.notifications import invalidate_notification_summary
+    transaction.on_commit(partial(invalidate_notification_summary, instance.recipient_id))
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_notification_summary_for_profile(sender, instance, **kwargs):
+    from accounts.services.notifications import invalidate_notification_summary
+    transaction.on_commit(partial(invalidate_notification_summary, instance.user_id))
@@ -2,9 +2,107 @@ import requests
 from django.conf import settings
 from allauth.socialaccount.models import SocialAccount
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.services import get_client
 
 logger = logging.getLogger(__name__)
 
+# Renew the service-account token this many seconds before Keycloak expires it
+_TOKEN_EXPIRY_MARGIN = 30
+
+
+class ServiceTokenManager:
+    """Process-wide cache of a Keycloak service-account (client_credentials) token.
+
+    The token is reused until shortly before its expires_in and renewed by a
+    single thread while the others wait for it. Requests go through the
+    shared, pooled "keycloak" HTTP client.
+    """
+
+    def __init__(self, base_url, realm, client_id, client_secret):
+        self.token_url = f"{base_url}/realms/{realm}/protocol/openid-connect/token"
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_token(self):
+        if self._token and time.monotonic() < self._expires_at:
+            return self._token
+        with self._lock:
+            if not self._token or time.monotonic() >= self._expires_at:
+                self._fetch()
+            return self._token
+
+    def invalidate(self, token):
+        """Forget a token Keycloak rejected, unless another thread already replaced it."""
+        with self._lock:
+            if self._token == token:
+                self._token = None
+
+    def _fetch(self):
+        payload = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "client_credentials",
+        }
+        try:
+            # client_credentials grants are stateless, so this POST may be retried.
+            client = get_client("keycloak")
+            response = client.post(self.token_url, data=payload, retries=client.retries)
+            response.raise_for_status()  # Raise an exception for bad status codes
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            status = e.response.status_code if e.response is not None else "N/A"
+            logger.error(f"Error getting Keycloak service account token: {type(e).__name__} (status={status})")
+            self._token = None
+            return
+        self._token = data.get("access_token")
+        expires_in = int(data.get("expires_in") or 60)
+        self._expires_at = time.monotonic() + max(0, expires_in - _TOKEN_EXPIRY_MARGIN)
+
+
+_TOKEN_MANAGERS = {}
+_TOKEN_MANAGERS_LOCK = threading.Lock()
+
+
+def get_service_token_manager(base_url, realm, client_id, client_secret):
+    key = (base_url, realm, client_id, client_secret)
+    with _TOKEN_MANAGERS_LOCK:
+        if key not in _TOKEN_MANAGERS:
+            _TOKEN_MANAGERS[key] = ServiceTokenManager(base_url, realm, client_id, client_secret)
+        return _TOKEN_MANAGERS[key]
+
+
+def reset_service_token_managers():
+    """Drop cached service tokens (tests, credential rotation)."""
+    with _TOKEN_MANAGERS_LOCK:
+        _TOKEN_MANAGERS.clear()
+
+
+def _admin_concurrency():
+    try:
+        return max(1, int(os.getenv("KEYCLOAK_ADMIN_CONCURRENCY", "8")))
+    except ValueError:
+        return 8
+
+
+def _name_payload(user_data):
+    # Keycloak expects specific field names
+    payload = {
+        "firstName": user_data.get('first_name'),
+        "lastName": user_data.get('last_name'),
+    }
+
+    # Remove keys with None values so we don't accidentally clear fields in Keycloak
+    return {k: v for k, v in payload.items() if v is not None}
+
+
 class KeycloakUserSyncClient:
     def __init__(self):
         try:
@@ -13,27 +111,42 @@ class KeycloakUserSyncClient:
             self.realm = config['REALM']
             self.client_id = config['CLIENT_ID']
             self.client_secret = config['CLIENT_SECRET']
-            self.token = self._get_service_account_token()
+            self.tokens = get_service_token_manager(self.base_url, self.realm, self.client_id, self.client_secret)
         except (AttributeError, KeyError) as e:
             logger.error(f"Keycloak user sync client is not configured properly in settings.py: {e}")
-            self.token = None
+            self.tokens = None
 
+    @property
+    def token(self):
+        return self.tokens.get_token() if self.tokens else None
 
-    def _get_service_account_token(self):
-        token_url = f"{self.base_url}/realms/{self.realm}/protocol/openid-connect/token"
-        payload = {
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "grant_type": "client_credentials",
-        }
+    def _admin_put(self, url, json):
+        """PUT to the admin API, renewing the service token once if Keycloak rejects it."""
+        for attempt in range(2):
+            token = self.token
+            if not token:
+                raise requests.exceptions.RequestException("Cannot get service account token.")
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            }
+            response = get_client("keycloak").put(url, headers=headers, json=json)
+            if response.status_code == 401 and attempt == 0:
+                self.tokens.invalidate(token)
+                continue
+            response.raise_for_status()
+            return response
+
+    def _update_keycloak_user(self, user_id, keycloak_user_id, payload):
+        user_url = f"{self.base_url}/admin/realms/{self.realm}/users/{keycloak_user_id}"
         try:
-            response = requests.post(token_url, data=payload)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            return response.json().get("access_token")
+            self._admin_put(user_url, payload)
+            logger.info(f"Successfully updated user {user_id} in Keycloak.")
+            return {"success": True}
         except requests.exceptions.RequestException as e:
-            status = e.response.status_code if e.response is not None else "N/A"
-            logger.error(f"Error getting Keycloak service account token: {type(e).__name__} (status={status})")
-            return None
+            status = e.response.status_code if e.response is not None else "No response"
+            logger.error(f"Error updating user {user_id} in Keycloak: {type(e).__name__} (status={status})")
+            return {"error": f"Failed to update user in Keycloak: {e}"}
 
     def update_user(self, user, user_data):
         if not self.token:
@@ -47,33 +160,45 @@ class KeycloakUserSyncClient:
             logger.warning(f"Cannot update Keycloak user {user.id}: SocialAccount for Keycloak not found.")
             return {"error": "User's SocialAccount for Keycloak not found."}
 
-        user_url = f"{self.base_url}/admin/realms/{self.realm}/users/{keycloak_user_id}"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
+        payload = _name_payload(user_data)
+        if not payload:
+            return {"success": True, "message": "No data to update."} # Nothing to do
 
-        # Keycloak expects specific field names
-        payload = {
-            "firstName": user_data.get('first_name'),
-            "lastName": user_data.get('last_name'),
-        }
+        return self._update_keycloak_user(user.id, keycloak_user_id, payload)
 
-        # Remove keys with None values so we don't accidentally clear fields in Keycloak
-        payload = {k: v for k, v in payload.items() if v is not None}
+    def sync_user_names(self, users, max_workers=None):
+        """Push first/last names of many users to Keycloak concurrently.
 
-        if not payload:
-            return {"success": True, "message": "No data to update."} # Nothing to do
+        Keycloak ids are resolved in one query up front; the admin calls then
+        run on a bounded thread pool (KEYCLOAK_ADMIN_CONCURRENCY) sharing the
+        cached service token. Returns {user_id: result} like update_user.
+        """
+        users = list(users)
+        if not self.token:
+            logger.error("Cannot sync Keycloak users: user sync client is not authenticated.")
+            return {user.id: {"error": "Authentication failed. Cannot get service account token."} for user in users}
 
-        try:
-            response = requests.put(user_url, headers=headers, json=payload)
-            response.raise_for_status()
-            logger.info(f"Successfully updated user {user.id} in Keycloak.")
-            return {"success": True}
-        except requests.exceptions.RequestException as e:
-            status = e.response.status_code if e.response is not None else "No response"
-            logger.error(f"Error updating user {user.id} in Keycloak: {type(e).__name__} (status={status})")
-            return {"error": f"Failed to update user in Keycloak: {e}"}
+        keycloak_ids = dict(
+            SocialAccount.objects
+            .filter(user__in=users, provider='keycloak')
+            .values_list('user_id', 'uid')
+        )
+        results = {}
+        jobs = []
+        for user in users:
+            payload = _name_payload({"first_name": user.first_name, "last_name": user.last_name})
+            if user.id not in keycloak_ids:
+                results[user.id] = {"error": "User's SocialAccount for Keycloak not found."}
+            elif not payload:
+                results[user.id] = {"success": True, "message": "No data to update."}
+            else:
+                jobs.append((user.id, keycloak_ids[user.id], payload))
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(max_workers or _admin_concurrency(), len(jobs))) as pool:
+                for (user_id, _, _), result in zip(jobs, pool.map(lambda job: self._update_keycloak_user(*job), jobs)):
+                    results[user_id] = result
+        return results
 
     def send_reset_password_email(self, user):
         """Send a password reset email to the user via Keycloak's execute-actions-email endpoint."""
@@ -89,15 +214,10 @@ class KeycloakUserSyncClient:
             return {"error": "User's SocialAccount for Keycloak not found."}
 
         url = f"{self.base_url}/admin/realms/{self.realm}/users/{keycloak_user_id}/execute-actions-email"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
 
         try:
-            # HTTP PUT request at Keycloak Admin API  
-            response = requests.put(url, headers=headers, json=["UPDATE_PASSWORD"])  # UPDATE_PASSWORD = Keycloak alias
-            response.raise_for_status()
+            # HTTP PUT request at Keycloak Admin API
+            self._admin_put(url, ["UPDATE_PASSWORD"])  # UPDATE_PASSWORD = Keycloak alias
             logger.info(f"Successfully sent reset password email to user {user.id}.")
             return {"success": True}
         except requests.exceptions.RequestException as e:
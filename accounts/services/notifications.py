@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Notification, Profile
+
+__all__ = [
+    "HEADER_NOTIFICATIONS_LIMIT",
+    "create_notifications",
+    "invalidate_notification_summary",
+    "mark_notifications_read",
+    "notification_summary",
+    "notify_project",
+    "notify_team",
+    "notify_users",
+    "prune_notifications",
+]
+
+# Unread notifications rendered in the header dropdown and returned by the poll endpoint
+HEADER_NOTIFICATIONS_LIMIT = 10
+SUMMARY_CACHE_TTL = 300
+
+
+def _summary_key(user_id) -> str:
+    return f"notifications:summary:{user_id}"
+
+
+def invalidate_notification_summary(*user_ids) -> None:
+    cache.delete_many([_summary_key(user_id) for user_id in user_ids])
+
+
+def _build_summary(user) -> dict:
+    profile = Profile.objects.filter(user=user).first()
+
+    unread = Notification.objects.filter(recipient=user, is_read=False)
+    latest = list(unread.values("id", "message", "icon", "created_at")[:HEADER_NOTIFICATIONS_LIMIT])
+    unread_count = len(latest) if len(latest) < HEADER_NOTIFICATIONS_LIMIT else unread.count()
+
+    items = [
+        {"message": n["message"], "url": reverse("read_notification", args=[n["id"]]), "icon": n["icon"]}
+        for n in latest
+    ]
+
+    if profile is None or profile.team_id is None:
+        items.append(
+            {
+                "message": "Add Team to collaborate with people",
+                "url": reverse("team_management"),
+                "icon": "users",
+            }
+        )
+
+    profile_details_missing = (
+        profile is None
+        or not profile.position
+        or not profile.birth_date
+        or not profile.bio
+    )
+    if profile_details_missing:
+        items.append(
+            {
+                "message": "Complete your profile for better experience",
+                "url": reverse("profile"),
+                "icon": "user",
+            }
+        )
+
+    return {
+        "unread": latest,
+        "items": items,
+        "count": unread_count + len(items) - len(latest),
+        "avatar_url": profile.profile_picture.url if profile and profile.profile_picture else "",
+    }
+
+
+def notification_summary(user) -> dict:
+    """Cached header state of a user: the latest unread notifications and badge count.
+
+    The entry is dropped whenever one of the user's notifications or their
+    profile changes, so a page render costs a single cache read.
+    """
+    key = _summary_key(user.pk)
+    summary = cache.get(key)
+    if summary is None:
+        summary = _build_summary(user)
+        cache.set(key, summary, SUMMARY_CACHE_TTL)
+    return summary
+
+
+def create_notifications(notifications: list[Notification], batch_size: int = 500) -> list[Notification]:
+    """Insert notifications with bulk_create and drop their recipients' cached summaries.
+
+    bulk_create skips post_save, so the summaries are invalidated here once the
+    transaction commits.
+    """
+    created = Notification.objects.bulk_create(notifications, batch_size=batch_size)
+    recipient_ids = {n.recipient_id for n in notifications}
+    if recipient_ids:
+        transaction.on_commit(lambda: invalidate_notification_summary(*recipient_ids))
+    return created
+
+
+def notify_users(recipient_ids, message: str, *, url: str = "", icon: str = "bell") -> int:
+    """Fan one notification out to many users; returns how many were created."""
+    notifications = [
+        Notification(recipient_id=recipient_id, message=message, url=url, icon=icon)
+        for recipient_id in dict.fromkeys(recipient_ids)
+    ]
+    return len(create_notifications(notifications))
+
+
+def notify_team(team, message: str, *, url: str = "", icon: str = "bell", exclude_user_id=None) -> int:
+    """Announce something to every member of a team."""
+    members = Profile.objects.filter(team=team).exclude(user_id=exclude_user_id).values_list("user_id", flat=True)
+    return notify_users(members, message, url=url, icon=icon)
+
+
+def notify_project(project, message: str, *, url: str = "", icon: str = "bell", exclude_user_id=None) -> int:
+    """Announce something to a project's creator and collaborators."""
+    recipients = [project.creator_id, *project.collaborators.values_list("pk", flat=True)]
+    return notify_users((r for r in recipients if r != exclude_user_id), message, url=url, icon=icon)
+
+
+def mark_notifications_read(user, *, ids=None, up_to=None) -> int:
+    """Mark a user's unread notifications read with a single UPDATE.
+
+    ids restricts it to those notifications, up_to to the ones created at or
+    before that moment (so items that arrive while the user reads are kept).
+    Returns the number of notifications marked.
+    """
+    unread = Notification.objects.filter(recipient=user, is_read=False)
+    if ids is not None:
+        unread = unread.filter(id__in=ids)
+    if up_to is not None:
+        unread = unread.filter(created_at__lte=up_to)
+    updated = unread.update(is_read=True)
+    if updated:
+        transaction.on_commit(lambda: invalidate_notification_summary(user.pk))
+    return updated
+
+
+def prune_notifications(read_days: int = 30, unread_days: int = 180, batch_size: int = 1000) -> int:
+    """Delete read notifications older than read_days and unread ones older than unread_days.
+
+    Rows are removed in batches of batch_size to keep each DELETE short. Meant
+    to run as a daily django-q schedule. Returns the number of rows deleted.
+    """
+    now = timezone.now()
+    expired = (
+        Notification.objects.filter(is_read=True, created_at__lt=now - timedelta(days=read_days))
+        | Notification.objects.filter(created_at__lt=now - timedelta(days=unread_days))
+    ).order_by("pk")
+
+    deleted = 0
+    while True:
+        batch = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            break
+        # post_delete drops the recipients' cached summaries
+        deleted += Notification.objects.filter(pk__in=batch).delete()[0]
+    return deleted
@@ -7,6 +7,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from accounts.models import Notification, Profile, TeamInvite, User
+from accounts.services.notifications import create_notifications
 
 INVITE_EXPIRY_DAYS = 14
 
@@ -146,16 +147,19 @@ def accept_team_invite(token, user):
         accepted_at__isnull=True,
         declined_at__isnull=True,
         expires_at__gt=now,
-    ).exclude(pk=invite.pk).select_related('invited_by', 'team')
-
-    for other in other_invites:
-        other.declined_at = now
-        other.save()
-        Notification.objects.create(
-            recipient=other.invited_by,
-            message=f"{accepter_name} joined another team and cannot accept your invite to {other.team.name}",
-            url=reverse('team_management'),
-            icon='user-times',
-        )
+    ).exclude(pk=invite.pk).select_related('team')
+
+    other_invites = list(other_invites)
+    if other_invites:
+        TeamInvite.objects.filter(pk__in=[other.pk for other in other_invites]).update(declined_at=now)
+        create_notifications([
+            Notification(
+                recipient_id=other.invited_by_id,
+                message=f"{accepter_name} joined another team and cannot accept your invite to {other.team.name}",
+                url=reverse('team_management'),
+                icon='user-times',
+            )
+            for other in other_invites
+        ])
 
     return invite.team, None
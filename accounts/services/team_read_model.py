@@ -0,0 +1,85 @@
+from django.db.models import Count, Exists, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Concat, Trim
+from django.utils import timezone
+
+from ..models import Profile, TeamInvite, User
+
+__all__ = [
+    "INVITE_MEMBER_PREVIEW",
+    "received_team_invites",
+    "team_read_model",
+]
+
+# Member avatars shown on each received invitation card
+INVITE_MEMBER_PREVIEW = 4
+
+
+def _team_members(team) -> list[Profile]:
+    return list(
+        team.members
+        .select_related("user")
+        .order_by("team_role", "team_joined_at", "user__last_name")
+    )
+
+
+def _pending_team_invites(team) -> list[TeamInvite]:
+    """Outstanding invites of a team, each flagged with whether the email already has an account."""
+    platform_users = User.objects.filter(email=OuterRef("email"))
+    return list(
+        TeamInvite.objects.filter(team=team, accepted_at__isnull=True)
+        .annotate(
+            has_platform_user=Exists(platform_users),
+            platform_user_name=Subquery(
+                platform_users
+                .annotate(full_name=Trim(Concat("first_name", Value(" "), "last_name")))
+                .values("full_name")[:1]
+            ),
+        )
+        .order_by("-created_at")
+    )
+
+
+def received_team_invites(user) -> list[TeamInvite]:
+    """Open invitations addressed to a user, with team size and a few member previews."""
+    preview = (
+        Profile.objects.select_related("user")
+        .order_by("team_joined_at", "pk")[:INVITE_MEMBER_PREVIEW]
+    )
+    return list(
+        TeamInvite.objects.filter(
+            email=user.email,
+            accepted_at__isnull=True,
+            declined_at__isnull=True,
+            expires_at__gt=timezone.now(),
+        )
+        .select_related("team", "invited_by")
+        .annotate(team_member_count=Count("team__members"))
+        .prefetch_related(Prefetch("team__members", queryset=preview, to_attr="preview_members"))
+    )
+
+
+def team_read_model(profile) -> dict:
+    """Everything the team pages render for a profile, in a fixed number of queries.
+
+    Members come with their users, pending invites (admins only) carry an
+    existing-user flag and name, so query counts do not grow with team size.
+    """
+    team = profile.team
+    is_team_admin = bool(profile.team_role == Profile.Team_Role.ADMIN and team)
+    if not team:
+        return {
+            "team": None,
+            "is_team_admin": False,
+            "team_members": [],
+            "team_members_count": 0,
+            "pending_invites": [],
+        }
+
+    team_members = _team_members(team)
+    return {
+        "team": team,
+        "is_team_admin": is_team_admin,
+        "team_members": team_members,
+        "team_members_count": len(team_members),
+        "pending_invites": _pending_team_invites(team) if is_team_admin else [],
+    }
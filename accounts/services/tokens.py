@@ -1,12 +1,62 @@
+import logging
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import requests
 from allauth.socialaccount.models import SocialAccount, SocialToken
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
+from django_q.tasks import async_task
 
+from core.services import get_client
 
-def get_user_access_token(user):
-    """Return the Keycloak access token for an authenticated user, or None if expired."""
-    if not user or not getattr(user, "is_authenticated", False):
-        return None
+__all__ = [
+    "REFRESH_MARGIN",
+    "get_cached_token",
+    "get_user_access_token",
+    "invalidate_user_token_cache",
+    "load_keycloak_token",
+    "prime_user_token_cache",
+    "proactive_refresh_margin",
+    "refresh_user_token",
+    "refresh_user_token_task",
+    "schedule_token_refresh",
+]
+
+logger = logging.getLogger(__name__)
+
+# Refresh the token a bit before it actually expires to avoid race conditions
+REFRESH_MARGIN = timedelta(seconds=30)
+
+# Attribute holding the per-request memo on request.user (a fresh instance per request).
+_MEMO_ATTR = "_keycloak_token_memo"
+
+
+def _token_cache_ttl() -> int:
+    try:
+        return max(0, int(os.getenv("KEYCLOAK_TOKEN_CACHE_TTL", "300")))
+    except ValueError:
+        return 300
+
+
+def proactive_refresh_margin() -> timedelta:
+    """Window before expiry in which requests schedule a background refresh."""
+    try:
+        seconds = int(os.getenv("KEYCLOAK_PROACTIVE_REFRESH_SECONDS", "120"))
+    except ValueError:
+        seconds = 120
+    return max(REFRESH_MARGIN, timedelta(seconds=seconds))
+
+
+def _cache_key(user_id) -> str:
+    return f"keycloak:token:{user_id}"
 
+
+def load_keycloak_token(user):
+    """Return the SocialAccount and SocialToken for a Keycloak user, or (None, None)."""
     social_account = (
         SocialAccount.objects
         .filter(user=user, provider="keycloak")
@@ -14,7 +64,7 @@ def get_user_access_token(user):
         .first()
     )
     if not social_account:
-        return None
+        return None, None
 
     social_token = (
         SocialToken.objects
@@ -22,9 +72,164 @@ def get_user_access_token(user):
         .order_by("-expires_at", "-pk")
         .first()
     )
-    if social_token and social_token.token:
-        if social_token.expires_at and social_token.expires_at <= timezone.now():
-            return None
-        return social_token.token
+    return social_account, social_token
+
+
+def _entry(social_token) -> dict:
+    """Cacheable snapshot of a SocialToken; an empty token means the user has none."""
+    if not social_token or not social_token.token:
+        return {"token": "", "expires_at": None}
+    expires_at = social_token.expires_at
+    return {"token": social_token.token, "expires_at": expires_at.timestamp() if expires_at else None}
+
+
+def prime_user_token_cache(user, social_token) -> dict:
+    """Store a freshly loaded or refreshed token for the request and for later requests."""
+    entry = _entry(social_token)
+    setattr(user, _MEMO_ATTR, entry)
+    ttl = _token_cache_ttl()
+    if entry["expires_at"] is not None:
+        ttl = min(ttl, int(entry["expires_at"] - timezone.now().timestamp()))
+    if ttl > 0:
+        cache.set(_cache_key(user.pk), entry, ttl)
+    return entry
+
+
+def invalidate_user_token_cache(user_id) -> None:
+    cache.delete(_cache_key(user_id))
+
+
+def get_cached_token(user) -> tuple[str, datetime | None]:
+    """Return (access_token, expires_at) for a user; ("", None) when there is none.
+
+    Resolution order is the per-request memo, then the shared cache, and only
+    then the database, so repeated lookups within and across requests issue no
+    queries until the cache entry lapses or is invalidated.
+    """
+    if not user or not getattr(user, "is_authenticated", False):
+        return "", None
+
+    entry = getattr(user, _MEMO_ATTR, None)
+    if entry is None:
+        entry = cache.get(_cache_key(user.pk))
+        if entry is not None:
+            setattr(user, _MEMO_ATTR, entry)
+        else:
+            _, social_token = load_keycloak_token(user)
+            entry = prime_user_token_cache(user, social_token)
+
+    expires_at = entry["expires_at"]
+    return entry["token"], datetime.fromtimestamp(expires_at, tz=dt_timezone.utc) if expires_at is not None else None
+
+
+def get_user_access_token(user):
+    """Return the Keycloak access token for an authenticated user, or None if expired."""
+    token, expires_at = get_cached_token(user)
+    if not token:
+        return None
+    if expires_at and expires_at <= timezone.now():
+        return None
+    return token
+
+
+def _needs_refresh(social_token, margin: timedelta = REFRESH_MARGIN) -> bool:
+    return bool(social_token.expires_at and social_token.expires_at - margin <= timezone.now())
+
+
+def _request_token_refresh(social_token):
+    """Use the refresh token to obtain a new access token from Keycloak.
+
+    Returns True on success, False on failure (refresh token expired / revoked).
+    """
+    refresh_token = (social_token.token_secret or "").strip()
+    if not refresh_token:
+        return False
+
+    provider_config = (
+        settings.SOCIALACCOUNT_PROVIDERS
+        .get("openid_connect", {})
+        .get("APPS", [{}])[0]
+    )
+    server_url = provider_config.get("settings", {}).get("server_url", "")
+    client_id = provider_config.get("client_id", "")
+    client_secret = provider_config.get("secret", "")
+
+    if not server_url or not client_id:
+        return False
+
+    token_url = f"{server_url}/protocol/openid-connect/token"
+    payload = {
+        "grant_type": "refresh_token",
+        "refresh_token": refresh_token,
+        "client_id": client_id,
+    }
+    if client_secret:
+        payload["client_secret"] = client_secret
+
+    try:
+        # Never retried: Keycloak may rotate the refresh token on the first attempt.
+        response = get_client("keycloak").post(token_url, data=payload, timeout=10)
+    except requests.RequestException:
+        logger.warning("Keycloak token refresh request failed", exc_info=True)
+        return False
+
+    if response.status_code != 200:
+        logger.info(
+            "Keycloak token refresh returned %s – session expired",
+            response.status_code,
+        )
+        return False
+
+    data = response.json()
+    new_access_token = data.get("access_token", "")
+    new_refresh_token = data.get("refresh_token", "")
+    expires_in = data.get("expires_in")
+
+    if not new_access_token:
+        return False
+
+    social_token.token = new_access_token
+    if new_refresh_token:
+        social_token.token_secret = new_refresh_token
+    if expires_in:
+        social_token.expires_at = timezone.now() + timedelta(seconds=int(expires_in))
+
+    social_token.save(update_fields=["token", "token_secret", "expires_at"])
+    return True
+
+
+def refresh_user_token(user, margin: timedelta = REFRESH_MARGIN) -> bool:
+    """Single-flight refresh of a user's Keycloak token.
+
+    The SocialToken row is locked for the duration of the Keycloak call, so
+    concurrent requests for the same user queue behind the first one and then
+    reuse the token it stored instead of spending the rotated refresh token
+    again. Returns False when the session can no longer be refreshed.
+    """
+    _, social_token = load_keycloak_token(user)
+    if not social_token:
+        return False
+    with transaction.atomic():
+        social_token = SocialToken.objects.select_for_update().get(pk=social_token.pk)
+        refreshed = not _needs_refresh(social_token, margin) or _request_token_refresh(social_token)
+    if refreshed:
+        prime_user_token_cache(user, social_token)
+    return refreshed
+
+
+def refresh_user_token_task(user_id) -> bool:
+    """django-q entry point for proactive refreshes; never logs the user out."""
+    try:
+        user = get_user_model().objects.get(pk=user_id)
+    except get_user_model().DoesNotExist:
+        return False
+    try:
+        return refresh_user_token(user, margin=proactive_refresh_margin())
+    finally:
+        cache.delete(f"keycloak:refresh:{user_id}")
+
 
-    return None
+def schedule_token_refresh(user) -> None:
+    """Refresh a soon-to-expire token in the background, at most once at a time per user."""
+    if cache.add(f"keycloak:refresh:{user.pk}", 1, 60):
+        async_task(refresh_user_token_task, user.pk)
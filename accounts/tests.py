@@ -1,7 +1,23 @@
-from django.test import TestCase, Client, override_settings
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from allauth.socialaccount.models import SocialAccount, SocialToken
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+
+from core.services import reset_clients
 
-from accounts.models import User
+from accounts.checks import check_shared_cache
+from accounts.context_processors import header_notifications
+from accounts.models import Notification, Profile, Team, TeamInvite, User
+from accounts.services.notifications import notify_team, prune_notifications
+from accounts.services.team_invite import accept_team_invite
+from accounts.services.keycloak_user_sync import KeycloakUserSyncClient, reset_service_token_managers
+from accounts.services.tokens import get_user_access_token, refresh_user_token, refresh_user_token_task
 
 # Django's ModelBackend.get_user() checks is_active and returns None for
 # inactive users, so force_login(inactive_user) produces AnonymousUser on the
@@ -118,3 +134,359 @@ class PendingApprovalViewTests(TestCase):
 
         self.assertEqual(response.status_code, 302)
         self.assertNotIn("_auth_user_id", self.client.session)
+
+
+def _fake_refresh(social_token):
+    social_token.token = "access-2"
+    social_token.expires_at = timezone.now() + timedelta(hours=1)
+    social_token.save(update_fields=["token", "expires_at"])
+    return True
+
+
+class KeycloakTokenCacheTests(TestCase):
+    """Token lookups hit the database once, then the per-request memo and shared cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(email="kc@example.com", password="testpass123")
+        account = SocialAccount.objects.create(user=self.user, provider="keycloak", uid="kc-1")
+        self.social_token = SocialToken.objects.create(
+            account=account, token="access-1", token_secret="refresh-1",
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        cache.clear()
+
+    def test_repeated_lookups_issue_no_queries(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(get_user_access_token(self.user), "access-1")
+        # A later request gets a fresh user instance but shares the cache entry
+        next_request_user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_access_token(self.user), "access-1")
+            self.assertEqual(get_user_access_token(next_request_user), "access-1")
+
+    def test_saving_token_invalidates_cache(self):
+        get_user_access_token(self.user)
+        self.social_token.token = "access-2"
+        self.social_token.save()
+
+        self.assertEqual(get_user_access_token(User.objects.get(pk=self.user.pk)), "access-2")
+
+    def test_middleware_refreshes_expiring_token_once(self):
+        SocialToken.objects.filter(pk=self.social_token.pk).update(expires_at=timezone.now() + timedelta(seconds=10))
+        client = Client()
+        client.force_login(self.user, backend="allauth.account.auth_backends.AuthenticationBackend")
+
+        with patch("accounts.services.tokens._request_token_refresh", side_effect=_fake_refresh) as mock_refresh:
+            client.get(reverse("dashboard"))
+            client.get(reverse("dashboard"))
+
+        mock_refresh.assert_called_once()
+        self.assertIn("_auth_user_id", client.session)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_access_token(User(pk=self.user.pk)), "access-2")
+
+    def test_middleware_logs_out_when_refresh_fails(self):
+        SocialToken.objects.filter(pk=self.social_token.pk).update(expires_at=timezone.now() + timedelta(seconds=10))
+        client = Client()
+        client.force_login(self.user, backend="allauth.account.auth_backends.AuthenticationBackend")
+
+        with patch("accounts.services.tokens._request_token_refresh", return_value=False):
+            response = client.get(reverse("dashboard"))
+
+        self.assertRedirects(response, reverse("account_login"), fetch_redirect_response=False)
+        self.assertNotIn("_auth_user_id", client.session)
+
+    def test_waiting_refresh_reuses_token_stored_by_winner(self):
+        SocialToken.objects.filter(pk=self.social_token.pk).update(expires_at=timezone.now() + timedelta(seconds=10))
+        get_user_access_token(self.user)
+        # Another request refreshed the token while this one waited for the row lock
+        SocialToken.objects.filter(pk=self.social_token.pk).update(
+            token="access-2", expires_at=timezone.now() + timedelta(hours=1)
+        )
+
+        with patch("accounts.services.tokens._request_token_refresh") as mock_refresh:
+            self.assertTrue(refresh_user_token(User.objects.get(pk=self.user.pk)))
+
+        mock_refresh.assert_not_called()
+        self.assertEqual(get_user_access_token(User.objects.get(pk=self.user.pk)), "access-2")
+
+    @patch("accounts.services.tokens.async_task")
+    def test_middleware_schedules_background_refresh_before_expiry(self, mock_async):
+        SocialToken.objects.filter(pk=self.social_token.pk).update(expires_at=timezone.now() + timedelta(seconds=90))
+        client = Client()
+        client.force_login(self.user, backend="allauth.account.auth_backends.AuthenticationBackend")
+
+        with patch("accounts.services.tokens._request_token_refresh", side_effect=_fake_refresh) as mock_refresh:
+            client.get(reverse("dashboard"))
+            client.get(reverse("dashboard"))
+            mock_refresh.assert_not_called()
+            mock_async.assert_called_once_with(refresh_user_token_task, self.user.pk)
+
+            self.assertTrue(refresh_user_token_task(self.user.pk))
+
+        mock_refresh.assert_called_once()
+        self.assertEqual(get_user_access_token(User.objects.get(pk=self.user.pk)), "access-2")
+
+
+class SharedCacheCheckTests(TestCase):
+
+    @override_settings(DEBUG=False, CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_warns_about_process_local_cache(self):
+        self.assertEqual([w.id for w in check_shared_cache(None)], ["accounts.W001"])
+
+    @override_settings(DEBUG=False, CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "django_cache"}})
+    def test_accepts_shared_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+
+class KeycloakServiceTokenTests(TestCase):
+
+    def setUp(self):
+        reset_service_token_managers()
+        reset_clients()
+        self.addCleanup(reset_service_token_managers)
+        self.addCleanup(reset_clients)
+        self.users = []
+        for index in range(3):
+            user = User.objects.create_user(email=f"sync{index}@example.com", password="testpass123")
+            user.first_name = f"First{index}"
+            self.users.append(user)
+            if index < 2:
+                SocialAccount.objects.create(user=user, provider="keycloak", uid=f"kc-{index}")
+        self.tokens_issued = 0
+        self.rejected_tokens = set()
+
+    def _keycloak(self, method, url, **kwargs):
+        if method == "POST":
+            self.tokens_issued += 1
+            return MagicMock(status_code=200, json=lambda: {
+                "access_token": f"service-{self.tokens_issued}", "expires_in": 300,
+            })
+        if kwargs["headers"]["Authorization"].removeprefix("Bearer ") in self.rejected_tokens:
+            return MagicMock(status_code=401)
+        return MagicMock(status_code=204)
+
+    def test_service_token_is_shared_across_clients(self):
+        with patch("core.services.http_client.requests.Session.request", side_effect=self._keycloak) as mock_request:
+            self.assertEqual(KeycloakUserSyncClient().update_user(self.users[0], {"first_name": "A"}), {"success": True})
+            self.assertEqual(KeycloakUserSyncClient().send_reset_password_email(self.users[1]), {"success": True})
+
+        self.assertEqual(self.tokens_issued, 1)
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], 10)
+
+    def test_rejected_service_token_is_renewed_once(self):
+        self.rejected_tokens.add("service-1")
+        with patch("core.services.http_client.requests.Session.request", side_effect=self._keycloak):
+            result = KeycloakUserSyncClient().update_user(self.users[0], {"first_name": "A"})
+
+        self.assertEqual(result, {"success": True})
+        self.assertEqual(self.tokens_issued, 2)
+
+    def test_sync_user_names_in_batch(self):
+        with patch("core.services.http_client.requests.Session.request", side_effect=self._keycloak) as mock_request:
+            results = KeycloakUserSyncClient().sync_user_names(self.users)
+
+        self.assertEqual(results[self.users[0].id], {"success": True})
+        self.assertEqual(results[self.users[1].id], {"success": True})
+        self.assertIn("error", results[self.users[2].id])
+        puts = [call for call in mock_request.call_args_list if call.args[0] == "PUT"]
+        self.assertEqual(sorted(call.args[1].rsplit("/", 1)[1] for call in puts), ["kc-0", "kc-1"])
+        self.assertEqual(self.tokens_issued, 1)
+
+
+class HeaderNotificationsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(email="bell@example.com", password="testpass123")
+        for index in range(15):
+            Notification.objects.create(recipient=self.user, message=f"Invite {index}", icon="envelope")
+
+    def _context(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return header_notifications(request)
+
+    def test_summary_is_capped_and_served_from_cache(self):
+        context = self._context()
+        # 15 unread invites plus the "add team" and "complete profile" prompts
+        self.assertEqual(context["header_notifications_count"], 17)
+        self.assertEqual(len(context["header_notifications"]), 12)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._context()["header_notifications_count"], 17)
+
+    def test_summary_links_each_notification(self):
+        urls = [item["url"] for item in self._context()["header_notifications"][:10]]
+        ids = Notification.objects.filter(recipient=self.user).values_list("id", flat=True)[:10]
+        self.assertEqual(urls, [reverse("read_notification", args=[pk]) for pk in ids])
+
+    def test_summary_is_kept_until_the_change_commits(self):
+        self._context()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Notification.objects.create(recipient=self.user, message="Welcome")
+            self.assertEqual(self._context()["header_notifications_count"], 17)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self._context()["header_notifications_count"], 18)
+
+    def test_new_and_read_notifications_invalidate_summary(self):
+        self._context()
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(recipient=self.user, message="Welcome")
+        self.assertEqual(self._context()["header_notifications_count"], 18)
+
+        client = Client()
+        client.force_login(self.user)
+        latest = Notification.objects.filter(recipient=self.user).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            client.get(reverse("read_notification", args=[latest.id]), HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+
+        self.assertEqual(self._context()["header_notifications_count"], 17)
+        polled = client.get(reverse("poll_notifications")).json()["notifications"]
+        self.assertEqual(len(polled), 10)
+        self.assertNotIn(latest.id, [n["id"] for n in polled])
+
+
+class NotificationServiceTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.team = Team.objects.create(name="Grid")
+        self.members = []
+        for index in range(4):
+            user = User.objects.create_user(email=f"member{index}@example.com", password="testpass123")
+            Profile.objects.filter(user=user).update(team=self.team, team_role=Profile.Team_Role.MEMBER)
+            self.members.append(user)
+        self.client = Client()
+        self.client.force_login(self.members[0])
+
+    def _header_count(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return header_notifications(request)["header_notifications_count"]
+
+    def test_notify_team_fans_out_in_one_insert(self):
+        before = self._header_count(self.members[1])
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(2):
+                created = notify_team(self.team, "Maintenance tonight", exclude_user_id=self.members[0].pk)
+
+        self.assertEqual(created, 3)
+        self.assertFalse(Notification.objects.filter(recipient=self.members[0]).exists())
+        self.assertEqual(self._header_count(self.members[1]), before + 1)
+
+    def test_accepting_invite_declines_others_in_bulk(self):
+        newcomer = User.objects.create_user(email="new@example.com", password="testpass123")
+        expires = timezone.now() + timedelta(days=1)
+        invite = TeamInvite.objects.create(team=self.team, email=newcomer.email, invited_by=self.members[0], expires_at=expires)
+        for index in (1, 2):
+            other_team = Team.objects.create(name=f"Other {index}")
+            TeamInvite.objects.create(team=other_team, email=newcomer.email, invited_by=self.members[index], expires_at=expires)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            team, error = accept_team_invite(invite.token, newcomer)
+
+        self.assertIsNone(error)
+        self.assertEqual(team, self.team)
+        self.assertEqual(TeamInvite.objects.filter(email=newcomer.email, declined_at__isnull=False).count(), 2)
+        for index in (1, 2):
+            self.assertTrue(Notification.objects.filter(
+                recipient=self.members[index], message__contains=f"Other {index}", icon="user-times",
+            ).exists())
+
+    def test_mark_read_endpoint_uses_ids_or_cutoff(self):
+        user = self.members[0]
+        old = [Notification.objects.create(recipient=user, message=f"Old {index}") for index in range(3)]
+        Notification.objects.filter(pk__in=[n.pk for n in old]).update(created_at=timezone.now() - timedelta(hours=1))
+        fresh = Notification.objects.create(recipient=user, message="Fresh")
+        url = reverse("mark_all_notifications_read")
+        ajax = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+
+        response = self.client.post(url, {"ids": [old[0].pk]}, **ajax)
+        self.assertEqual(response.json()["marked"], 1)
+
+        cutoff = (timezone.now() - timedelta(minutes=30)).isoformat()
+        self.assertEqual(self.client.post(url, {"up_to": cutoff}, **ajax).json()["marked"], 2)
+        self.assertEqual(list(Notification.objects.filter(recipient=user, is_read=False)), [fresh])
+
+        self.assertEqual(self.client.post(url, {"up_to": "yesterday"}, **ajax).status_code, 400)
+        response = self.client.post(url, {"next": "https://evil.example.com/"})
+        self.assertRedirects(response, reverse("team_management"), fetch_redirect_response=False)
+        self.assertFalse(Notification.objects.filter(recipient=user, is_read=False).exists())
+
+    def test_prune_removes_expired_notifications_in_batches(self):
+        user = self.members[1]
+        now = timezone.now()
+        keep = Notification.objects.create(recipient=user, message="recent read", is_read=True)
+        unread = Notification.objects.create(recipient=user, message="old unread")
+        for index in range(5):
+            Notification.objects.create(recipient=user, message=f"stale {index}", is_read=True)
+        Notification.objects.filter(message__startswith="stale").update(created_at=now - timedelta(days=31))
+        Notification.objects.filter(pk=unread.pk).update(created_at=now - timedelta(days=60))
+
+        self.assertEqual(prune_notifications(batch_size=2), 5)
+        self.assertEqual(set(Notification.objects.filter(recipient=user)), {keep, unread})
+
+
+class TeamManagementQueryTests(TestCase):
+    """Team pages issue the same number of queries regardless of team size."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.counter = 0
+
+    def _user(self, **extra):
+        self.counter += 1
+        return User.objects.create_user(email=f"team{self.counter}@example.com", password=None, **extra)
+
+    def _team(self, name, size):
+        admin = self._user(first_name="Ada", last_name="Admin")
+        team = Team.objects.create(name=name)
+        Profile.objects.filter(user=admin).update(team=team, team_role=Profile.Team_Role.ADMIN)
+        for _ in range(size):
+            member = self._user(first_name="Max")
+            Profile.objects.filter(user=member).update(
+                team=team, team_role=Profile.Team_Role.MEMBER, team_joined_at=timezone.now()
+            )
+        expires = timezone.now() + timedelta(days=1)
+        for _ in range(size):
+            TeamInvite.objects.create(team=team, email=self._user(first_name="Ivy").email, invited_by=admin, expires_at=expires)
+            TeamInvite.objects.create(team=team, email=f"outsider{self.counter}-{_}@example.com", invited_by=admin, expires_at=expires)
+        return admin, team
+
+    def _queries(self, user, url_name):
+        client = Client()
+        # Fresh instance: logging in saves the user, and the profile signal would save a stale cached profile
+        client.force_login(User.objects.get(pk=user.pk))
+        client.get(reverse(url_name))  # warm the header notification cache
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_team_pages_do_not_grow_with_members(self):
+        small_admin, small_team = self._team("Small", 2)
+        large_admin, large_team = self._team("Large", 25)
+        invitee = self._user()
+        for admin, team in ((small_admin, small_team), (large_admin, large_team)):
+            TeamInvite.objects.create(
+                team=team, email=invitee.email, invited_by=admin,
+                expires_at=timezone.now() + timedelta(days=1),
+            )
+
+        for url_name in ("team_management", "team_members_partial"):
+            small, _ = self._queries(small_admin, url_name)
+            large, response = self._queries(large_admin, url_name)
+            self.assertEqual(small, large, url_name)
+        self.assertEqual(response.json()["count"], 26)
+        self.assertIn("Ivy", response.json()["html"])
+
+        queries, response = self._queries(invitee, "pending_invites_partial")
+        self.assertEqual(response.json()["count"], 2)
+        self.assertLessEqual(queries, 5)
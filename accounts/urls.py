@@ -21,6 +21,7 @@ urlpatterns = [
     path('team/remove-member/<int:user_id>/', views.remove_member, name='remove_member'),
     path('notifications/<int:notification_id>/read/', views.read_notification, name='read_notification'),
     path('notifications/poll/', views.poll_notifications, name='poll_notifications'),
+    path('notifications/mark-read/', views.mark_all_notifications_read, name='mark_all_notifications_read'),
     path('team/members-partial/', views.team_members_partial, name='team_members_partial'),
     path('team/pending-invites-partial/', views.pending_invites_partial, name='pending_invites_partial'),
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
 from .auth import keycloak_front_channel_logout, keycloak_logout, keycloak_register, pending_approval
 from .profile import profile, update_profile_picture, reset_password
-from .teams import team_management, accept_invite, decline_invite, resend_invite, cancel_invite, delete_invite, remove_member, read_notification, poll_notifications, team_members_partial, pending_invites_partial
+from .teams import team_management, accept_invite, decline_invite, resend_invite, cancel_invite, delete_invite, remove_member, read_notification, mark_all_notifications_read, poll_notifications, team_members_partial, pending_invites_partial
 
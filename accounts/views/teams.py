@@ -4,17 +4,22 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
 
 from ..forms import TeamEditForm, TeamInviteForm
-from ..models import Notification, Profile, TeamInvite, User
+from ..models import Notification, Profile, TeamInvite
+from ..services.notifications import mark_notifications_read, notification_summary
 from ..services.team_creation import handle_create_team_post
+from ..services.team_read_model import received_team_invites, team_read_model
 from ..services.team_invite import accept_team_invite, decline_team_invite, send_team_invite
 
 # --------------------------------- TEAM MANAGEMENT / CRUD --------------------------------- #
 
 @login_required
 def team_management(request):
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile, _ = Profile.objects.select_related("team").get_or_create(user=request.user)
     team = profile.team
     is_team_admin = bool(profile.team_role == Profile.Team_Role.ADMIN and team)
 
@@ -62,43 +67,15 @@ def team_management(request):
                 messages.success(request, "Invitation sent successfully.")
                 return redirect("team_management")
 
-    if team:
-        team_members = team.members.select_related("user__profile").order_by("team_role", "team_joined_at", "user__last_name")
-        team_members_count = team.members.count()
-        if is_team_admin:
-            pending_invites = list(
-                TeamInvite.objects.filter(team=team, accepted_at__isnull=True)
-                .order_by("-created_at")
-            )
-            user_map = {
-                u.email: u
-                for u in User.objects.filter(email__in=[i.email for i in pending_invites])
-            }
-            for invite in pending_invites:
-                invite.platform_user = user_map.get(invite.email)
-        else:
-            pending_invites = []
-    else:
-        team_members = []
-        team_members_count = 0
-        pending_invites = []
-
-    received_invites = TeamInvite.objects.filter(
-        email=request.user.email,
-        accepted_at__isnull=True,
-        declined_at__isnull=True,
-        expires_at__gt=timezone.now(),
-    ).select_related('team', 'invited_by').prefetch_related('team__members__user')
+    context = team_read_model(profile)
+    context["received_invites"] = received_team_invites(request.user)
 
     return render(
         request,
         "accounts/team_management.html",
         {
-            "team": team,
-            "is_team_admin": is_team_admin,
-            "team_members": team_members,
-            "team_members_count": team_members_count,
-            "pending_invites": pending_invites,
+            **context,
+            "profile": profile,
             "create_team_form": create_team_form,
             "open_create_modal": open_create_modal,
             "edit_team_form": edit_team_form,
@@ -106,7 +83,6 @@ def team_management(request):
             "invite_form": invite_form,
             "invite_error": invite_error,
             "open_invite_modal": open_invite_modal,
-            "received_invites": received_invites,
         },
     )
 
@@ -198,73 +174,72 @@ def delete_invite(request, invite_id):
 
 @login_required
 def pending_invites_partial(request):
-    received_invites = TeamInvite.objects.filter(
-        email=request.user.email,
-        accepted_at__isnull=True,
-        declined_at__isnull=True,
-        expires_at__gt=timezone.now(),
-    ).select_related('team', 'invited_by').prefetch_related('team__members__user')
+    received_invites = received_team_invites(request.user)
 
     html = render_to_string(
         'accounts/partials/pending-invites.html',
         {'received_invites': received_invites},
         request=request,
     )
-    return JsonResponse({'html': html, 'count': received_invites.count()})
+    return JsonResponse({'html': html, 'count': len(received_invites)})
 
 # --------------------------------- NOTIFICATIONS --------------------------------- #
 
 @login_required
 def poll_notifications(request):
-    unread = Notification.objects.filter(recipient=request.user, is_read=False).values(
-        "id", "message", "icon", "created_at"
-    )
-    return JsonResponse({"notifications": list(unread)})
+    # Served from the cached header summary; polled every few seconds by every open page
+    return JsonResponse({"notifications": notification_summary(request.user)["unread"]})
 
 
 @login_required
 def read_notification(request, notification_id):
     notification = get_object_or_404(Notification, id=notification_id, recipient=request.user)
     notification.is_read = True
-    notification.save()
+    notification.save(update_fields=["is_read"])
     if request.headers.get("X-Requested-With") == "XMLHttpRequest":
         return JsonResponse({"ok": True})
     return redirect(notification.url or "team_management")
 
 
+@login_required
+@require_POST
+def mark_all_notifications_read(request):
+    """Mark all, some (ids) or everything up to a moment (up_to, ISO 8601) as read in one UPDATE."""
+    raw_up_to = request.POST.get("up_to")
+    try:
+        ids = [int(value) for value in request.POST.getlist("ids")] or None
+        up_to = parse_datetime(raw_up_to) if raw_up_to else None
+    except ValueError:
+        return JsonResponse({"error": "Invalid ids or up_to."}, status=400)
+    if raw_up_to and up_to is None:
+        return JsonResponse({"error": "Invalid ids or up_to."}, status=400)
+    if up_to is not None and timezone.is_naive(up_to):
+        up_to = timezone.make_aware(up_to)
+
+    marked = mark_notifications_read(request.user, ids=ids, up_to=up_to)
+    if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+        return JsonResponse({"ok": True, "marked": marked})
+    next_url = request.POST.get("next", "")
+    if url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        return redirect(next_url)
+    return redirect("team_management")
+
+
 @login_required
 def team_members_partial(request):
-    profile = get_object_or_404(Profile, user=request.user)
-    team = profile.team
-    is_team_admin = bool(profile.team_role == Profile.Team_Role.ADMIN and team)
+    profile = get_object_or_404(Profile.objects.select_related("team"), user=request.user)
+    context = team_read_model(profile)
 
-    if not team:
+    if not context["team"]:
         return JsonResponse({'html': '', 'count': 0})
 
-    team_members = team.members.select_related("user__profile").order_by("team_role", "team_joined_at", "user__last_name")
-    team_members_count = team.members.count()
-
-    if is_team_admin:
-        pending_invites = list(
-            TeamInvite.objects.filter(team=team, accepted_at__isnull=True)
-            .order_by("-created_at")
-        )
-        user_map = {
-            u.email: u
-            for u in User.objects.filter(email__in=[i.email for i in pending_invites])
-        }
-        for invite in pending_invites:
-            invite.platform_user = user_map.get(invite.email)
-    else:
-        pending_invites = []
-
     html = render_to_string(
         'accounts/partials/team-members-tab.html',
         {
-            'team_members': team_members,
-            'pending_invites': pending_invites,
-            'is_team_admin': is_team_admin,
+            'team_members': context["team_members"],
+            'pending_invites': context["pending_invites"],
+            'is_team_admin': context["is_team_admin"],
         },
         request=request,
     )
-    return JsonResponse({'html': html, 'count': team_members_count})
+    return JsonResponse({'html': html, 'count': context["team_members_count"]})
@@ -1,3 +1,19 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ScanReport, ScanResultCache
+
+
+@admin.register(ScanResultCache)
+class ScanResultCacheAdmin(admin.ModelAdmin):
+    list_display = ('cache_key', 'source_kind', 'job_id', 'hit_count', 'updated_at')
+    list_filter = ('source_kind',)
+    search_fields = ('cache_key', 'job_id')
+    readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(ScanReport)
+class ScanReportAdmin(admin.ModelAdmin):
+    list_display = ('job_id', 'assessment', 'source_label', 'incident_count', 'created_at')
+    search_fields = ('job_id',)
+    raw_id_fields = ('assessment',)
+    readonly_fields = ('created_at', 'updated_at')
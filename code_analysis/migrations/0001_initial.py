@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-19 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScanResultCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cache_key', models.CharField(max_length=64, unique=True)),
+                ('source_kind', models.CharField(choices=[('archive', 'Archive'), ('github', 'GitHub')], max_length=20)),
+                ('fingerprint', models.JSONField(default=dict)),
+                ('job_id', models.CharField(max_length=64)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Scan Result Cache Entry',
+                'verbose_name_plural': 'Scan Result Cache Entries',
+                'db_table': 'code_analysis_scan_result_cache',
+            },
+        ),
+    ]
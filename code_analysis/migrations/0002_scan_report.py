@@ -0,0 +1,110 @@
+# Generated by Django 6.0 on 2026-10-19 17:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('code_analysis', '0001_initial'),
+        ('trustworthiness', '0004_assessment_parent_assessment_assessment_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScanReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_id', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('source_label', models.CharField(blank=True, max_length=100)),
+                ('summary', models.JSONField(default=dict)),
+                ('incident_count', models.PositiveIntegerField(default=0)),
+                ('assessment', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='scan_report', to='trustworthiness.assessment')),
+            ],
+            options={
+                'verbose_name': 'Scan Report',
+                'verbose_name_plural': 'Scan Reports',
+                'db_table': 'code_analysis_scan_report',
+            },
+        ),
+        migrations.CreateModel(
+            name='ScanCwe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cwe_id', models.CharField(max_length=32)),
+                ('description', models.TextField(blank=True)),
+                ('incident_count', models.PositiveIntegerField(default=0)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cwes', to='code_analysis.scanreport')),
+            ],
+            options={
+                'verbose_name': 'Scan CWE',
+                'verbose_name_plural': 'Scan CWEs',
+                'db_table': 'code_analysis_scan_cwe',
+            },
+        ),
+        migrations.CreateModel(
+            name='ScanRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule_id', models.CharField(max_length=255)),
+                ('incident_count', models.PositiveIntegerField(default=0)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rules', to='code_analysis.scanreport')),
+            ],
+            options={
+                'db_table': 'code_analysis_scan_rule',
+            },
+        ),
+        migrations.CreateModel(
+            name='ScanIncident',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ordinal', models.PositiveIntegerField()),
+                ('severity', models.CharField(max_length=32)),
+                ('severity_bucket', models.CharField(choices=[('error', 'Error'), ('warning', 'Warning'), ('info', 'Info')], max_length=10)),
+                ('issue_type', models.CharField(max_length=64)),
+                ('file_path', models.CharField(max_length=1024)),
+                ('line', models.PositiveIntegerField(blank=True, null=True)),
+                ('location', models.TextField()),
+                ('message', models.TextField()),
+                ('display_message', models.TextField(blank=True)),
+                ('status', models.CharField(max_length=32)),
+                ('effort', models.CharField(max_length=64)),
+                ('cve_refs', models.JSONField(default=list)),
+                ('metadata_rows', models.JSONField(default=list)),
+                ('cwes', models.ManyToManyField(blank=True, related_name='incidents', to='code_analysis.scancwe')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='incidents', to='code_analysis.scanreport')),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='incidents', to='code_analysis.scanrule')),
+            ],
+            options={
+                'db_table': 'code_analysis_scan_incident',
+                'ordering': ['ordinal'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scanreport',
+            constraint=models.UniqueConstraint(condition=models.Q(('job_id', ''), _negated=True), fields=('job_id',), name='code_analysis_scan_report_unique_job'),
+        ),
+        migrations.AddConstraint(
+            model_name='scancwe',
+            constraint=models.UniqueConstraint(fields=('report', 'cwe_id'), name='code_analysis_scan_cwe_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='scanrule',
+            constraint=models.UniqueConstraint(fields=('report', 'rule_id'), name='code_analysis_scan_rule_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='scanincident',
+            index=models.Index(fields=['report', 'ordinal'], name='scan_incident_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scanincident',
+            index=models.Index(fields=['report', 'severity_bucket', 'ordinal'], name='scan_incident_severity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scanincident',
+            index=models.Index(fields=['report', 'file_path'], name='scan_incident_file_idx'),
+        ),
+    ]
@@ -1,3 +1,155 @@
 from django.db import models
 
-# Create your models here.
+from core.models import TimeStampedModel
+
+
+class ScanResultCache(TimeStampedModel):
+    """Maps a scan input fingerprint to the job whose persisted report answers it.
+
+    The cache key is a SHA-256 over either the archive content hash or
+    (repo URL, resolved commit SHA, subdirectory), always combined with the
+    Semgrep ruleset version so a ruleset upgrade invalidates every entry.
+    """
+
+    class SourceKind(models.TextChoices):
+        ARCHIVE = 'archive', 'Archive'
+        GITHUB = 'github', 'GitHub'
+
+    cache_key = models.CharField(max_length=64, unique=True)
+    source_kind = models.CharField(max_length=20, choices=SourceKind.choices)
+    fingerprint = models.JSONField(default=dict)
+    job_id = models.CharField(max_length=64)
+    hit_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'code_analysis_scan_result_cache'
+        verbose_name = 'Scan Result Cache Entry'
+        verbose_name_plural = 'Scan Result Cache Entries'
+
+    def __str__(self):
+        return f"{self.get_source_kind_display()} {self.cache_key[:12]} → {self.job_id}"
+
+
+class ScanReport(TimeStampedModel):
+    """Precomputed results view-model of a completed scan.
+
+    Built once when the scan completes so the results page never re-walks the
+    raw report; ``summary`` holds the overview tab and the finding rows live in
+    ScanIncident, with rules and CWE identifiers normalised alongside.
+    """
+
+    job_id = models.CharField(max_length=64, blank=True, db_index=True)
+    assessment = models.OneToOneField(
+        'trustworthiness.Assessment',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='scan_report',
+    )
+    source_label = models.CharField(max_length=100, blank=True)
+    summary = models.JSONField(default=dict)
+    incident_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'code_analysis_scan_report'
+        verbose_name = 'Scan Report'
+        verbose_name_plural = 'Scan Reports'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job_id'],
+                condition=~models.Q(job_id=''),
+                name='code_analysis_scan_report_unique_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Scan report {self.job_id or self.assessment_id} ({self.incident_count} findings)"
+
+
+class ScanRule(models.Model):
+    report = models.ForeignKey(ScanReport, on_delete=models.CASCADE, related_name='rules')
+    rule_id = models.CharField(max_length=255)
+    incident_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'code_analysis_scan_rule'
+        constraints = [
+            models.UniqueConstraint(fields=['report', 'rule_id'], name='code_analysis_scan_rule_unique'),
+        ]
+
+    def __str__(self):
+        return self.rule_id
+
+
+class ScanCwe(models.Model):
+    report = models.ForeignKey(ScanReport, on_delete=models.CASCADE, related_name='cwes')
+    cwe_id = models.CharField(max_length=32)
+    description = models.TextField(blank=True)
+    incident_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'code_analysis_scan_cwe'
+        verbose_name = 'Scan CWE'
+        verbose_name_plural = 'Scan CWEs'
+        constraints = [
+            models.UniqueConstraint(fields=['report', 'cwe_id'], name='code_analysis_scan_cwe_unique'),
+        ]
+
+    def __str__(self):
+        return self.cwe_id
+
+
+class ScanIncident(models.Model):
+    """One finding of a ScanReport, in the shape the results page renders it."""
+
+    class SeverityBucket(models.TextChoices):
+        ERROR = 'error', 'Error'
+        WARNING = 'warning', 'Warning'
+        INFO = 'info', 'Info'
+
+    report = models.ForeignKey(ScanReport, on_delete=models.CASCADE, related_name='incidents')
+    ordinal = models.PositiveIntegerField()
+    severity = models.CharField(max_length=32)
+    severity_bucket = models.CharField(max_length=10, choices=SeverityBucket.choices)
+    issue_type = models.CharField(max_length=64)
+    rule = models.ForeignKey(ScanRule, on_delete=models.CASCADE, related_name='incidents')
+    file_path = models.CharField(max_length=1024)
+    line = models.PositiveIntegerField(null=True, blank=True)
+    location = models.TextField()
+    message = models.TextField()
+    display_message = models.TextField(blank=True)
+    status = models.CharField(max_length=32)
+    effort = models.CharField(max_length=64)
+    cve_refs = models.JSONField(default=list)
+    metadata_rows = models.JSONField(default=list)
+    cwes = models.ManyToManyField(ScanCwe, blank=True, related_name='incidents')
+
+    class Meta:
+        db_table = 'code_analysis_scan_incident'
+        ordering = ['ordinal']
+        indexes = [
+            models.Index(fields=['report', 'ordinal'], name='scan_incident_order_idx'),
+            models.Index(fields=['report', 'severity_bucket', 'ordinal'], name='scan_incident_severity_idx'),
+            models.Index(fields=['report', 'file_path'], name='scan_incident_file_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.severity} {self.rule_id} @ {self.location}"
+
+    def as_issue(self):
+        """Return the incident as the dict the results template expects."""
+        return {
+            "severity": self.severity,
+            "message": self.message,
+            "display_message": self.display_message,
+            "location": self.location,
+            "file": self.file_path,
+            "type": self.issue_type,
+            "rule": self.rule.rule_id,
+            "line": self.line,
+            "status": self.status,
+            "effort": self.effort,
+            "cwe_refs": [cwe.cwe_id for cwe in self.cwes.all()],
+            "cve_refs": self.cve_refs,
+            "metadata_rows": self.metadata_rows,
+        }
@@ -0,0 +1,69 @@
+from .archive_staging import (
+    MAX_STAGED_ARCHIVE_BYTES,
+    delete_staged_archive,
+    generate_presigned_archive_post,
+    is_owned_staging_key,
+    open_staged_archive,
+    staged_archive_metadata,
+    staging_bucket,
+    staging_prefix_for_user,
+)
+from .incremental import (
+    changed_files_between,
+    diff_findings,
+    incident_file,
+    merge_incremental_result,
+    partial_scan_is_scoped,
+)
+from .multipart import MultipartStream
+from .result_cache import (
+    archive_cache_key,
+    forget_cache_key,
+    github_cache_key,
+    lookup_cached_job_id,
+    parse_github_repo,
+    remember_scan_result,
+    resolve_github_commit,
+    staged_archive_cache_key,
+)
+from .results_index import (
+    INCIDENT_SORTS,
+    build_results_model,
+    filter_incidents,
+    incident_facets,
+    index_scan_results,
+    severity_bucket,
+    sort_incidents,
+)
+
+__all__ = [
+    "INCIDENT_SORTS",
+    "MAX_STAGED_ARCHIVE_BYTES",
+    "MultipartStream",
+    "archive_cache_key",
+    "build_results_model",
+    "changed_files_between",
+    "delete_staged_archive",
+    "diff_findings",
+    "filter_incidents",
+    "forget_cache_key",
+    "generate_presigned_archive_post",
+    "github_cache_key",
+    "incident_facets",
+    "incident_file",
+    "index_scan_results",
+    "is_owned_staging_key",
+    "lookup_cached_job_id",
+    "merge_incremental_result",
+    "open_staged_archive",
+    "parse_github_repo",
+    "partial_scan_is_scoped",
+    "remember_scan_result",
+    "resolve_github_commit",
+    "severity_bucket",
+    "sort_incidents",
+    "staged_archive_cache_key",
+    "staged_archive_metadata",
+    "staging_bucket",
+    "staging_prefix_for_user",
+]
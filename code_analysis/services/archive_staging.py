@@ -0,0 +1,102 @@
+import os
+
+from django.conf import settings
+
+from core.services.object_storage import MinioUploadError, build_minio_client
+
+__all__ = [
+    "delete_staged_archive",
+    "MAX_STAGED_ARCHIVE_BYTES",
+    "generate_presigned_archive_post",
+    "is_owned_staging_key",
+    "open_staged_archive",
+    "staged_archive_metadata",
+    "staging_bucket",
+    "staging_prefix_for_user",
+]
+
+STAGING_ROOT = "code-analysis/pending"
+# Largest archive object storage accepts through a presigned upload
+try:
+    MAX_STAGED_ARCHIVE_BYTES = max(1, int(os.getenv("SCAN_ARCHIVE_MAX_MB", "500"))) * 1024 * 1024
+except ValueError:
+    MAX_STAGED_ARCHIVE_BYTES = 500 * 1024 * 1024
+
+
+def staging_bucket() -> str:
+    return settings.OBJECT_STORAGE_BUCKET_CODE_ANALYSIS
+
+
+def staging_prefix_for_user(user) -> str:
+    # The primary key, unlike a slugified username, is unique per user
+    return f"{STAGING_ROOT}/{user.pk}/"
+
+
+def is_owned_staging_key(user, object_key: str) -> bool:
+    """Return True if object_key was issued to this user by generate_presigned_archive_url."""
+    if not object_key or ".." in object_key.split("/"):
+        return False
+    return object_key.startswith(staging_prefix_for_user(user))
+
+
+def generate_presigned_archive_post(*, object_key: str, content_type: str, expires_in: int = 3600) -> tuple:
+    """Return (url, fields, bucket_name) for a direct browser-to-MinIO archive upload.
+
+    The browser POSTs fields plus the file as multipart form data; the
+    signed policy pins the key and content type and caps the size at
+    MAX_STAGED_ARCHIVE_BYTES, which a presigned PUT cannot enforce.
+    """
+    bucket_name = staging_bucket()
+    client = build_minio_client()
+    try:
+        presigned = client.generate_presigned_post(
+            Bucket=bucket_name,
+            Key=object_key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, MAX_STAGED_ARCHIVE_BYTES],
+            ],
+            ExpiresIn=expires_in,
+        )
+        return presigned["url"], presigned["fields"], bucket_name
+    except Exception as exc:
+        raise MinioUploadError(str(exc)) from exc
+
+
+def open_staged_archive(*, bucket_name: str, object_key: str):
+    """Open a staged archive for reading and return its streaming body.
+
+    The body is consumed in chunks by the caller, so the archive is never
+    fully materialised on the web host.
+    """
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    client = build_minio_client()
+    try:
+        response = client.get_object(Bucket=bucket_name, Key=object_key)
+    except (ClientError, BotoCoreError) as exc:
+        raise MinioUploadError(str(exc)) from exc
+    return response["Body"]
+
+
+def staged_archive_metadata(*, bucket_name: str, object_key: str) -> tuple[str, int]:
+    """Return (etag, size) of a staged archive from a HEAD request, without reading its body."""
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    client = build_minio_client()
+    try:
+        response = client.head_object(Bucket=bucket_name, Key=object_key)
+    except (ClientError, BotoCoreError) as exc:
+        raise MinioUploadError(str(exc)) from exc
+    return response["ETag"], response["ContentLength"]
+
+
+def delete_staged_archive(*, bucket_name: str, object_key: str) -> None:
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    client = build_minio_client()
+    try:
+        client.delete_object(Bucket=bucket_name, Key=object_key)
+    except (ClientError, BotoCoreError) as exc:
+        raise MinioUploadError(str(exc)) from exc
@@ -0,0 +1,247 @@
+import logging
+from collections import Counter
+
+import requests
+
+from core.services import get_client
+
+from .result_cache import parse_github_repo
+
+__all__ = [
+    "changed_files_between",
+    "diff_findings",
+    "incident_file",
+    "merge_incremental_result",
+    "partial_scan_is_scoped",
+    "scan_relative_path",
+]
+
+logger = logging.getLogger(__name__)
+
+# The compare API truncates the file list at this size, so a full list is only
+# guaranteed below it.
+GITHUB_COMPARE_FILE_LIMIT = 300
+
+
+def incident_file(incident: dict) -> str:
+    """Return the file path an incident refers to, as shown in its location label."""
+    location = str(incident.get("location") or incident.get("path") or "Unknown file")
+    file_label = location.split(" (line ", 1)[0]
+    if ":" in file_label and not file_label.startswith(("./", "/")):
+        file_label = file_label.split(":", 1)[1]
+    return file_label
+
+
+def _normalise_path(path: str) -> str:
+    path = str(path or "").strip()
+    while path.startswith("./"):
+        path = path[2:]
+    return path.lstrip("/")
+
+
+def scan_relative_path(path: str, subdirectory: str = "") -> str:
+    """Return a result path relative to the scan root.
+
+    The backend reports paths either relative to the scanned subdirectory or
+    to the repository root; the known subdirectory prefix is stripped so both
+    compare equal to the compare API's (subdirectory-scoped) paths.
+    """
+    path = _normalise_path(path)
+    root = _normalise_path(subdirectory).rstrip("/")
+    if root and path.startswith(f"{root}/"):
+        return path[len(root) + 1:]
+    return path
+
+
+def partial_scan_is_scoped(partial_result: dict, changed: set, subdirectory: str = "") -> bool:
+    """Whether a scan requested for only the changed files really skipped the others.
+
+    The backend may ignore include_paths and scan the whole tree; its result
+    is then complete on its own and should be used instead of a merge.
+    Results that do not list their scanned files are treated as scoped.
+    """
+    taxonomy = partial_result.get("taxonomy") if isinstance(partial_result.get("taxonomy"), dict) else {}
+    scanned = {scan_relative_path(path, subdirectory) for path in taxonomy.get("scanned_files") or []}
+    return scanned <= set(changed)
+
+
+def changed_files_between(
+    repo_url: str,
+    base_sha: str,
+    head_sha: str,
+    access_token: str = "",
+    subdirectory: str = "",
+) -> tuple[set, set] | None:
+    """Return (changed_paths, removed_paths) between two commits of a GitHub repository.
+
+    Returns None when the diff cannot be determined completely (non-GitHub
+    URL, API failure, history rewritten, or more files than the compare API
+    lists), in which case the caller falls back to a full scan.
+    """
+    parsed = parse_github_repo(repo_url)
+    if not parsed:
+        return None
+    owner, repo = parsed
+    headers = {"Accept": "application/vnd.github+json"}
+    if access_token:
+        headers["Authorization"] = f"Bearer {access_token}"
+    try:
+        response = get_client("github").get(
+            f"https://api.github.com/repos/{owner}/{repo}/compare/{base_sha}...{head_sha}",
+            headers=headers,
+        )
+        response.raise_for_status()
+        payload = response.json()
+    except (requests.RequestException, ValueError) as exc:
+        logger.info("Could not compare %s %s...%s: %s", repo_url, base_sha, head_sha, exc)
+        return None
+
+    if payload.get("status") not in ("ahead", "identical"):
+        return None
+    files = payload.get("files") or []
+    if len(files) >= GITHUB_COMPARE_FILE_LIMIT:
+        return None
+
+    prefix = _normalise_path(subdirectory).rstrip("/")
+    prefix = f"{prefix}/" if prefix else ""
+    changed, removed = set(), set()
+    for entry in files:
+        filename = _normalise_path(entry.get("filename"))
+        previous = _normalise_path(entry.get("previous_filename"))
+        if entry.get("status") == "removed":
+            removed.add(filename)
+        else:
+            changed.add(filename)
+        if previous and previous != filename:
+            removed.add(previous)
+
+    def _scoped(paths):
+        return {p[len(prefix):] for p in paths if p.startswith(prefix)} if prefix else paths
+
+    return _scoped(changed), _scoped(removed)
+
+
+def merge_incremental_result(
+    parent_result: dict,
+    partial_result: dict,
+    changed: set,
+    removed: set,
+    subdirectory: str = "",
+) -> dict:
+    """Combine a scan of only the changed files with the parent's findings for the rest.
+
+    Incidents and scanned files of touched paths come from partial_result;
+    everything else is carried over from parent_result. Paths are compared
+    exactly, relative to the scan root. Totals, CWE/CVE sets and standards
+    are recomputed for the merged incident list.
+    """
+    touched = set(changed) | set(removed)
+
+    def _path_in(path, paths):
+        return scan_relative_path(path, subdirectory) in paths
+
+    parent_tax = parent_result.get("taxonomy") if isinstance(parent_result.get("taxonomy"), dict) else {}
+    partial_tax = partial_result.get("taxonomy") if isinstance(partial_result.get("taxonomy"), dict) else {}
+
+    incidents = [
+        incident for incident in parent_tax.get("incidents") or []
+        if isinstance(incident, dict) and not _path_in(incident_file(incident), touched)
+    ]
+    incidents.extend(
+        incident for incident in partial_tax.get("incidents") or []
+        if isinstance(incident, dict) and _path_in(incident_file(incident), set(changed))
+    )
+
+    scanned_files = sorted(
+        {str(path) for path in parent_tax.get("scanned_files") or [] if not _path_in(path, set(removed))}
+        | {str(path) for path in partial_tax.get("scanned_files") or [] if _path_in(path, set(changed))}
+    )
+
+    cwe_ids = sorted({str(ref).upper() for incident in incidents for ref in incident.get("cwe_refs") or []})
+    cve_ids = sorted({str(ref).upper() for incident in incidents for ref in incident.get("cve_refs") or []})
+    referenced = set(cwe_ids) | set(cve_ids)
+    standards = {}
+    for row in (parent_tax.get("standards") or []) + (partial_tax.get("standards") or []):
+        if not isinstance(row, dict):
+            continue
+        standard_id = str(row.get("standard") or "").upper()
+        if standard_id.startswith(("CWE-", "CVE-")) and standard_id not in referenced:
+            continue
+        standards[standard_id] = row
+
+    by_rule = {}
+    for source in (parent_tax.get("by_rule"), partial_tax.get("by_rule")):
+        if isinstance(source, dict):
+            by_rule.update(source)
+
+    parent_stats = parent_tax.get("stats") if isinstance(parent_tax.get("stats"), dict) else {}
+    partial_stats = partial_tax.get("stats") if isinstance(partial_tax.get("stats"), dict) else {}
+    taxonomy = {
+        **parent_tax,
+        **partial_tax,
+        "incidents": incidents,
+        "scanned_files": scanned_files,
+        "cwe": cwe_ids,
+        "cve": cve_ids,
+        "standards": list(standards.values()),
+        "by_rule": by_rule,
+        "stats": {
+            **parent_stats,
+            **partial_stats,
+            "findings_total": len(incidents),
+            "files_scanned": len(scanned_files) or parent_stats.get("files_scanned", 0),
+            "scan_time_sec": partial_stats.get("scan_time_sec", 0.0),
+        },
+    }
+    return {**parent_result, **partial_result, "taxonomy": taxonomy, "issues_found": len(incidents)}
+
+
+def _finding_identity(incident: dict) -> tuple:
+    # Line numbers shift with unrelated edits, so they are not part of the identity.
+    message = " ".join(str(incident.get("message") or "").split())
+    return (str(incident.get("rule") or ""), _normalise_path(incident_file(incident)), message)
+
+
+def _finding_sample(incident: dict) -> dict:
+    return {
+        "severity": incident.get("severity") or "INFO",
+        "rule": incident.get("rule") or "rule unavailable",
+        "location": incident.get("location") or "Source location not provided",
+        "line": incident.get("line"),
+        "message": incident.get("message") or incident.get("rule") or "Unnamed finding",
+    }
+
+
+def diff_findings(base_result: dict, head_result: dict, sample_size: int = 50) -> dict:
+    """Classify head_result's findings as new, fixed or unchanged relative to base_result."""
+    def _incidents(result):
+        taxonomy = result.get("taxonomy") if isinstance(result, dict) else None
+        incidents = taxonomy.get("incidents") if isinstance(taxonomy, dict) else None
+        return [incident for incident in incidents or [] if isinstance(incident, dict)]
+
+    base_incidents = _incidents(base_result)
+    head_incidents = _incidents(head_result)
+    base_counts = Counter(_finding_identity(incident) for incident in base_incidents)
+    head_counts = Counter(_finding_identity(incident) for incident in head_incidents)
+    new_counts = head_counts - base_counts
+    fixed_counts = base_counts - head_counts
+
+    def _sample(incidents, counts):
+        remaining = Counter(counts)
+        samples = []
+        for incident in incidents:
+            if len(samples) >= sample_size:
+                break
+            identity = _finding_identity(incident)
+            if remaining[identity] > 0:
+                remaining[identity] -= 1
+                samples.append(_finding_sample(incident))
+        return samples
+
+    return {
+        "new": sum(new_counts.values()),
+        "fixed": sum(fixed_counts.values()),
+        "unchanged": sum((base_counts & head_counts).values()),
+        "new_findings": _sample(head_incidents, new_counts),
+        "fixed_findings": _sample(base_incidents, fixed_counts),
+    }
@@ -0,0 +1,50 @@
+import uuid
+from typing import Iterable, Iterator
+
+__all__ = [
+    "MultipartStream",
+]
+
+
+def _quote_param(value: str) -> str:
+    # Header parameters cannot carry raw quotes or line breaks.
+    return str(value).replace("\r", "").replace("\n", "").replace('"', "%22")
+
+
+class MultipartStream:
+    """Build a multipart/form-data request body lazily from an iterable of chunks.
+
+    Passing iter(stream) as ``data=`` to requests sends the body with chunked
+    transfer encoding, so a file part of any size is forwarded chunk by chunk
+    without being buffered in memory or written to disk first.
+    """
+
+    def __init__(self, fields: dict, *, file_field: str, filename: str, content_type: str, chunks: Iterable[bytes]):
+        self.boundary = uuid.uuid4().hex
+        self.fields = fields
+        self.file_field = file_field
+        self.filename = filename
+        self.content_type = content_type or "application/octet-stream"
+        self.chunks = chunks
+
+    @property
+    def content_type_header(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __iter__(self) -> Iterator[bytes]:
+        for name, value in self.fields.items():
+            yield (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{_quote_param(name)}"\r\n\r\n'
+                f"{value}\r\n"
+            ).encode("utf-8")
+        yield (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote_param(self.file_field)}"; '
+            f'filename="{_quote_param(self.filename)}"\r\n'
+            f"Content-Type: {self.content_type}\r\n\r\n"
+        ).encode("utf-8")
+        for chunk in self.chunks:
+            if chunk:
+                yield chunk
+        yield f"\r\n--{self.boundary}--\r\n".encode("utf-8")
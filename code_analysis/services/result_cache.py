@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import re
+
+import requests
+from django.conf import settings
+from django.db.models import F
+
+from core.services import get_client
+
+from ..models import ScanResultCache
+
+__all__ = [
+    "archive_cache_key",
+    "forget_cache_key",
+    "github_cache_key",
+    "lookup_cached_job_id",
+    "parse_github_repo",
+    "remember_scan_result",
+    "resolve_github_commit",
+    "staged_archive_cache_key",
+]
+
+logger = logging.getLogger(__name__)
+
+_GITHUB_REPO_RE = re.compile(r"^https?://(?:www\.)?github\.com/([^/\s]+)/([^/\s]+?)(?:\.git)?/?$", re.IGNORECASE)
+_COMMIT_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+
+
+def _ruleset_version() -> str:
+    return str(getattr(settings, "SCAN_RULESET_VERSION", "") or "default")
+
+
+def _digest(fingerprint: dict) -> str:
+    blob = json.dumps(fingerprint, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _normalise_repo_url(repo_url: str) -> str:
+    url = (repo_url or "").strip().rstrip("/")
+    if url.lower().endswith(".git"):
+        url = url[:-4]
+    return url.lower()
+
+
+def archive_cache_key(archive_sha256: str) -> tuple[str, dict]:
+    """Return (cache_key, fingerprint) for an uploaded archive's SHA-256 digest."""
+    fingerprint = {"archive_sha256": archive_sha256, "ruleset": _ruleset_version()}
+    return _digest(fingerprint), fingerprint
+
+
+def staged_archive_cache_key(etag: str, size: int) -> tuple[str, dict]:
+    """Return (cache_key, fingerprint) for a staged archive from its object metadata.
+
+    Object storage derives the ETag from the stored bytes, so with the size it
+    identifies the archive without downloading it. Staged and direct uploads
+    of the same archive therefore get different keys.
+    """
+    fingerprint = {"archive_etag": etag.strip('"'), "archive_size": int(size), "ruleset": _ruleset_version()}
+    return _digest(fingerprint), fingerprint
+
+
+def github_cache_key(repo_url: str, commit_sha: str, subdirectory: str = "") -> tuple[str, dict]:
+    """Return (cache_key, fingerprint) for a repository snapshot at a resolved commit."""
+    fingerprint = {
+        "repo_url": _normalise_repo_url(repo_url),
+        "commit_sha": commit_sha.lower(),
+        "subdirectory": (subdirectory or "").strip().strip("/"),
+        "ruleset": _ruleset_version(),
+    }
+    return _digest(fingerprint), fingerprint
+
+
+def parse_github_repo(repo_url: str) -> tuple[str, str] | None:
+    """Return (owner, repo) for a github.com repository URL, or None for other hosts."""
+    match = _GITHUB_REPO_RE.match((repo_url or "").strip())
+    return match.groups() if match else None
+
+
+def resolve_github_commit(repo_url: str, branch: str = "", access_token: str = "") -> str | None:
+    """Resolve a branch (or the default branch) to its current commit SHA.
+
+    Returns None for non-GitHub URLs or when the lookup fails, in which case
+    the caller should simply scan without caching.
+    """
+    parsed = parse_github_repo(repo_url)
+    if not parsed:
+        return None
+    owner, repo = parsed
+    headers = {"Accept": "application/vnd.github.sha"}
+    if access_token:
+        headers["Authorization"] = f"Bearer {access_token}"
+    try:
+        response = get_client("github").get(
+            f"https://api.github.com/repos/{owner}/{repo}/commits/{branch or 'HEAD'}",
+            headers=headers,
+            timeout=10,
+        )
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        logger.info("Could not resolve commit for %s@%s: %s", repo_url, branch or "HEAD", exc)
+        return None
+    sha = response.text.strip().lower()
+    return sha if _COMMIT_SHA_RE.match(sha) else None
+
+
+def lookup_cached_job_id(cache_key: str) -> str | None:
+    entry = ScanResultCache.objects.filter(cache_key=cache_key).only("id", "job_id").first()
+    if entry is None:
+        return None
+    ScanResultCache.objects.filter(id=entry.id).update(hit_count=F("hit_count") + 1)
+    return entry.job_id
+
+
+def remember_scan_result(cache_key: str, fingerprint: dict, job_id: str) -> None:
+    # Only GitHub fingerprints carry a repo URL; hashed and staged archives do not
+    source_kind = (
+        ScanResultCache.SourceKind.GITHUB if "repo_url" in fingerprint else ScanResultCache.SourceKind.ARCHIVE
+    )
+    ScanResultCache.objects.update_or_create(
+        cache_key=cache_key,
+        defaults={"source_kind": source_kind, "fingerprint": fingerprint, "job_id": job_id},
+    )
+
+
+def forget_cache_key(cache_key: str) -> None:
+    ScanResultCache.objects.filter(cache_key=cache_key).delete()
@@ -0,0 +1,502 @@
+import re
+
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from ..models import ScanCwe, ScanIncident, ScanReport, ScanRule
+from .incremental import incident_file
+
+__all__ = [
+    "INCIDENT_SORTS",
+    "build_results_model",
+    "filter_incidents",
+    "incident_facets",
+    "index_scan_results",
+    "sort_incidents",
+    "severity_bucket",
+]
+
+INCIDENT_BATCH_SIZE = 1000
+FACET_LIMIT = 50
+
+_ERROR_SEVERITIES = {"ERROR", "CRITICAL", "HIGH"}
+_WARNING_SEVERITIES = {"WARNING", "MEDIUM", "MAJOR"}
+_INFO_SEVERITIES = {"INFO", "LOW", "MINOR"}
+
+
+def _first_sentence(text):
+    clean = " ".join(str(text or "").split())
+    if not clean:
+        return ""
+    match = re.search(r"(.+?[.!?])(?:\s|$)", clean)
+    return match.group(1).strip() if match else clean
+
+
+def _clamp(model, field_name, value) -> str:
+    """Cut a backend-supplied value to the column's max_length so indexing cannot overflow it."""
+    return str(value)[: model._meta.get_field(field_name).max_length]
+
+
+def severity_bucket(severity) -> str:
+    """Map a backend severity label onto the error/warning/info buckets used by the UI."""
+    name = str(severity or "INFO").upper()
+    if name in _ERROR_SEVERITIES:
+        return ScanIncident.SeverityBucket.ERROR
+    if name in _WARNING_SEVERITIES:
+        return ScanIncident.SeverityBucket.WARNING
+    return ScanIncident.SeverityBucket.INFO
+
+
+def _meta_rows(meta):
+    rows = [
+        {"key": str(k).replace("_", " ").title(), "value": v}
+        for k, v in meta.items()
+        if v not in (None, "", [], {})
+    ]
+    rows.sort(key=lambda item: item["key"])
+    return rows
+
+
+def _collect_issues(analysis_result, taxonomy, cwe_desc_by_id):
+    issues_payload = analysis_result.get("issues", {})
+    legacy_issues = issues_payload.get("issues", []) if isinstance(issues_payload, dict) else []
+    taxonomy_by_rule = taxonomy.get("by_rule", {}) or {}
+    issues = []
+
+    for incident in taxonomy.get("incidents", []) or []:
+        if not isinstance(incident, dict):
+            continue
+        full_message = str(incident.get("message") or incident.get("rule") or "Unnamed finding")
+        issues.append({
+            "severity": incident.get("severity") or "INFO",
+            "message": full_message,
+            "display_message": _first_sentence(full_message),
+            "location": incident.get("location") or "Source location not provided",
+            "type": incident.get("type") or "SECURITY",
+            "rule": incident.get("rule") or "rule unavailable",
+            "line": incident.get("line"),
+            "status": incident.get("status") or "OPEN",
+            "effort": incident.get("effort") or "n/a",
+            "cwe_refs": incident.get("cwe_refs") or [],
+            "cve_refs": incident.get("cve_refs") or [],
+            "metadata_rows": incident.get("metadata_rows") or [],
+        })
+
+    # Backward compatibility path for reports that have taxonomy.by_rule but no taxonomy.incidents.
+    if not issues and isinstance(taxonomy_by_rule, dict) and taxonomy_by_rule:
+        for rule_id, rule_tax in list(taxonomy_by_rule.items()):
+            if not isinstance(rule_tax, dict):
+                continue
+            rule_meta = rule_tax.get("meta", {}) if isinstance(rule_tax.get("meta"), dict) else {}
+            message = rule_meta.get("short_description") or f"Semgrep finding: {rule_id}"
+            issues.append({
+                "severity": "INFO",
+                "message": message,
+                "display_message": _first_sentence(message),
+                "location": "Semgrep metadata",
+                "type": str(rule_meta.get("category") or "SECURITY").upper(),
+                "rule": rule_id,
+                "line": None,
+                "status": "OPEN",
+                "effort": "n/a",
+                "cwe_refs": sorted(rule_tax.get("cwe", []) if isinstance(rule_tax.get("cwe"), list) else []),
+                "cve_refs": sorted(rule_tax.get("cve", []) if isinstance(rule_tax.get("cve"), list) else []),
+                "metadata_rows": _meta_rows(rule_meta),
+            })
+
+    # Backward compatibility for reports generated before taxonomy.incidents/stats existed.
+    if not issues and legacy_issues:
+        for issue in legacy_issues:
+            if not isinstance(issue, dict):
+                continue
+            blob = " ".join([
+                str(issue.get("message") or ""),
+                str(issue.get("rule") or ""),
+                " ".join(str(tag) for tag in (issue.get("tags") or [])),
+            ])
+            rule_id = str(issue.get("rule") or "").strip()
+            metadata_rows = []
+            if rule_id and isinstance(taxonomy_by_rule, dict):
+                rule_candidates = [rule_id]
+                if ":" in rule_id:
+                    rule_candidates.append(rule_id.split(":", 1)[1])
+                for candidate in rule_candidates:
+                    rule_tax = taxonomy_by_rule.get(candidate)
+                    if not isinstance(rule_tax, dict):
+                        continue
+                    meta = rule_tax.get("meta", {})
+                    if isinstance(meta, dict) and meta:
+                        metadata_rows = _meta_rows(meta)
+                        break
+            message = issue.get("message") or issue.get("rule") or "Unnamed finding"
+            issues.append({
+                "severity": issue.get("severity") or "INFO",
+                "message": message,
+                "display_message": _first_sentence(message),
+                "location": issue.get("component") or issue.get("path") or "Source location not provided",
+                "type": issue.get("type") or "SECURITY",
+                "rule": issue.get("rule") or "rule unavailable",
+                "line": issue.get("line"),
+                "status": issue.get("status") or "OPEN",
+                "effort": issue.get("effort") or "n/a",
+                "cwe_refs": sorted({f"CWE-{m}" for m in re.findall(r"CWE[-:_ ]?(\d+)", blob, flags=re.IGNORECASE)}),
+                "cve_refs": sorted({m.upper() for m in re.findall(r"CVE-\d{4}-\d+", blob, flags=re.IGNORECASE)}),
+                "metadata_rows": metadata_rows,
+            })
+
+    # Ensure metadata table always includes explicit CWE and CWE description rows when available.
+    for issue in issues:
+        rows = [dict(item) for item in issue.get("metadata_rows") or [] if isinstance(item, dict)]
+        row_keys = {str(item.get("key") or "").strip().lower() for item in rows}
+        issue_cwe_refs = sorted({str(c).upper().strip() for c in issue["cwe_refs"] if str(c).strip()})
+        issue["cwe_refs"] = issue_cwe_refs
+        if issue_cwe_refs and "cwe" not in row_keys:
+            rows.append({"key": "CWE", "value": ", ".join(issue_cwe_refs)})
+        if issue_cwe_refs and "cwe description" not in row_keys:
+            descs = [cwe_desc_by_id.get(cwe) for cwe in issue_cwe_refs if cwe_desc_by_id.get(cwe)]
+            if descs:
+                rows.append({"key": "CWE Description", "value": " | ".join(_first_sentence(d) for d in descs if d)})
+        for item in rows:
+            key_name = str(item.get("key") or "").strip().lower()
+            item["display_value"] = item.get("value")
+            # Keep the original value intact for persisted JSON consumers,
+            # but shorten description-like metadata in the UI for readability.
+            if "description" in key_name:
+                item["display_value"] = _first_sentence(item.get("value"))
+        rows.sort(key=lambda item: str(item.get("key") or ""))
+        issue["metadata_rows"] = rows
+        issue["file"] = incident_file(issue)
+
+    return issues, legacy_issues
+
+
+def _standards_rows(taxonomy, cwe_ids, cve_ids):
+    rows = []
+    for row in taxonomy.get("standards", []) or []:
+        if not isinstance(row, dict):
+            continue
+        severity = (row.get("severity") or "INFO").upper()
+        if severity not in {"HIGH", "MEDIUM", "LOW", "INFO"}:
+            severity = "INFO"
+        rows.append({
+            "standard": row.get("standard") or "N/A",
+            "title": row.get("title") or "Security finding",
+            "description": row.get("description") or "",
+            "severity": severity,
+        })
+    if rows:
+        return rows
+    for standard in sorted(cwe_ids):
+        rows.append({
+            "standard": standard,
+            "title": "Detected weakness",
+            "description": "Mapped from issue tags or messages.",
+            "severity": "MEDIUM",
+        })
+    for standard in sorted(cve_ids):
+        rows.append({
+            "standard": standard,
+            "title": "Detected vulnerability identifier",
+            "description": "Mapped from issue tags or references.",
+            "severity": "HIGH",
+        })
+    return rows
+
+
+def _hotspot_priority(row):
+    # Explicit ordering: files with errors first, then warning-only, then info-only.
+    if row["errors"] > 0:
+        bucket = 0
+    elif row["warnings"] > 0:
+        bucket = 1
+    else:
+        bucket = 2
+    return (bucket, -row["errors"], -row["warnings"], -row["total"], row["file"])
+
+
+def build_results_model(analysis_result: dict) -> tuple[dict, list[dict]]:
+    """Derive the results page view-model from a raw scan report.
+
+    Returns (summary, issues): summary holds everything the overview tab
+    renders, issues is the normalised finding list (one dict per incident,
+    with its file path resolved) in report order.
+    """
+    analysis_result = analysis_result if isinstance(analysis_result, dict) else {}
+    taxonomy = analysis_result.get("taxonomy", {})
+    taxonomy = taxonomy if isinstance(taxonomy, dict) else {}
+    semgrep_stats = taxonomy.get("stats", {}) if isinstance(taxonomy.get("stats"), dict) else {}
+    cwe_ids = set(taxonomy.get("cwe", []) or [])
+    cve_ids = set(taxonomy.get("cve", []) or [])
+
+    cwe_desc_by_id = {}
+    for row in taxonomy.get("standards", []) or []:
+        if not isinstance(row, dict):
+            continue
+        standard_id = str(row.get("standard") or "").upper().strip()
+        if not standard_id.startswith("CWE-"):
+            continue
+        parts = [part for part in [str(row.get("title") or "").strip(), str(row.get("description") or "").strip()] if part]
+        if parts and standard_id not in cwe_desc_by_id:
+            cwe_desc_by_id[standard_id] = _first_sentence(" - ".join(parts))
+
+    issues, legacy_issues = _collect_issues(analysis_result, taxonomy, cwe_desc_by_id)
+
+    cwe_counts = {}
+    for issue in issues:
+        for cwe_id in issue["cwe_refs"]:
+            cwe_counts[cwe_id] = cwe_counts.get(cwe_id, 0) + 1
+    cwe_rows = [
+        {
+            "id": cwe_id,
+            "count": count,
+            "description": _first_sentence(cwe_desc_by_id.get(cwe_id) or "No Semgrep description available."),
+        }
+        for cwe_id, count in sorted(cwe_counts.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+    # Restrict hotspots to files known to be scanned in the current run.
+    allowed_files = {str(path).strip() for path in taxonomy.get("scanned_files", []) or [] if str(path).strip()}
+    hotspot_files = {}
+    for issue in issues:
+        if allowed_files and issue["file"] not in allowed_files:
+            continue
+        bucket = hotspot_files.setdefault(issue["file"], {"file": issue["file"], "errors": 0, "warnings": 0, "info": 0, "total": 0})
+        bucket_name = severity_bucket(issue["severity"])
+        if bucket_name == ScanIncident.SeverityBucket.ERROR:
+            bucket["errors"] += 1
+        elif bucket_name == ScanIncident.SeverityBucket.WARNING:
+            bucket["warnings"] += 1
+        else:
+            bucket["info"] += 1
+        bucket["total"] += 1
+
+    hotspots_preview = []
+    for item in sorted(hotspot_files.values(), key=_hotspot_priority)[:6]:
+        total = max(item["total"], 1)
+        hotspots_preview.append({
+            **item,
+            "error_width": round((item["errors"] / total) * 100, 2),
+            "warning_width": round((item["warnings"] / total) * 100, 2),
+            "info_width": round((item["info"] / total) * 100, 2),
+        })
+
+    severities = [str(issue["severity"] or "").upper() for issue in issues]
+    error_total = sum(1 for s in severities if s in _ERROR_SEVERITIES)
+    warning_total = sum(1 for s in severities if s in _WARNING_SEVERITIES)
+    info_total = sum(1 for s in severities if s in _INFO_SEVERITIES)
+    chart_total = error_total + warning_total + info_total
+    fallback_findings_total = len(legacy_issues) if legacy_issues else len(issues)
+    findings_total = semgrep_stats.get("findings_total", fallback_findings_total)
+    if chart_total:
+        error_end = round((error_total / chart_total) * 360, 2)
+        warning_end = round(error_end + ((warning_total / chart_total) * 360), 2)
+        pie_chart_style = (
+            "background: conic-gradient("
+            f"#d94841 0deg {error_end}deg, "
+            f"#f2a93b {error_end}deg {warning_end}deg, "
+            f"#4ea6ff {warning_end}deg 360deg"
+            ")"
+        )
+    else:
+        pie_chart_style = "background: conic-gradient(#dce5f2 0deg 360deg)"
+
+    summary = {
+        "project_name": analysis_result.get("project_name", "Analysis Report"),
+        "project_key": analysis_result.get("project_key", "-"),
+        "semgrep_stats": {
+            "files_scanned": semgrep_stats.get("files_scanned", 0),
+            "findings_total": findings_total,
+            "scan_time_sec": semgrep_stats.get("scan_time_sec", 0.0),
+            "cwe_total": len(cwe_ids),
+            "cve_total": len(cve_ids),
+        },
+        "severity_buckets": {
+            "errors": error_total,
+            "warnings": warning_total,
+            "info": info_total,
+            "total": chart_total,
+        },
+        "severity_pie_style": pie_chart_style,
+        "cwe_items": sorted(cwe_ids)[:8],
+        "cve_items": sorted(cve_ids)[:8],
+        "standards_rows": _standards_rows(taxonomy, cwe_ids, cve_ids)[:12],
+        "top_cwe_rows": cwe_rows[:5],
+        "cwe_rows": cwe_rows,
+        "hotspots_preview": hotspots_preview,
+        "finding_diff": analysis_result.get("finding_diff"),
+        "incremental_scan": analysis_result.get("incremental"),
+    }
+    return summary, issues
+
+
+@transaction.atomic
+def index_scan_results(
+    *,
+    analysis_result: dict,
+    source_label: str,
+    job_id: str = "",
+    assessment_id: int | None = None,
+) -> ScanReport:
+    """Build the results view-model once and store it as indexed rows.
+
+    Any existing index for the same job or assessment is replaced, so this is
+    safe to call again after a report changes.
+    """
+    summary, issues = build_results_model(analysis_result)
+    cwe_rows = summary.pop("cwe_rows")
+
+    stale = ScanReport.objects.none()
+    if job_id:
+        stale = stale | ScanReport.objects.filter(job_id=job_id)
+    if assessment_id is not None:
+        stale = stale | ScanReport.objects.filter(assessment_id=assessment_id)
+    stale.delete()
+
+    report = ScanReport.objects.create(
+        job_id=job_id or "",
+        assessment_id=assessment_id,
+        source_label=_clamp(ScanReport, "source_label", source_label or ""),
+        summary=summary,
+        incident_count=len(issues),
+    )
+
+    # Identifiers are clamped before grouping so ids that only differ past the
+    # column limit share one row instead of tripping the unique constraints.
+    rule_ids = [_clamp(ScanRule, "rule_id", issue["rule"]) for issue in issues]
+    rule_counts = {}
+    for rule_id in rule_ids:
+        rule_counts[rule_id] = rule_counts.get(rule_id, 0) + 1
+    rules = {
+        rule.rule_id: rule
+        for rule in ScanRule.objects.bulk_create(
+            ScanRule(report=report, rule_id=rule_id, incident_count=count)
+            for rule_id, count in rule_counts.items()
+        )
+    }
+    cwe_totals = {}
+    for row in cwe_rows:
+        cwe_id = _clamp(ScanCwe, "cwe_id", row["id"])
+        description, count = cwe_totals.get(cwe_id, (row["description"], 0))
+        cwe_totals[cwe_id] = (description, count + row["count"])
+    cwes = {
+        cwe.cwe_id: cwe
+        for cwe in ScanCwe.objects.bulk_create(
+            ScanCwe(report=report, cwe_id=cwe_id, description=description, incident_count=count)
+            for cwe_id, (description, count) in cwe_totals.items()
+        )
+    }
+
+    incidents = ScanIncident.objects.bulk_create(
+        (
+            ScanIncident(
+                report=report,
+                ordinal=ordinal,
+                severity=_clamp(ScanIncident, "severity", issue["severity"]),
+                severity_bucket=severity_bucket(issue["severity"]),
+                issue_type=_clamp(ScanIncident, "issue_type", issue["type"]),
+                rule=rules[rule_id],
+                file_path=_clamp(ScanIncident, "file_path", issue["file"]),
+                line=issue["line"] if isinstance(issue["line"], int) and issue["line"] >= 0 else None,
+                location=str(issue["location"]),
+                message=str(issue["message"]),
+                display_message=issue["display_message"],
+                status=_clamp(ScanIncident, "status", issue["status"]),
+                effort=_clamp(ScanIncident, "effort", issue["effort"]),
+                cve_refs=issue["cve_refs"],
+                metadata_rows=issue["metadata_rows"],
+            )
+            for ordinal, (issue, rule_id) in enumerate(zip(issues, rule_ids))
+        ),
+        batch_size=INCIDENT_BATCH_SIZE,
+    )
+    Through = ScanIncident.cwes.through
+    Through.objects.bulk_create(
+        (
+            Through(scanincident_id=incident.pk, scancwe_id=cwes[cwe_id].pk)
+            for incident, issue in zip(incidents, issues)
+            for cwe_id in dict.fromkeys(_clamp(ScanCwe, "cwe_id", ref) for ref in issue["cwe_refs"])
+        ),
+        batch_size=INCIDENT_BATCH_SIZE,
+    )
+    return report
+
+
+_SEVERITY_RANK = Case(
+    When(severity_bucket=ScanIncident.SeverityBucket.ERROR, then=Value(0)),
+    When(severity_bucket=ScanIncident.SeverityBucket.WARNING, then=Value(1)),
+    default=Value(2),
+    output_field=IntegerField(),
+)
+
+# Every ordering ends on ordinal so pages are stable.
+INCIDENT_SORTS = {
+    "report": ("ordinal",),
+    "severity": ("severity_rank", "ordinal"),
+    "-severity": ("-severity_rank", "ordinal"),
+    "file": ("file_path", "line", "ordinal"),
+    "-file": ("-file_path", "-line", "ordinal"),
+    "rule": ("rule__rule_id", "ordinal"),
+    "-rule": ("-rule__rule_id", "ordinal"),
+}
+
+
+def filter_incidents(
+    report: ScanReport,
+    *,
+    severity: str = "",
+    issue_type: str = "",
+    rule: str = "",
+    file: str = "",
+    path_prefix: str = "",
+    cwe: str = "",
+):
+    """Return the report's incidents in report order, narrowed by any of the given filters."""
+    incidents = report.incidents.select_related("rule")
+    if severity:
+        incidents = incidents.filter(severity_bucket=severity.lower())
+    if issue_type:
+        incidents = incidents.filter(issue_type__iexact=issue_type)
+    if rule:
+        incidents = incidents.filter(rule__rule_id=rule)
+    if file:
+        incidents = incidents.filter(file_path=file)
+    if path_prefix:
+        incidents = incidents.filter(file_path__startswith=path_prefix.lstrip("/"))
+    if cwe:
+        incidents = incidents.filter(cwes__cwe_id=cwe.upper())
+    return incidents.order_by("ordinal")
+
+
+def sort_incidents(incidents, sort: str = "report"):
+    """Apply one of INCIDENT_SORTS to an incident queryset."""
+    ordering = INCIDENT_SORTS[sort]
+    if "severity_rank" in ordering[0]:
+        incidents = incidents.annotate(severity_rank=_SEVERITY_RANK)
+    return incidents.order_by(*ordering)
+
+
+def incident_facets(report: ScanReport, **filters) -> dict:
+    """Count incidents per severity, type, rule and CWE.
+
+    Each facet applies every filter except its own, so the counts show what
+    selecting another value of that facet would return.
+    """
+    def _counts(field, own_filter, limit=None):
+        scoped = {key: value for key, value in filters.items() if key != own_filter}
+        rows = (
+            filter_incidents(report, **scoped)
+            .order_by()
+            .values(field)
+            .annotate(count=Count("id", distinct=True))
+            .order_by("-count", field)
+        )
+        if limit is not None:
+            rows = rows[:limit]
+        return [{"value": row[field], "count": row["count"]} for row in rows]
+
+    return {
+        "severity": _counts("severity_bucket", "severity"),
+        "type": _counts("issue_type", "issue_type"),
+        "rule": _counts("rule__rule_id", "rule", limit=FACET_LIMIT),
+        "cwe": [row for row in _counts("cwes__cwe_id", "cwe", limit=FACET_LIMIT + 1) if row["value"]][:FACET_LIMIT],
+    }
@@ -1,3 +1,498 @@
-from django.test import TestCase
+import io
+import tempfile
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadhandler import MemoryFileUploadHandler
+from django.db import DataError
+from django.http.multipartparser import MultiPartParser
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from code_analysis import views
+from code_analysis.models import ScanIncident, ScanReport, ScanResultCache
+from code_analysis.services import (
+    MAX_STAGED_ARCHIVE_BYTES,
+    MultipartStream,
+    diff_findings,
+    filter_incidents,
+    generate_presigned_archive_post,
+    github_cache_key,
+    incident_file,
+    index_scan_results,
+    is_owned_staging_key,
+    merge_incremental_result,
+    partial_scan_is_scoped,
+    remember_scan_result,
+    staged_archive_cache_key,
+    staging_prefix_for_user,
+)
+from projects.models import Project
+from trustworthiness.models import Assessment
+
+User = get_user_model()
+
+
+class MultipartStreamTests(TestCase):
+
+    def test_body_parses_as_multipart_form(self):
+        stream = MultipartStream(
+            {"project_name": "demo"},
+            file_field="file",
+            filename='repo "v2".zip',
+            content_type="application/zip",
+            chunks=iter([b"PK\x03\x04", b"", b"payload"]),
+        )
+        body = b"".join(stream)
+
+        parser = MultiPartParser(
+            {"CONTENT_TYPE": stream.content_type_header, "CONTENT_LENGTH": str(len(body))},
+            io.BytesIO(body),
+            [MemoryFileUploadHandler()],
+            "utf-8",
+        )
+        post, files = parser.parse()
+
+        self.assertEqual(post["project_name"], "demo")
+        self.assertEqual(files["file"].read(), b"PK\x03\x04payload")
+        self.assertEqual(files["file"].content_type, "application/zip")
+
+
+class ArchiveUploadUrlTests(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username="scanner", email="scanner@example.com", password="pass")
+        self.client.force_login(self.user)
+        self.url = reverse("code_analysis:archive_upload_url")
+
+    def test_rejects_non_archive(self):
+        resp = self.client.post(self.url, {"filename": "notes.txt"})
+        self.assertEqual(resp.status_code, 400)
+
+    @patch("code_analysis.views.generate_presigned_archive_post", return_value=("http://minio/", {"key": "k"}, "bucket"))
+    def test_issues_key_under_user_prefix(self, mock_presign):
+        resp = self.client.post(self.url, {"filename": "My Repo.tar.gz", "content_type": "application/gzip"})
+        self.assertEqual(resp.status_code, 200)
+        key = resp.json()["key"]
+        self.assertTrue(key.startswith(staging_prefix_for_user(self.user)))
+        self.assertTrue(key.endswith("/my-repo.tar.gz"))
+        self.assertEqual(resp.json()["fields"], {"key": "k"})
+        mock_presign.assert_called_once_with(object_key=key, content_type="application/gzip")
+
+    def test_prefixes_are_unique_per_user(self):
+        # Both usernames slugify to "a-b"
+        first = User.objects.create_user(username="a.b", email="ab1@example.com", password=None)
+        second = User.objects.create_user(username="a b", email="ab2@example.com", password=None)
+        self.assertNotEqual(staging_prefix_for_user(first), staging_prefix_for_user(second))
+        self.assertFalse(is_owned_staging_key(second, f"{staging_prefix_for_user(first)}abc/repo.zip"))
+
+    @patch("code_analysis.services.archive_staging.build_minio_client")
+    def test_presigned_post_caps_content_length(self, mock_client):
+        mock_client.return_value.generate_presigned_post.return_value = {"url": "http://minio/", "fields": {}}
+
+        generate_presigned_archive_post(object_key="k", content_type="application/zip")
+
+        conditions = mock_client.return_value.generate_presigned_post.call_args.kwargs["Conditions"]
+        self.assertIn(["content-length-range", 1, MAX_STAGED_ARCHIVE_BYTES], conditions)
+
+    @patch("code_analysis.views.generate_presigned_archive_post")
+    def test_rejects_archive_over_size_limit(self, mock_presign):
+        resp = self.client.post(self.url, {"filename": "repo.zip", "size": MAX_STAGED_ARCHIVE_BYTES + 1})
+        self.assertEqual(resp.status_code, 413)
+        mock_presign.assert_not_called()
+
+    def test_processing_rejects_foreign_staged_key(self):
+        resp = self.client.post(reverse("code_analysis:processing"), {
+            "source_type": "Local ZIP File",
+            "staged_archive_key": "code-analysis/pending/someone-else/abc/repo.zip",
+        })
+        self.assertEqual(resp.status_code, 404)
+
+
+@override_settings(SCAN_API_URL="http://scan.test.invalid", SCAN_API_TIMEOUT=5)
+class StagedScanJobTests(TestCase):
+
+    def _staged_body(self):
+        body = MagicMock()
+        body.iter_chunks.return_value = iter([b"chunk-1", b"chunk-2"])
+        return body
+
+    @patch("code_analysis.views._persist_scan_result")
+    @patch("code_analysis.views.staged_archive_metadata", return_value=('"0f343b0931126a20f133d67c2b018a3b"', 14))
+    @patch("code_analysis.views.delete_staged_archive")
+    @patch("code_analysis.views.open_staged_archive")
+    @patch("core.services.http_client.requests.Session.request")
+    def test_streams_archive_and_cleans_up(self, mock_post, mock_open, mock_delete, mock_metadata, mock_persist):
+        mock_open.side_effect = lambda **kwargs: self._staged_body()
+        sent = {}
+
+        def _capture(method, url, **kwargs):
+            sent["body"] = b"".join(kwargs["data"])
+            sent["headers"] = kwargs["headers"]
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"issues_found": 0}
+            return response
+
+        mock_post.side_effect = _capture
+        upload_meta = {
+            "bucket_name": "bucket",
+            "object_key": "code-analysis/pending/u/abc/repo.zip",
+            "filename": "repo.zip",
+            "content_type": "application/zip",
+        }
+
+        views._run_scan_job("job-1", "Local ZIP File", "staged", {"project_name": "repo"}, upload_meta)
+
+        self.assertIn(b"chunk-1chunk-2", sent["body"])
+        self.assertTrue(sent["headers"]["Content-Type"].startswith("multipart/form-data; boundary="))
+        self.assertEqual(views._get_scan_job("job-1")["status"], "completed")
+        mock_delete.assert_called_once_with(bucket_name="bucket", object_key=upload_meta["object_key"])
+        # Fingerprinted from object metadata: the archive is only read to stream it
+        mock_metadata.assert_called_once_with(bucket_name="bucket", object_key=upload_meta["object_key"])
+        self.assertEqual(mock_open.call_count, 1)
+
+    def test_staged_cache_key_follows_etag_and_size(self):
+        key, fingerprint = staged_archive_cache_key('"abc"', 10)
+        self.assertEqual(fingerprint["archive_etag"], "abc")
+        self.assertEqual(key, staged_archive_cache_key("abc", 10)[0])
+        self.assertNotEqual(key, staged_archive_cache_key("abc", 11)[0])
+        self.assertNotEqual(key, staged_archive_cache_key("abd", 10)[0])
+
+    def test_staged_cache_entry_is_recorded_as_archive(self):
+        key, fingerprint = staged_archive_cache_key("abc", 10)
+        remember_scan_result(key, fingerprint, "job-1")
+        self.assertEqual(ScanResultCache.objects.get(cache_key=key).source_kind, ScanResultCache.SourceKind.ARCHIVE)
+
+
+@override_settings(SCAN_API_URL="http://scan.test.invalid", SCAN_API_TIMEOUT=5)
+class ScanResultCacheTests(TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        store_override = override_settings(REPORT_STORE_ROOT=tmp_dir.name)
+        store_override.enable()
+        self.addCleanup(store_override.disable)
+        self.payload = {"repo_url": "https://github.com/org/repo", "project_name": "repo"}
+
+    def _scan_response(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"project_name": "repo", "issues_found": 3}
+        return response
+
+    @patch("code_analysis.views.resolve_github_commit", return_value="a" * 40)
+    @patch("core.services.http_client.requests.Session.request")
+    def test_identical_commit_reuses_stored_report(self, mock_post, mock_resolve):
+        mock_post.return_value = self._scan_response()
+
+        views._run_scan_job("job-first", "GitHub Repository", "github", self.payload)
+        views._run_scan_job("job-second", "GitHub Repository", "github", {**self.payload, "project_name": "renamed"})
+
+        self.assertEqual(mock_post.call_count, 1)
+        second = views._get_scan_job("job-second")
+        self.assertTrue(second["cache_hit"])
+        self.assertEqual(second["result"]["issues_found"], 3)
+        self.assertEqual(second["result"]["project_name"], "renamed")
+        self.assertEqual(ScanResultCache.objects.get().hit_count, 1)
+
+    @patch("code_analysis.views.resolve_github_commit", return_value="a" * 40)
+    @patch("core.services.http_client.requests.Session.request")
+    def test_force_rescan_bypasses_cache(self, mock_post, mock_resolve):
+        mock_post.return_value = self._scan_response()
+
+        views._run_scan_job("job-first", "GitHub Repository", "github", self.payload)
+        views._run_scan_job("job-forced", "GitHub Repository", "github", self.payload, force_rescan=True)
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(ScanResultCache.objects.get().job_id, "job-forced")
+
+    @patch("code_analysis.views.resolve_github_commit", return_value=None)
+    @patch("core.services.http_client.requests.Session.request")
+    def test_unresolved_commit_is_not_cached(self, mock_post, mock_resolve):
+        mock_post.return_value = self._scan_response()
+
+        views._run_scan_job("job-first", "GitHub Repository", "github", self.payload)
+
+        self.assertFalse(ScanResultCache.objects.exists())
+
+    def test_ruleset_version_is_part_of_key(self):
+        key, _ = github_cache_key("https://github.com/org/repo.git", "A" * 40)
+        self.assertEqual(key, github_cache_key("https://github.com/Org/repo/", "a" * 40)[0])
+        with self.settings(SCAN_RULESET_VERSION="v2"):
+            self.assertNotEqual(key, github_cache_key("https://github.com/org/repo", "a" * 40)[0])
+
+
+def _incident(path, rule="rule.a", message="Bad thing.", line=1):
+    return {"location": f"{path} (line {line})", "rule": rule, "message": message, "line": line, "severity": "ERROR"}
+
+
+class IncrementalMergeTests(TestCase):
+
+    def setUp(self):
+        self.parent = {
+            "project_name": "repo",
+            "taxonomy": {
+                "incidents": [_incident("src/a.py"), _incident("src/b.py"), _incident("src/gone.py")],
+                "scanned_files": ["src/a.py", "src/b.py", "src/gone.py"],
+                "stats": {"findings_total": 3, "files_scanned": 3},
+            },
+        }
+
+    def test_merge_replaces_only_touched_files(self):
+        partial = {"taxonomy": {
+            "incidents": [_incident("src/b.py", rule="rule.b"), _incident("src/a.py", rule="rule.ignored")],
+            "scanned_files": ["src/b.py", "src/c.py"],
+            "stats": {"scan_time_sec": 0.5},
+        }}
+
+        merged = merge_incremental_result(self.parent, partial, changed={"src/b.py", "src/c.py"}, removed={"src/gone.py"})
+
+        rules_by_file = {incident_file(i): i["rule"] for i in merged["taxonomy"]["incidents"]}
+        self.assertEqual(rules_by_file, {"src/a.py": "rule.a", "src/b.py": "rule.b"})
+        self.assertEqual(merged["taxonomy"]["scanned_files"], ["src/a.py", "src/b.py", "src/c.py"])
+        self.assertEqual(merged["taxonomy"]["stats"]["findings_total"], 2)
+        self.assertEqual(merged["issues_found"], 2)
+
+    def test_merge_matches_exact_paths_only(self):
+        parent = {"taxonomy": {
+            "incidents": [_incident("pkg/__init__.py"), _incident("__init__.py")],
+            "scanned_files": ["pkg/__init__.py", "__init__.py"],
+        }}
+        partial = {"taxonomy": {"incidents": [], "scanned_files": ["__init__.py"]}}
+
+        merged = merge_incremental_result(parent, partial, changed={"__init__.py"}, removed=set())
+
+        self.assertEqual([incident_file(i) for i in merged["taxonomy"]["incidents"]], ["pkg/__init__.py"])
+        self.assertEqual(merged["issues_found"], 1)
+
+    def test_merge_strips_subdirectory_root(self):
+        parent = {"taxonomy": {"incidents": [_incident("app/src/a.py"), _incident("app/src/b.py")]}}
+        partial = {"taxonomy": {"incidents": [], "scanned_files": ["app/src/b.py"]}}
+
+        merged = merge_incremental_result(parent, partial, changed={"src/b.py"}, removed=set(), subdirectory="app")
+
+        self.assertEqual([incident_file(i) for i in merged["taxonomy"]["incidents"]], ["app/src/a.py"])
+        self.assertTrue(partial_scan_is_scoped(partial, {"src/b.py"}, "app"))
+        self.assertFalse(partial_scan_is_scoped(
+            {"taxonomy": {"scanned_files": ["app/src/a.py", "app/src/b.py"]}}, {"src/b.py"}, "app",
+        ))
+
+    def test_diff_ignores_line_shifts(self):
+        head = {"taxonomy": {"incidents": [
+            _incident("src/a.py", line=10),
+            _incident("src/b.py"),
+            _incident("src/new.py"),
+        ]}}
+
+        diff = diff_findings(self.parent, head)
+
+        self.assertEqual((diff["new"], diff["fixed"], diff["unchanged"]), (1, 1, 2))
+        self.assertEqual(diff["new_findings"][0]["location"], "src/new.py (line 1)")
+        self.assertEqual(diff["fixed_findings"][0]["location"], "src/gone.py (line 1)")
+
+
+@override_settings(SCAN_API_URL="http://scan.test.invalid", SCAN_API_TIMEOUT=5)
+class IncrementalScanJobTests(TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        store_override = override_settings(REPORT_STORE_ROOT=tmp_dir.name)
+        store_override.enable()
+        self.addCleanup(store_override.disable)
+
+        user = User.objects.create_user(username="owner", email="owner@example.com", password="pass")
+        project = Project.objects.create(name="Scanned", creator=user)
+        _, fingerprint = github_cache_key("https://github.com/org/repo", "a" * 40)
+        self.parent = Assessment.objects.create(
+            project=project,
+            assessment_type=Assessment.AssessmentType.CODE_ANALYSIS,
+            status=Assessment.Status.COMPLETED,
+            input_data={"source": "GitHub Repository", "fingerprint": fingerprint},
+            results={"taxonomy": {
+                "incidents": [_incident("src/a.py"), _incident("src/b.py")],
+                "scanned_files": ["src/a.py", "src/b.py"],
+            }},
+        )
+        self.child = Assessment.objects.create(
+            project=project,
+            assessment_type=Assessment.AssessmentType.CODE_ANALYSIS,
+            input_data={"source": "GitHub Repository"},
+            parent_assessment=self.parent,
+            version=2,
+        )
+
+    @patch("code_analysis.views.changed_files_between", return_value=({"src/b.py"}, set()))
+    @patch("code_analysis.views.resolve_github_commit", return_value="b" * 40)
+    @patch("core.services.http_client.requests.Session.request")
+    def test_scans_only_changed_files_and_merges(self, mock_post, mock_resolve, mock_changed):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"taxonomy": {"incidents": [], "scanned_files": ["src/b.py"]}}
+        mock_post.return_value = response
+
+        views._run_scan_job(
+            "job-inc", "GitHub Repository", "github",
+            {"repo_url": "https://github.com/org/repo", "project_name": "repo"},
+            assessment_id=self.child.id, parent_assessment_id=self.parent.id,
+        )
+
+        self.assertEqual(mock_post.call_args.kwargs["data"]["include_paths"], "src/b.py")
+        self.child.refresh_from_db()
+        self.assertEqual(self.child.status, Assessment.Status.COMPLETED)
+        self.assertEqual([incident_file(i) for i in self.child.results["taxonomy"]["incidents"]], ["src/a.py"])
+        self.assertEqual(self.child.results["incremental"]["changed_files"], ["src/b.py"])
+        self.assertEqual(self.child.results["finding_diff"]["fixed"], 1)
+        self.assertEqual(self.child.input_data["fingerprint"]["commit_sha"], "b" * 40)
+
+    @patch("code_analysis.views.changed_files_between", return_value=({"src/b.py"}, set()))
+    @patch("code_analysis.views.resolve_github_commit", return_value="b" * 40)
+    @patch("core.services.http_client.requests.Session.request")
+    def test_full_result_is_used_when_backend_ignores_include_paths(self, mock_post, mock_resolve, mock_changed):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"taxonomy": {
+            "incidents": [_incident("src/a.py", rule="rule.fresh")],
+            "scanned_files": ["src/a.py", "src/b.py"],
+        }}
+        mock_post.return_value = response
+
+        views._run_scan_job(
+            "job-full", "GitHub Repository", "github",
+            {"repo_url": "https://github.com/org/repo", "project_name": "repo"},
+            assessment_id=self.child.id, parent_assessment_id=self.parent.id,
+        )
+
+        self.child.refresh_from_db()
+        self.assertEqual([i["rule"] for i in self.child.results["taxonomy"]["incidents"]], ["rule.fresh"])
+        self.assertEqual(self.child.results["incremental"]["mode"], "full")
+
+
+def _indexed_result():
+    incidents = [
+        {**_incident(f"src/mod{i % 3}.py", rule=f"rule.{i % 2}", line=i),
+         "severity": "ERROR" if i % 4 == 0 else "INFO",
+         "cwe_refs": ["cwe-79"] if i % 5 == 0 else []}
+        for i in range(60)
+    ]
+    return {
+        "project_name": "indexed",
+        "taxonomy": {
+            "incidents": incidents,
+            "scanned_files": ["src/mod0.py", "src/mod1.py", "src/mod2.py"],
+            "standards": [{"standard": "CWE-79", "title": "Cross-site Scripting", "description": "Bad. More."}],
+            "stats": {"findings_total": 60, "files_scanned": 3},
+        },
+    }
+
+
+class ResultsIndexTests(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username="viewer", email="viewer@example.com", password="pass")
+        self.client.force_login(self.user)
+        self.result = _indexed_result()
+
+    def test_index_normalises_rules_and_cwes(self):
+        report = index_scan_results(analysis_result=self.result, source_label="GitHub Repository", job_id="job-idx")
+
+        self.assertEqual(report.incident_count, 60)
+        self.assertEqual(dict(report.rules.values_list("rule_id", "incident_count")), {"rule.0": 30, "rule.1": 30})
+        cwe = report.cwes.get()
+        self.assertEqual((cwe.cwe_id, cwe.incident_count), ("CWE-79", 12))
+        self.assertEqual(report.summary["severity_buckets"]["errors"], 15)
+        self.assertEqual(report.summary["top_cwe_rows"][0]["description"], "Cross-site Scripting - Bad.")
+
+        self.assertEqual(filter_incidents(report, severity="error").count(), 15)
+        self.assertEqual(filter_incidents(report, rule="rule.1", file="src/mod1.py").count(), 10)
+        self.assertEqual(filter_incidents(report, cwe="cwe-79").count(), 12)
+
+    def test_reindexing_replaces_previous_rows(self):
+        index_scan_results(analysis_result=self.result, source_label="GitHub Repository", job_id="job-idx")
+        index_scan_results(analysis_result={"project_name": "empty"}, source_label="GitHub Repository", job_id="job-idx")
+
+        self.assertEqual(ScanReport.objects.get().incident_count, 0)
+        self.assertFalse(ScanIncident.objects.exists())
+
+    def test_results_page_is_paginated_and_filtered(self):
+        index_scan_results(analysis_result=self.result, source_label="GitHub Repository", job_id="job-idx")
+        url = reverse("code_analysis:results", args=["job-idx"])
+
+        first = self.client.get(url)
+        self.assertEqual(len(first.context["issues_preview"]), views.RESULTS_PAGE_SIZE)
+        self.assertEqual(first.context["semgrep_stats"]["findings_total"], 60)
+
+        filtered = self.client.get(url, {"severity": "error", "cwe": "CWE-79"})
+        self.assertEqual(filtered.context["issues_page"].paginator.count, 3)
+        self.assertTrue(filtered.context["details_active"])
+        self.assertEqual(filtered.context["issues_preview"][0]["cwe_refs"], ["CWE-79"])
+
+    def test_persisted_report_is_indexed_on_first_view(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, self.settings(REPORT_STORE_ROOT=tmp_dir):
+            views._persist_scan_result("job-legacy", "Local ZIP File", self.result)
+            resp = self.client.get(reverse("code_analysis:results", args=["job-legacy"]))
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(ScanReport.objects.get(job_id="job-legacy").incident_count, 60)
+
+    def test_overlong_backend_values_are_clamped_to_their_columns(self):
+        long_rule = "rule." + "x" * 300
+        incident = {**_incident("src/a.py", rule=long_rule), "severity": "S" * 40, "type": "T" * 80,
+                    "status": "O" * 40, "effort": "E" * 80}
+        result = {"taxonomy": {"incidents": [incident, {**incident, "rule": long_rule + "-variant"}]}}
+
+        report = index_scan_results(analysis_result=result, source_label="GitHub Repository", job_id="job-long")
+
+        rule = report.rules.get()
+        self.assertEqual((len(rule.rule_id), rule.incident_count), (255, 2))
+        stored = report.incidents.first()
+        self.assertEqual(
+            [len(stored.severity), len(stored.issue_type), len(stored.status), len(stored.effort)], [32, 64, 32, 64]
+        )
+
+    def test_report_that_cannot_be_indexed_renders_an_error(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, self.settings(REPORT_STORE_ROOT=tmp_dir):
+            views._persist_scan_result("job-broken", "Local ZIP File", self.result)
+            with patch("code_analysis.views.index_scan_results", side_effect=DataError("value too long")):
+                resp = self.client.get(reverse("code_analysis:results", args=["job-broken"]))
+                api = self.client.get(reverse("code_analysis:results_incidents_api", args=["job-broken"]))
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context["error"], views.UNINDEXED_REPORT_ERROR)
+        self.assertEqual(api.status_code, 503)
+
+
+class IncidentsApiTests(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_user(username="api", email="api@example.com", password="pass"))
+        index_scan_results(analysis_result=_indexed_result(), source_label="GitHub Repository", job_id="job-api")
+        self.url = reverse("code_analysis:results_incidents_api", args=["job-api"])
+
+    def test_filters_sorts_and_pages(self):
+        resp = self.client.get(self.url, {"path": "src/mod1", "sort": "severity", "page_size": 5, "page": 2})
+
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        self.assertEqual((body["count"], body["num_pages"], body["page"]), (20, 4, 2))
+        self.assertEqual(len(body["results"]), 5)
+        self.assertTrue(all(issue["file"] == "src/mod1.py" for issue in body["results"]))
+        self.assertEqual(body["results"][0]["severity"], "INFO")
+
+    def test_facets_ignore_their_own_filter(self):
+        body = self.client.get(self.url, {"severity": "error", "rule": "rule.0"}).json()
+
+        self.assertEqual(body["count"], 15)
+        severity = {row["value"]: row["count"] for row in body["facets"]["severity"]}
+        self.assertEqual(severity, {"error": 15, "info": 15})
+        rules = {row["value"]: row["count"] for row in body["facets"]["rule"]}
+        self.assertEqual(rules, {"rule.0": 15})
+        self.assertEqual(body["facets"]["cwe"], [{"value": "CWE-79", "count": 3}])
+
+    def test_rejects_unknown_sort(self):
+        self.assertEqual(self.client.get(self.url, {"sort": "line"}).status_code, 400)
+
+    def test_unknown_job_is_404(self):
+        resp = self.client.get(reverse("code_analysis:results_incidents_api", args=["missing"]))
+        self.assertEqual(resp.status_code, 404)
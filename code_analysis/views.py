@@ -1,31 +1,68 @@
 import os
-import json
+import hashlib
 import logging
-import re
-import time
 from pathlib import Path
 import tempfile
 import threading
 import uuid
 from urllib.parse import urlencode
 
-import requests
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db import DatabaseError, IntegrityError
 from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.text import slugify
+from django.views.decorators.http import require_POST
+
+from core.services import ReportStoreError, get_client, get_report_store
+from core.services.object_storage import MinioUploadError
+
+from .models import ScanIncident, ScanReport
+from .services import (
+	INCIDENT_SORTS,
+	MAX_STAGED_ARCHIVE_BYTES,
+	MultipartStream,
+	archive_cache_key,
+	changed_files_between,
+	delete_staged_archive,
+	diff_findings,
+	filter_incidents,
+	forget_cache_key,
+	generate_presigned_archive_post,
+	github_cache_key,
+	incident_facets,
+	index_scan_results,
+	is_owned_staging_key,
+	lookup_cached_job_id,
+	merge_incremental_result,
+	open_staged_archive,
+	partial_scan_is_scoped,
+	remember_scan_result,
+	resolve_github_commit,
+	sort_incidents,
+	staged_archive_cache_key,
+	staged_archive_metadata,
+	staging_bucket,
+	staging_prefix_for_user,
+)
 
 
 logger = logging.getLogger(__name__)
 
 SCAN_JOBS = {}
 SCAN_JOBS_LOCK = threading.Lock()
-REPORTS_DIR = Path(settings.BASE_DIR) / "analysis_reports"
-SCAN_API_MAX_RETRIES = max(1, int(os.getenv("SCAN_API_MAX_RETRIES", "3")))
-SCAN_API_RETRY_BACKOFF_SEC = max(0.0, float(os.getenv("SCAN_API_RETRY_BACKOFF_SEC", "1.0")))
-SCAN_API_RETRY_STATUS_CODES = {502, 503, 504}
+REPORT_NAMESPACE = "code-analysis"
+SCAN_UPLOAD_CHUNK_SIZE = 1024 * 1024
+SCAN_INCREMENTAL_MAX_FILES = max(0, int(os.getenv("SCAN_INCREMENTAL_MAX_FILES", "200")))
+ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".zip", ".gz")
+RESULTS_PAGE_SIZE = 50
+INCIDENTS_API_PAGE_SIZE = 50
+INCIDENTS_API_MAX_PAGE_SIZE = 200
+UNINDEXED_REPORT_ERROR = "These results could not be prepared for display. The raw JSON report can still be downloaded."
 
 
 def _set_scan_job(job_id, **values):
@@ -49,45 +86,37 @@ def _get_configure_url(source_label):
 	return routes.get(source_label)
 
 
-def _report_paths(job_id):
-	job_dir = REPORTS_DIR / str(job_id)
-	return {
-		"job_dir": job_dir,
-		"report": job_dir / "final_report.json",
-		"meta": job_dir / "meta.json",
-	}
-
-
-def _persist_scan_result(job_id, source_label, result, assessment_id=None):
-	paths = _report_paths(job_id)
-	paths["job_dir"].mkdir(parents=True, exist_ok=True)
-	paths["report"].write_text(json.dumps(result, indent=2), encoding="utf-8")
+def _persist_scan_result(job_id, source_label, result, assessment_id=None, fingerprint=None):
 	meta = {"job_id": job_id, "source_label": source_label}
 	if assessment_id is not None:
 		meta["assessment_id"] = assessment_id
-	paths["meta"].write_text(json.dumps(meta, indent=2), encoding="utf-8")
+	if fingerprint:
+		meta["fingerprint"] = fingerprint
+	store = get_report_store()
+	store.save(REPORT_NAMESPACE, job_id, "final_report", result)
+	store.save(REPORT_NAMESPACE, job_id, "meta", meta)
 
 
 def _load_persisted_scan(job_id):
-	paths = _report_paths(job_id)
-	if not paths["report"].exists():
-		return None
+	store = get_report_store()
 	try:
-		result = json.loads(paths["report"].read_text(encoding="utf-8"))
-	except (OSError, ValueError):
+		result = store.load(REPORT_NAMESPACE, job_id, "final_report")
+	except (ReportStoreError, OSError, ValueError):
+		logger.exception("Failed to load stored report for job %s", job_id)
+		return None
+	if result is None:
 		return None
 
 	source_label = "Stored report"
 	assessment_id = None
-	if paths["meta"].exists():
-		try:
-			meta = json.loads(paths["meta"].read_text(encoding="utf-8"))
-			if isinstance(meta, dict):
-				if meta.get("source_label"):
-					source_label = str(meta.get("source_label"))
-				assessment_id = meta.get("assessment_id")
-		except (OSError, ValueError):
-			pass
+	try:
+		meta = store.load(REPORT_NAMESPACE, job_id, "meta")
+	except (ReportStoreError, OSError, ValueError):
+		meta = None
+	if isinstance(meta, dict):
+		if meta.get("source_label"):
+			source_label = str(meta.get("source_label"))
+		assessment_id = meta.get("assessment_id")
 
 	return {
 		"status": "completed",
@@ -112,7 +141,7 @@ def _create_assessment(user, project_id, input_data, parent_assessment=None):
 	try:
 		from projects.models import Project
 		from trustworthiness.models import Assessment
-		project = Project.objects.get(id=int(project_id))
+		project = Project.objects.active().get(id=int(project_id))
 		if not project.is_accessible_by(user):
 			logger.warning("User %s denied access to project_id=%s for Assessment creation", user.id, project_id)
 			return None
@@ -148,7 +177,7 @@ def select_source(request):
 	})
 
 
-def _derive_project_name(source_label, post_data, files):
+def _derive_project_name(source_label, post_data, files, archive_filename=None):
 	analysis_name = post_data.get("analysis_name", "").strip()
 	if analysis_name:
 		return analysis_name
@@ -161,8 +190,10 @@ def _derive_project_name(source_label, post_data, files):
 		return repo_name or "github-repository"
 
 	upload = files.get("archive_file")
-	if upload and upload.name:
-		filename = Path(upload.name).name
+	if not archive_filename and upload and upload.name:
+		archive_filename = upload.name
+	if archive_filename:
+		filename = Path(archive_filename).name
 		for suffix in (".tar.gz", ".tgz", ".zip"):
 			if filename.lower().endswith(suffix):
 				return filename[: -len(suffix)]
@@ -192,42 +223,12 @@ def _format_backend_error(exc):
 	return str(exc)
 
 
-def _is_retryable_backend_error(exc):
-	if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
-		return True
-
-	if isinstance(exc, requests.HTTPError):
-		response = getattr(exc, "response", None)
-		if response is not None and response.status_code in SCAN_API_RETRY_STATUS_CODES:
-			return True
-
-	return False
-
-
-def _post_with_retry(url, **request_kwargs):
-	last_exc = None
-	for attempt in range(1, SCAN_API_MAX_RETRIES + 1):
-		try:
-			response = requests.post(url, **request_kwargs)
-			response.raise_for_status()
-			return response
-		except requests.RequestException as exc:
-			last_exc = exc
-			if attempt >= SCAN_API_MAX_RETRIES or not _is_retryable_backend_error(exc):
-				raise
-			time.sleep(SCAN_API_RETRY_BACKOFF_SEC * attempt)
-
-	if last_exc:
-		raise last_exc
-	raise requests.RequestException("Scan request failed without a specific error.")
-
-
-def _first_sentence(text):
-	clean = " ".join(str(text or "").split())
-	if not clean:
-		return ""
-	match = re.search(r"(.+?[.!?])(?:\s|$)", clean)
-	return match.group(1).strip() if match else clean
+def _post_with_retry(url, request_factory=None, **request_kwargs):
+	# Scan submissions are safe to repeat, so POSTs get the scan client's retries.
+	client = get_client("scan")
+	return client.post(
+		url, retries=client.retries, request_factory=request_factory, raise_for_status=True, **request_kwargs,
+	)
 
 
 def _build_processing_context(source_label, analysis_result=None, analysis_error=None):
@@ -250,324 +251,39 @@ def _build_processing_context(source_label, analysis_result=None, analysis_error
 	}
 
 
-def _build_results_context(analysis_result, source_label, job_id):
-	issues_payload = analysis_result.get("issues", {}) if analysis_result else {}
-	legacy_issues = issues_payload.get("issues", []) if isinstance(issues_payload, dict) else []
-	taxonomy_payload = analysis_result.get("taxonomy", {}) if analysis_result else {}
-	issues_preview = []
-	cwe_ids = set(taxonomy_payload.get("cwe", []) if isinstance(taxonomy_payload, dict) else [])
-	cve_ids = set(taxonomy_payload.get("cve", []) if isinstance(taxonomy_payload, dict) else [])
-	standards_rows = []
-	semgrep_incidents = taxonomy_payload.get("incidents", []) if isinstance(taxonomy_payload, dict) else []
-	scanned_files = taxonomy_payload.get("scanned_files", []) if isinstance(taxonomy_payload, dict) else []
-	semgrep_stats = taxonomy_payload.get("stats", {}) if isinstance(taxonomy_payload, dict) else {}
-	taxonomy_by_rule = taxonomy_payload.get("by_rule", {}) if isinstance(taxonomy_payload, dict) else {}
-	cwe_desc_by_id = {}
-	if isinstance(taxonomy_payload, dict):
-		for row in taxonomy_payload.get("standards", []) or []:
-			if not isinstance(row, dict):
-				continue
-			standard_id = str(row.get("standard") or "").upper().strip()
-			if not standard_id.startswith("CWE-"):
-				continue
-			title = str(row.get("title") or "").strip()
-			desc = str(row.get("description") or "").strip()
-			parts = [part for part in [title, desc] if part]
-			if parts and standard_id not in cwe_desc_by_id:
-				cwe_desc_by_id[standard_id] = _first_sentence(" - ".join(parts))
-
-	for incident in semgrep_incidents:
-		if not isinstance(incident, dict):
-			continue
-		full_message = str(incident.get("message") or incident.get("rule") or "Unnamed finding")
-		issues_preview.append(
-			{
-				"severity": incident.get("severity") or "INFO",
-				"message": full_message,
-				"display_message": _first_sentence(full_message),
-				"location": incident.get("location") or "Source location not provided",
-				"type": incident.get("type") or "SECURITY",
-				"rule": incident.get("rule") or "rule unavailable",
-				"line": incident.get("line"),
-				"status": incident.get("status") or "OPEN",
-				"effort": incident.get("effort") or "n/a",
-				"cwe_refs": incident.get("cwe_refs") or [],
-				"cve_refs": incident.get("cve_refs") or [],
-				"metadata_rows": incident.get("metadata_rows") or [],
-			}
-		)
-
-	# Backward compatibility path for reports that have taxonomy.by_rule but no taxonomy.incidents.
-	if not issues_preview and isinstance(taxonomy_by_rule, dict) and taxonomy_by_rule:
-		for rule_id, rule_tax in list(taxonomy_by_rule.items()):
-			if not isinstance(rule_tax, dict):
-				continue
-			rule_meta = rule_tax.get("meta", {}) if isinstance(rule_tax.get("meta"), dict) else {}
-			metadata_rows = [
-				{"key": str(k).replace("_", " ").title(), "value": v}
-				for k, v in rule_meta.items()
-				if v not in (None, "", [], {})
-			]
-			metadata_rows.sort(key=lambda item: item["key"])
-			issues_preview.append(
-				{
-					"severity": "INFO",
-					"message": rule_meta.get("short_description") or f"Semgrep finding: {rule_id}",
-					"display_message": _first_sentence(rule_meta.get("short_description") or f"Semgrep finding: {rule_id}"),
-					"location": "Semgrep metadata",
-					"type": str(rule_meta.get("category") or "SECURITY").upper(),
-					"rule": rule_id,
-					"line": None,
-					"status": "OPEN",
-					"effort": "n/a",
-					"cwe_refs": sorted(rule_tax.get("cwe", []) if isinstance(rule_tax.get("cwe"), list) else []),
-					"cve_refs": sorted(rule_tax.get("cve", []) if isinstance(rule_tax.get("cve"), list) else []),
-					"metadata_rows": metadata_rows,
-				}
-			)
-
-	# Backward compatibility for reports generated before taxonomy.incidents/stats existed.
-	if not issues_preview and legacy_issues:
-		for issue in legacy_issues:
-			if not isinstance(issue, dict):
-				continue
-			blob = " ".join(
-				[
-					str(issue.get("message") or ""),
-					str(issue.get("rule") or ""),
-					" ".join(str(tag) for tag in (issue.get("tags") or [])),
-				]
-			)
-			issue_cwe_refs = sorted({f"CWE-{m}" for m in re.findall(r"CWE[-:_ ]?(\d+)", blob, flags=re.IGNORECASE)})
-			issue_cve_refs = sorted({m.upper() for m in re.findall(r"CVE-\d{4}-\d+", blob, flags=re.IGNORECASE)})
-
-			rule_id = str(issue.get("rule") or "").strip()
-			metadata_rows = []
-			if rule_id:
-				rule_candidates = [rule_id]
-				if ":" in rule_id:
-					rule_candidates.append(rule_id.split(":", 1)[1])
-				for candidate in rule_candidates:
-					rule_tax = taxonomy_by_rule.get(candidate)
-					if not isinstance(rule_tax, dict):
-						continue
-					meta = rule_tax.get("meta", {})
-					if isinstance(meta, dict) and meta:
-						metadata_rows = [
-							{"key": str(k).replace("_", " ").title(), "value": v}
-							for k, v in meta.items()
-							if v not in (None, "", [], {})
-						]
-						metadata_rows.sort(key=lambda item: item["key"])
-						break
-			issues_preview.append(
-				{
-					"severity": issue.get("severity") or "INFO",
-					"message": issue.get("message") or issue.get("rule") or "Unnamed finding",
-					"display_message": _first_sentence(issue.get("message") or issue.get("rule") or "Unnamed finding"),
-					"location": issue.get("component") or issue.get("path") or "Source location not provided",
-					"type": issue.get("type") or "SECURITY",
-					"rule": issue.get("rule") or "rule unavailable",
-					"line": issue.get("line"),
-					"status": issue.get("status") or "OPEN",
-					"effort": issue.get("effort") or "n/a",
-					"cwe_refs": issue_cwe_refs,
-					"cve_refs": issue_cve_refs,
-					"metadata_rows": metadata_rows,
-				}
-			)
-
-	if isinstance(taxonomy_payload, dict):
-		for row in taxonomy_payload.get("standards", []) or []:
-			if not isinstance(row, dict):
-				continue
-			severity = (row.get("severity") or "INFO").upper()
-			if severity not in {"HIGH", "MEDIUM", "LOW", "INFO"}:
-				severity = "INFO"
-			standards_rows.append(
-				{
-					"standard": row.get("standard") or "N/A",
-					"title": row.get("title") or "Security finding",
-					"description": row.get("description") or "",
-					"severity": severity,
-				}
-			)
-
-	if not standards_rows:
-		for standard in sorted(cwe_ids):
-			standards_rows.append(
-				{
-					"standard": standard,
-					"title": "Detected weakness",
-					"description": "Mapped from issue tags or messages.",
-					"severity": "MEDIUM",
-				}
-			)
-		for standard in sorted(cve_ids):
-			standards_rows.append(
-				{
-					"standard": standard,
-					"title": "Detected vulnerability identifier",
-					"description": "Mapped from issue tags or references.",
-					"severity": "HIGH",
-				}
-			)
-
-	# Ensure metadata table always includes explicit CWE and CWE description rows when available.
-	for issue in issues_preview:
-		if not isinstance(issue, dict):
-			continue
-		rows = issue.get("metadata_rows") or []
-		if not isinstance(rows, list):
-			rows = []
-		row_keys = {str(item.get("key") or "").strip().lower() for item in rows if isinstance(item, dict)}
-		issue_cwe_refs = [str(c).upper().strip() for c in (issue.get("cwe_refs") or []) if str(c).strip()]
-		if issue_cwe_refs and "cwe" not in row_keys:
-			rows.append({"key": "CWE", "value": ", ".join(sorted(set(issue_cwe_refs)))})
-		if issue_cwe_refs and "cwe description" not in row_keys:
-			descs = [cwe_desc_by_id.get(cwe) for cwe in sorted(set(issue_cwe_refs)) if cwe_desc_by_id.get(cwe)]
-			if descs:
-				rows.append({"key": "CWE Description", "value": " | ".join(_first_sentence(d) for d in descs if d)})
-		for item in rows:
-			if not isinstance(item, dict):
-				continue
-			key_name = str(item.get("key") or "").strip().lower()
-			item["display_value"] = item.get("value")
-			# Keep the original value intact for persisted JSON consumers,
-			# but shorten description-like metadata in the UI for readability.
-			if key_name == "cwe description" or "description" in key_name:
-				item["display_value"] = _first_sentence(item.get("value"))
-		rows.sort(key=lambda item: str(item.get("key") or ""))
-		issue["metadata_rows"] = rows
-
-	top_cwe_counts = {}
-	hotspot_files = {}
-	overview_source_items = issues_preview
-	allowed_files = {
-		str(path).strip()
-		for path in scanned_files
-		if str(path).strip()
-	}
-
-	for issue in issues_preview:
-		if not isinstance(issue, dict):
-			continue
-		for cwe in issue.get("cwe_refs") or []:
-			cwe_id = str(cwe).upper().strip()
-			if not cwe_id:
-				continue
-			entry = top_cwe_counts.setdefault(cwe_id, {"count": 0, "description": cwe_desc_by_id.get(cwe_id, "")})
-			entry["count"] += 1
-			if not entry.get("description") and cwe_desc_by_id.get(cwe_id):
-				entry["description"] = cwe_desc_by_id[cwe_id]
-
-
-	for issue in overview_source_items:
-		if not isinstance(issue, dict):
-			continue
-		location = str(issue.get("location") or "Unknown file")
-		file_label = location.split(" (line ", 1)[0]
-		if ":" in file_label and not file_label.startswith(("./", "/")):
-			file_label = file_label.split(":", 1)[1]
-		# Restrict hotspots to files known to be scanned in the current run.
-		if allowed_files and file_label not in allowed_files:
-			continue
-		severity_name = str(issue.get("severity") or "INFO").upper()
-		bucket = hotspot_files.setdefault(file_label, {"file": file_label, "errors": 0, "warnings": 0, "info": 0, "total": 0})
-		if severity_name in {"ERROR", "CRITICAL", "HIGH"}:
-			bucket["errors"] += 1
-		elif severity_name in {"WARNING", "MEDIUM", "MAJOR"}:
-			bucket["warnings"] += 1
-		else:
-			bucket["info"] += 1
-		bucket["total"] += 1
-
-	top_cwe_rows = [
-		{
-			"id": cwe_id,
-			"count": values["count"],
-			"description": _first_sentence(values.get("description") or "No Semgrep description available."),
-		}
-		for cwe_id, values in sorted(top_cwe_counts.items(), key=lambda item: (-item[1]["count"], item[0]))[:5]
-	]
-
-	def _hotspot_priority(row):
-		# Explicit ordering: files with errors first, then warning-only, then info-only.
-		if row["errors"] > 0:
-			bucket = 0
-		elif row["warnings"] > 0:
-			bucket = 1
-		else:
-			bucket = 2
-		return (bucket, -row["errors"], -row["warnings"], -row["total"], row["file"])
-
-	hotspots_preview = []
-	for item in sorted(hotspot_files.values(), key=_hotspot_priority)[:6]:
-		total = max(item["total"], 1)
-		hotspots_preview.append(
-			{
-				**item,
-				"error_width": round((item["errors"] / total) * 100, 2),
-				"warning_width": round((item["warnings"] / total) * 100, 2),
-				"info_width": round((item["info"] / total) * 100, 2),
-			}
-		)
-
-	error_total = sum(1 for i in overview_source_items if (i.get("severity") or "").upper() in {"ERROR", "CRITICAL", "HIGH"})
-	warning_total = sum(1 for i in overview_source_items if (i.get("severity") or "").upper() in {"WARNING", "MEDIUM", "MAJOR"})
-	info_total = sum(1 for i in overview_source_items if (i.get("severity") or "").upper() in {"INFO", "LOW", "MINOR"})
-	chart_total = error_total + warning_total + info_total
-	fallback_findings_total = len(legacy_issues) if legacy_issues else len(issues_preview)
-	findings_total = semgrep_stats.get("findings_total", fallback_findings_total)
+def _build_results_context(report, job_id, filters=None, page_number=None):
+	summary = report.summary or {}
+	source_label = report.source_label
+	filters = {key: value for key, value in (filters or {}).items() if value}
+	incidents = filter_incidents(report, **filters).prefetch_related("cwes")
+	issues_page = Paginator(incidents, RESULTS_PAGE_SIZE).get_page(page_number)
+	semgrep_stats = summary.get("semgrep_stats", {})
 	files_scanned_total = semgrep_stats.get("files_scanned", 0)
-	if chart_total:
-		error_end = round((error_total / chart_total) * 360, 2)
-		warning_end = round(error_end + ((warning_total / chart_total) * 360), 2)
-		pie_chart_style = (
-			"background: conic-gradient("
-			f"#d94841 0deg {error_end}deg, "
-			f"#f2a93b {error_end}deg {warning_end}deg, "
-			f"#4ea6ff {warning_end}deg 360deg"
-			")"
-		)
-	else:
-		pie_chart_style = "background: conic-gradient(#dce5f2 0deg 360deg)"
+	findings_total = semgrep_stats.get("findings_total", report.incident_count)
+	cwe_total = semgrep_stats.get("cwe_total", 0)
 
 	report_generated_at = timezone.localtime().strftime("%Y-%m-%d %H:%M %Z")
 	if source_label == "GitHub Repository":
-		report_subtitle = (
-			f"Generated on {report_generated_at} from a GitHub repository scan. "
-			f"Analyzed {files_scanned_total} files and found {findings_total} findings "
-			f"across {len(cwe_ids)} unique CWE IDs."
-		)
+		source_phrase = "a GitHub repository scan"
 	elif source_label == "Local ZIP File":
-		report_subtitle = (
-			f"Generated on {report_generated_at} from uploaded ZIP source code. "
-			f"Analyzed {files_scanned_total} files and found {findings_total} findings "
-			f"across {len(cwe_ids)} unique CWE IDs."
-		)
+		source_phrase = "uploaded ZIP source code"
 	else:
-		report_subtitle = (
-			f"Generated on {report_generated_at} from {source_label}. "
-			f"Analyzed {files_scanned_total} files and found {findings_total} findings "
-			f"across {len(cwe_ids)} unique CWE IDs."
-		)
+		source_phrase = source_label
+	report_subtitle = (
+		f"Generated on {report_generated_at} from {source_phrase}. "
+		f"Analyzed {files_scanned_total} files and found {findings_total} findings "
+		f"across {cwe_total} unique CWE IDs."
+	)
+	filter_query = urlencode(filters)
 
 	return {
 		"job_id": job_id,
 		"source_label": source_label,
-		"analysis_result": analysis_result,
-		"project_name": analysis_result.get("project_name", "Analysis Report"),
-		"project_key": analysis_result.get("project_key", "-"),
+		"project_name": summary.get("project_name", "Analysis Report"),
+		"project_key": summary.get("project_key", "-"),
 		"report_subtitle": report_subtitle,
 		"issues_count": findings_total,
-		"semgrep_stats": {
-			"files_scanned": files_scanned_total,
-			"findings_total": findings_total,
-			"scan_time_sec": semgrep_stats.get("scan_time_sec", 0.0),
-			"cwe_total": len(cwe_ids),
-			"cve_total": len(cve_ids),
-		},
+		"semgrep_stats": semgrep_stats,
 		"metrics_summary": {
 			"bugs": "-",
 			"vulnerabilities": "-",
@@ -575,20 +291,24 @@ def _build_results_context(analysis_result, source_label, job_id):
 			"coverage": "-",
 		},
 		"severity_counts": {},
-		"severity_buckets": {
-			"errors": error_total,
-			"warnings": warning_total,
-			"info": info_total,
-			"total": chart_total,
-		},
-		"severity_pie_style": pie_chart_style,
-		"issues_preview": issues_preview,
-		"cwe_items": sorted(cwe_ids)[:8],
-		"cve_items": sorted(cve_ids)[:8],
-		"standards_rows": standards_rows[:12],
-		"top_cwe_rows": top_cwe_rows,
-		"hotspots_count": len(hotspots_preview),
-		"hotspots_preview": hotspots_preview,
+		"severity_buckets": summary.get("severity_buckets", {}),
+		"severity_pie_style": summary.get("severity_pie_style", ""),
+		"issues_page": issues_page,
+		"issues_preview": [incident.as_issue() for incident in issues_page],
+		"filters": filters,
+		"page_query_prefix": f"{filter_query}&" if filter_query else "",
+		"details_active": bool(filters) or page_number is not None,
+		"severity_options": ScanIncident.SeverityBucket.choices,
+		"rule_options": report.rules.order_by("-incident_count", "rule_id").values_list("rule_id", "incident_count"),
+		"cwe_options": report.cwes.order_by("-incident_count", "cwe_id").values_list("cwe_id", "incident_count"),
+		"cwe_items": summary.get("cwe_items", []),
+		"cve_items": summary.get("cve_items", []),
+		"standards_rows": summary.get("standards_rows", []),
+		"top_cwe_rows": summary.get("top_cwe_rows", []),
+		"finding_diff": summary.get("finding_diff"),
+		"incremental_scan": summary.get("incremental_scan"),
+		"hotspots_count": len(summary.get("hotspots_preview", [])),
+		"hotspots_preview": summary.get("hotspots_preview", []),
 		"quality_summary": {
 			"coverage_state": "n/a",
 			"risk_state": "n/a",
@@ -596,44 +316,234 @@ def _build_results_context(analysis_result, source_label, job_id):
 	}
 
 
-def _run_scan_job(job_id, source_label, mode, payload, upload_meta=None, assessment_id=None):
-	if not getattr(settings, "SCAN_API_URL", ""):
-		_set_scan_job(job_id, status="failed", result=None, error="SCAN_API_URL is not configured")
-		return
+def _results_filters(request):
+	return {key: request.GET.get(key, "").strip() for key in ("severity", "rule", "file", "cwe")}
+
+
+def _get_or_index_report(analysis_result, source_label, job_id="", assessment_id=None):
+	"""Return the precomputed report, indexing reports that predate ScanReport on first view.
+
+	Returns None if the report cannot be indexed; the raw JSON stays downloadable.
+	"""
+	lookup = {"job_id": job_id} if job_id else {"assessment_id": assessment_id}
+	report = ScanReport.objects.filter(**lookup).first()
+	if report is not None:
+		return report
 	try:
+		return index_scan_results(
+			analysis_result=analysis_result, source_label=source_label, job_id=job_id, assessment_id=assessment_id,
+		)
+	except IntegrityError:
+		# A concurrent request indexed the same report first.
+		return ScanReport.objects.get(**lookup)
+	except DatabaseError:
+		logger.exception("Failed to index scan report %s", job_id or f"for assessment {assessment_id}")
+		return None
+
+
+def _scan_cache_key(mode, payload, upload_meta):
+	"""Return (cache_key, fingerprint) for a submission, or (None, None) if it cannot be fingerprinted."""
+	try:
+		if mode == "staged":
+			return staged_archive_cache_key(*staged_archive_metadata(
+				bucket_name=upload_meta["bucket_name"], object_key=upload_meta["object_key"],
+			))
 		if mode == "upload":
-			temp_path = upload_meta["temp_path"]
-			filename = upload_meta["filename"]
-			content_type = upload_meta["content_type"]
-			with open(temp_path, "rb") as upload_fp:
-				response = _post_with_retry(
-					f"{settings.SCAN_API_URL}/scan_with_semgrep",
-					data=payload,
-					files={
-						"file": (
-							filename,
-							upload_fp,
-							content_type,
-						),
-					},
-					timeout=settings.SCAN_API_TIMEOUT,
-				)
-		else:
-			response = _post_with_retry(
-				f"{settings.SCAN_API_URL}/scan_github_with_semgrep",
+			return archive_cache_key(upload_meta["sha256"]) if upload_meta.get("sha256") else (None, None)
+		commit_sha = resolve_github_commit(
+			payload.get("repo_url", ""), payload.get("branch", ""), payload.get("access_token", ""),
+		)
+		if commit_sha:
+			return github_cache_key(payload["repo_url"], commit_sha, payload.get("subdirectory", ""))
+	except Exception:
+		logger.exception("Failed to fingerprint %s scan submission; scanning without cache", mode)
+	return None, None
+
+
+def _load_cached_scan_result(cache_key, project_name):
+	cached_job_id = lookup_cached_job_id(cache_key)
+	if not cached_job_id:
+		return None
+	stored = _load_persisted_scan(cached_job_id)
+	if not stored or not isinstance(stored.get("result"), dict):
+		# The referenced report is gone; drop the entry so the next run re-populates it.
+		forget_cache_key(cache_key)
+		return None
+	result = dict(stored["result"])
+	# Version-relative annotations belong to the run that produced them.
+	result.pop("finding_diff", None)
+	result.pop("incremental", None)
+	if project_name:
+		result["project_name"] = project_name
+	return result
+
+
+def _load_parent_assessment(parent_assessment_id):
+	if not parent_assessment_id:
+		return None
+	try:
+		from trustworthiness.models import Assessment
+		return Assessment.objects.filter(id=parent_assessment_id).first()
+	except Exception:
+		logger.exception("Failed to load parent assessment_id=%s", parent_assessment_id)
+		return None
+
+
+def _plan_incremental_scan(parent, payload, fingerprint):
+	"""Return (base_sha, changed, removed) when only the files changed since the parent need scanning.
+
+	Only GitHub sources qualify, because their parent commit is known and the
+	compare API lists the changed files. Returns None to request a full scan.
+	"""
+	if parent is None or not fingerprint or not isinstance(parent.results, dict):
+		return None
+	if not isinstance(parent.results.get("taxonomy"), dict):
+		return None
+	parent_fingerprint = (parent.input_data or {}).get("fingerprint") or {}
+	base_sha = parent_fingerprint.get("commit_sha")
+	if not base_sha or any(
+		parent_fingerprint.get(key) != fingerprint.get(key) for key in ("repo_url", "subdirectory", "ruleset")
+	):
+		return None
+	changes = changed_files_between(
+		payload.get("repo_url", ""), base_sha, fingerprint["commit_sha"],
+		access_token=payload.get("access_token", ""), subdirectory=payload.get("subdirectory", ""),
+	)
+	if changes is None or len(changes[0]) > SCAN_INCREMENTAL_MAX_FILES:
+		return None
+	return (base_sha, *changes)
+
+
+def _run_incremental_github_scan(payload, parent, plan, head_sha):
+	base_sha, changed, removed = plan
+	subdirectory = payload.get("subdirectory", "")
+	partial_result = {}
+	if changed:
+		# The scan backend is not guaranteed to honour include_paths, so the
+		# result is checked below instead of being trusted to be partial.
+		partial_result = _post_with_retry(
+			f"{settings.SCAN_API_URL}/scan_github_with_semgrep",
+			data={**payload, "include_paths": ",".join(sorted(changed))},
+			timeout=settings.SCAN_API_TIMEOUT,
+		).json()
+	if changed and not partial_scan_is_scoped(partial_result, changed, subdirectory):
+		# The backend scanned the whole tree: its result is complete and
+		# fresher than a merge with the parent's findings.
+		result = dict(partial_result)
+		mode = "full"
+	else:
+		result = merge_incremental_result(parent.results, partial_result, changed, removed, subdirectory=subdirectory)
+		mode = "merged"
+	if payload.get("project_name"):
+		result["project_name"] = payload["project_name"]
+	result["incremental"] = {
+		"base_assessment_id": parent.id,
+		"base_commit": base_sha,
+		"head_commit": head_sha,
+		"changed_files": sorted(changed),
+		"removed_files": sorted(removed),
+		"mode": mode,
+	}
+	return result
+
+
+def _submit_scan(mode, payload, upload_meta):
+	if mode == "staged":
+		def _staged_request():
+			stream = MultipartStream(
+				payload,
+				file_field="file",
+				filename=upload_meta["filename"],
+				content_type=upload_meta["content_type"],
+				chunks=open_staged_archive(
+					bucket_name=upload_meta["bucket_name"],
+					object_key=upload_meta["object_key"],
+				).iter_chunks(SCAN_UPLOAD_CHUNK_SIZE),
+			)
+			return {"data": iter(stream), "headers": {"Content-Type": stream.content_type_header}}
+
+		return _post_with_retry(
+			f"{settings.SCAN_API_URL}/scan_with_semgrep",
+			request_factory=_staged_request,
+			timeout=settings.SCAN_API_TIMEOUT,
+		)
+	if mode == "upload":
+		temp_path = upload_meta["temp_path"]
+		filename = upload_meta["filename"]
+		content_type = upload_meta["content_type"]
+		with open(temp_path, "rb") as upload_fp:
+			return _post_with_retry(
+				f"{settings.SCAN_API_URL}/scan_with_semgrep",
 				data=payload,
+				files={
+					"file": (
+						filename,
+						upload_fp,
+						content_type,
+					),
+				},
 				timeout=settings.SCAN_API_TIMEOUT,
 			)
+	return _post_with_retry(
+		f"{settings.SCAN_API_URL}/scan_github_with_semgrep",
+		data=payload,
+		timeout=settings.SCAN_API_TIMEOUT,
+	)
+
+
+def _run_scan_job(
+	job_id, source_label, mode, payload, upload_meta=None, assessment_id=None, force_rescan=False,
+	parent_assessment_id=None,
+):
+	if not getattr(settings, "SCAN_API_URL", ""):
+		_set_scan_job(job_id, status="failed", result=None, error="SCAN_API_URL is not configured")
+		return
+	try:
+		cache_key, fingerprint = _scan_cache_key(mode, payload, upload_meta)
+		cached_result = None
+		if cache_key and not force_rescan:
+			cached_result = _load_cached_scan_result(cache_key, payload.get("project_name"))
+
+		parent = _load_parent_assessment(parent_assessment_id)
+		incremental_plan = None
+		if cached_result is None and mode == "github" and not force_rescan:
+			incremental_plan = _plan_incremental_scan(parent, payload, fingerprint)
+
+		if cached_result is not None:
+			result_payload = cached_result
+		elif incremental_plan is not None:
+			result_payload = _run_incremental_github_scan(payload, parent, incremental_plan, fingerprint["commit_sha"])
+		else:
+			result_payload = _submit_scan(mode, payload, upload_meta).json()
 
-		result_payload = response.json()
-		_persist_scan_result(job_id, source_label, result_payload, assessment_id=assessment_id)
-		_set_scan_job(job_id, status="completed", result=result_payload, error=None)
+		if parent is not None and isinstance(parent.results, dict):
+			result_payload["finding_diff"] = {
+				**diff_findings(parent.results, result_payload),
+				"base_assessment_id": parent.id,
+				"base_version": parent.version,
+			}
+
+		_persist_scan_result(job_id, source_label, result_payload, assessment_id=assessment_id, fingerprint=fingerprint)
+		if cache_key and cached_result is None:
+			remember_scan_result(cache_key, fingerprint, job_id)
+		try:
+			# Indexed before the job is marked completed so the results page finds it.
+			index_scan_results(
+				analysis_result=result_payload, source_label=source_label, job_id=job_id, assessment_id=assessment_id,
+			)
+		except Exception:
+			logger.exception("Failed to index results for job %s", job_id)
+		_set_scan_job(job_id, status="completed", result=result_payload, error=None, cache_hit=cached_result is not None)
 		if assessment_id:
 			try:
 				from trustworthiness.models import Assessment
-				Assessment.objects.filter(id=assessment_id).update(
-					results=result_payload, status=Assessment.Status.COMPLETED,
-				)
+				assessment = Assessment.objects.get(id=assessment_id)
+				assessment.results = result_payload
+				assessment.status = Assessment.Status.COMPLETED
+				if fingerprint:
+					# Kept so a later version can scan incrementally against this one.
+					assessment.input_data = {**(assessment.input_data or {}), "fingerprint": fingerprint}
+				assessment.save(update_fields=["results", "status", "input_data"])
 			except Exception:
 				logger.exception("Failed to save results for assessment_id=%s", assessment_id)
 	except Exception as exc:
@@ -649,7 +559,12 @@ def _run_scan_job(job_id, source_label, mode, payload, upload_meta=None, assessm
 			except Exception:
 				logger.exception("Failed to mark assessment_id=%s as failed", assessment_id)
 	finally:
-		if upload_meta and os.path.exists(upload_meta["temp_path"]):
+		if mode == "staged":
+			try:
+				delete_staged_archive(bucket_name=upload_meta["bucket_name"], object_key=upload_meta["object_key"])
+			except MinioUploadError:
+				logger.exception("Failed to delete staged archive %s", upload_meta["object_key"])
+		elif upload_meta and os.path.exists(upload_meta["temp_path"]):
 			os.remove(upload_meta["temp_path"])
 
 
@@ -700,6 +615,40 @@ def configure_upload(request):
 	)
 
 
+@login_required
+@require_POST
+def generate_archive_upload_url(request):
+	"""Return a presigned POST policy so the browser can stage an archive directly in object storage."""
+	filename = Path(request.POST.get("filename", "").strip()).name
+	content_type = request.POST.get("content_type", "") or "application/octet-stream"
+
+	if not filename:
+		return JsonResponse({"error": "Filename is required."}, status=400)
+
+	suffix = next((s for s in ARCHIVE_SUFFIXES if filename.lower().endswith(s)), "")
+	if not suffix:
+		return JsonResponse({"error": "Only .zip, .tar.gz or .tgz archives are allowed."}, status=400)
+
+	try:
+		size = int(request.POST.get("size", "") or 0)
+	except ValueError:
+		size = 0
+	if size > MAX_STAGED_ARCHIVE_BYTES:
+		limit_mb = MAX_STAGED_ARCHIVE_BYTES // (1024 * 1024)
+		return JsonResponse({"error": f"Archives larger than {limit_mb} MB are not accepted."}, status=413)
+
+	safe_stem = slugify(filename[: -len(suffix)]) or "archive"
+	object_key = f"{staging_prefix_for_user(request.user)}{uuid.uuid4().hex}/{safe_stem}{suffix}"
+
+	try:
+		url, fields, bucket = generate_presigned_archive_post(object_key=object_key, content_type=content_type)
+	except MinioUploadError:
+		logger.exception("Failed to generate presigned archive upload for user %s", request.user.id)
+		return JsonResponse({"error": "Could not prepare upload. Please try again."}, status=500)
+
+	return JsonResponse({"url": url, "fields": fields, "key": object_key, "bucket": bucket})
+
+
 @login_required
 def processing(request):
 	source_label = request.POST.get("source_type") or request.GET.get("source") or "Submitted source"
@@ -708,6 +657,7 @@ def processing(request):
 
 	if request.method == "POST":
 		project_id = request.POST.get("project_id", "")
+		force_rescan = request.POST.get("force_rescan", "").lower() in {"on", "1", "true"}
 
 		parent_assessment = None
 		parent_assessment_id = request.POST.get("parent_assessment_id", "").strip()
@@ -720,13 +670,58 @@ def processing(request):
 					parent_assessment_id, request.user.id,
 				)
 
+		staged_key = request.POST.get("staged_archive_key", "").strip()
+		if source_label == "Local ZIP File" and staged_key:
+			if not is_owned_staging_key(request.user, staged_key):
+				logger.warning("User %s submitted a staged archive key outside their prefix: %s", request.user.id, staged_key)
+				raise Http404
+
+			archive_filename = Path(request.POST.get("archive_filename", "").strip()).name or Path(staged_key).name
+			project_name = _derive_project_name(source_label, request.POST, request.FILES, archive_filename=archive_filename)
+
+			job_id = uuid.uuid4().hex
+			assessment_id = _create_assessment(request.user, project_id, {
+				"source": source_label,
+				"analysis_name": project_name,
+				"root_folder": request.POST.get("root_folder", "").strip(),
+				"archive_filename": archive_filename,
+			}, parent_assessment=parent_assessment)
+			_set_scan_job(job_id, status="running", source_label=source_label, result=None, error=None, assessment_id=assessment_id)
+
+			threading.Thread(
+				target=_run_scan_job,
+				args=(
+					job_id,
+					source_label,
+					"staged",
+					{"project_name": project_name},
+					{
+						"bucket_name": staging_bucket(),
+						"object_key": staged_key,
+						"filename": archive_filename,
+						"content_type": request.POST.get("archive_content_type", "") or "application/octet-stream",
+					},
+				),
+				kwargs={
+					"assessment_id": assessment_id,
+					"force_rescan": force_rescan,
+					"parent_assessment_id": parent_assessment.id if parent_assessment else None,
+				},
+				daemon=True,
+			).start()
+
+			query = urlencode({"job": job_id, "source": source_label})
+			return redirect(f"{request.path}?{query}")
+
 		if source_label == "Local ZIP File" and request.FILES.get("archive_file"):
 			upload = request.FILES["archive_file"]
 			project_name = _derive_project_name(source_label, request.POST, request.FILES)
 
 			suffix = Path(upload.name).suffix or ".upload"
+			archive_digest = hashlib.sha256()
 			with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
 				for chunk in upload.chunks():
+					archive_digest.update(chunk)
 					tmp_file.write(chunk)
 			temp_path = tmp_file.name
 
@@ -750,9 +745,14 @@ def processing(request):
 						"temp_path": temp_path,
 						"filename": upload.name,
 						"content_type": upload.content_type or "application/octet-stream",
+						"sha256": archive_digest.hexdigest(),
 					},
 				),
-				kwargs={"assessment_id": assessment_id},
+				kwargs={
+					"assessment_id": assessment_id,
+					"force_rescan": force_rescan,
+					"parent_assessment_id": parent_assessment.id if parent_assessment else None,
+				},
 				daemon=True,
 			).start()
 
@@ -781,7 +781,11 @@ def processing(request):
 			threading.Thread(
 				target=_run_scan_job,
 				args=(job_id, source_label, "github", payload),
-				kwargs={"assessment_id": assessment_id},
+				kwargs={
+					"assessment_id": assessment_id,
+					"force_rescan": force_rescan,
+					"parent_assessment_id": parent_assessment.id if parent_assessment else None,
+				},
 				daemon=True,
 			).start()
 			query = urlencode({"job": job_id, "source": source_label})
@@ -841,6 +845,7 @@ def job_status_api(request):
 	return JsonResponse({
 		"status": job.get("status"),
 		"error": job.get("error"),
+		"cache_hit": bool(job.get("cache_hit")),
 	})
 
 
@@ -855,22 +860,19 @@ def results_json(request, job_id):
 	return response
 
 
-@login_required
-def results(request, job_id):
-	"""Display the raw JSON result of a completed scan job."""
+def _load_job_report(job_id):
+	"""Return (report, job) for a scan job; job is None for already indexed reports.
+
+	Reports persisted before results were indexed at completion are indexed
+	here on first access. report is None while the job is missing or not
+	completed yet, or when a completed report cannot be indexed.
+	"""
+	report = ScanReport.objects.filter(job_id=job_id).first()
+	if report is not None:
+		return report, None
 	job = _get_scan_job(job_id) or _load_persisted_scan(job_id)
-	if not job:
-		return render(request, "code_analysis/results.html", {
-			"job_id": job_id,
-			"error": "Job not found. The server may have restarted since the scan ran.",
-			"result_json": None,
-			"show_sidebar": True,
-			"active_navbar_page": "trustworthiness",
-		})
-	if job.get("status") != "completed":
-		query = urlencode({"job": job_id, "source": job.get("source_label", "")})
-		return redirect(reverse("code_analysis:processing") + f"?{query}")
-	source_label = job.get("source_label")
+	if not job or job.get("status") != "completed":
+		return None, job
 	assessment_id = job.get("assessment_id")
 	if assessment_id:
 		try:
@@ -882,22 +884,99 @@ def results(request, job_id):
 				a.save()
 		except Exception:
 			logger.exception("Failed to sync results for assessment_id=%s", assessment_id)
+			assessment_id = None
+	report = _get_or_index_report(
+		job.get("result") or {}, job.get("source_label") or "", job_id=job_id, assessment_id=assessment_id,
+	)
+	return report, job
+
+
+@login_required
+def results(request, job_id):
+	"""Render the precomputed results of a completed scan job."""
+	report, job = _load_job_report(job_id)
+	if report is None and not job:
+		return render(request, "code_analysis/results.html", {
+			"job_id": job_id,
+			"error": "Job not found. The server may have restarted since the scan ran.",
+			"result_json": None,
+			"show_sidebar": True,
+			"active_navbar_page": "trustworthiness",
+		})
+	if report is None and job.get("status") == "completed":
+		return render(request, "code_analysis/results.html", {
+			"job_id": job_id,
+			"error": UNINDEXED_REPORT_ERROR,
+			"result_json": None,
+			"show_sidebar": True,
+			"active_navbar_page": "trustworthiness",
+		})
+	if report is None:
+		query = urlencode({"job": job_id, "source": job.get("source_label", "")})
+		return redirect(reverse("code_analysis:processing") + f"?{query}")
 	return render(
 		request,
 		"code_analysis/results.html",
 		_add_stepper_context(
 			{
-				**_build_results_context(job.get("result") or {}, source_label, job_id),
+				**_build_results_context(report, job_id, _results_filters(request), request.GET.get("page")),
 				"error": None,
 				"show_sidebar": True,
 				"active_navbar_page": "trustworthiness",
 			},
-			source_label=source_label,
+			source_label=report.source_label,
 			job_id=job_id,
 		),
 	)
 
 
+def _incidents_response(request, report):
+	try:
+		page_size = int(request.GET.get("page_size") or INCIDENTS_API_PAGE_SIZE)
+	except ValueError:
+		return JsonResponse({"error": "page_size must be an integer."}, status=400)
+	page_size = min(max(page_size, 1), INCIDENTS_API_MAX_PAGE_SIZE)
+	sort = request.GET.get("sort") or "report"
+	if sort not in INCIDENT_SORTS:
+		return JsonResponse({"error": f"Unsupported sort '{sort}'.", "sorts": list(INCIDENT_SORTS)}, status=400)
+
+	filters = {
+		"severity": request.GET.get("severity", "").strip(),
+		"issue_type": request.GET.get("type", "").strip(),
+		"rule": request.GET.get("rule", "").strip(),
+		"file": request.GET.get("file", "").strip(),
+		"path_prefix": request.GET.get("path", "").strip(),
+		"cwe": request.GET.get("cwe", "").strip(),
+	}
+	filters = {key: value for key, value in filters.items() if value}
+	incidents = sort_incidents(filter_incidents(report, **filters), sort).prefetch_related("cwes")
+	page = Paginator(incidents, page_size).get_page(request.GET.get("page"))
+	payload = {
+		"count": page.paginator.count,
+		"page": page.number,
+		"num_pages": page.paginator.num_pages,
+		"page_size": page_size,
+		"sort": sort,
+		"results": [incident.as_issue() for incident in page],
+	}
+	if request.GET.get("facets", "1").lower() not in ("0", "false", "no"):
+		payload["facets"] = incident_facets(report, **filters)
+	return JsonResponse(payload)
+
+
+@login_required
+def results_incidents_api(request, job_id):
+	"""Page through a completed scan's incidents with filters, sorting and facet counts."""
+	report, job = _load_job_report(job_id)
+	if report is None and not job:
+		return JsonResponse({"error": "Job not found."}, status=404)
+	if report is None and job.get("status") == "completed":
+		return JsonResponse({"error": UNINDEXED_REPORT_ERROR}, status=503)
+	if report is None:
+		return JsonResponse({"error": "Scan has not completed.", "status": job.get("status")}, status=409)
+	return _incidents_response(request, report)
+
+
 def _template_for_source(source_label):
 	return "code_analysis/configure_upload.html" if source_label == "Local ZIP File" else "code_analysis/configure_github.html"
 
@@ -954,12 +1033,23 @@ def view_assessment_results(request, assessment_id):
 		})
 	input_data = assessment.input_data or {}
 	source_label = input_data.get("source", "")
+	report = _get_or_index_report(assessment.results, source_label, assessment_id=assessment.id)
+	if report is None:
+		return render(request, "code_analysis/results.html", {
+			"assessment_id": assessment.id,
+			"error": UNINDEXED_REPORT_ERROR,
+			"result_json": None,
+			"show_sidebar": True,
+			"active_navbar_page": "trustworthiness",
+		})
 	return render(
 		request,
 		"code_analysis/results.html",
 		_add_stepper_context(
 			{
-				**_build_results_context(assessment.results, source_label, None),
+				**_build_results_context(
+					report, report.job_id or None, _results_filters(request), request.GET.get("page"),
+				),
 				"assessment_id": assessment.id,
 				"error": None,
 				"show_sidebar": True,
@@ -967,4 +1057,17 @@ def view_assessment_results(request, assessment_id):
 			},
 			source_label=source_label,
 		),
-	)
\ No newline at end of file
+	)
+
+
+@login_required
+def assessment_incidents_api(request, assessment_id):
+	"""Incidents API for a completed assessment; see results_incidents_api."""
+	assessment = _get_owned_assessment(request.user, assessment_id)
+	if assessment.status != assessment.Status.COMPLETED or not assessment.results:
+		return JsonResponse({"error": "Assessment has no completed results.", "status": assessment.status}, status=409)
+	source_label = (assessment.input_data or {}).get("source", "")
+	report = _get_or_index_report(assessment.results, source_label, assessment_id=assessment.id)
+	if report is None:
+		return JsonResponse({"error": UNINDEXED_REPORT_ERROR}, status=503)
+	return _incidents_response(request, report)
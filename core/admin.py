@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ReportCatalogueEntry
+
+
+@admin.register(ReportCatalogueEntry)
+class ReportCatalogueEntryAdmin(admin.ModelAdmin):
+    list_display = ('namespace', 'job_id', 'storage', 'reported_at')
+    list_filter = ('namespace', 'storage')
+    search_fields = ('job_id', 'path')
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services import ReportStoreError, get_report_store
+
+REPORT_FILES = ("final_report", "meta")
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy analysis reports persisted on local disk (code analysis and robustness) "
+        "into the configured report store."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Remove each local report file once it has been stored.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List what would be migrated without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        sources = [
+            ("code-analysis", Path(settings.BASE_DIR) / "analysis_reports"),
+            ("robustness", Path(settings.REPORTS_DIR)),
+        ]
+        store = get_report_store()
+        migrated = skipped = 0
+
+        for namespace, root in sources:
+            if not root.is_dir():
+                continue
+            for job_dir in sorted(path for path in root.iterdir() if path.is_dir()):
+                report_path = job_dir / "final_report.json"
+                if not report_path.is_file():
+                    continue
+                for name in REPORT_FILES:
+                    path = job_dir / f"{name}.json"
+                    if not path.is_file():
+                        continue
+                    if options["dry_run"]:
+                        self.stdout.write(f"Would migrate {path} -> {namespace}/{job_dir.name}/{name}")
+                        continue
+                    try:
+                        data = json.loads(path.read_text(encoding="utf-8"))
+                    except (OSError, ValueError) as exc:
+                        self.stderr.write(f"Skipping unreadable {path}: {exc}")
+                        skipped += 1
+                        continue
+                    try:
+                        store.save(namespace, job_dir.name, name, data)
+                    except ReportStoreError as exc:
+                        raise CommandError(f"Failed to store {path}: {exc}") from exc
+                    if options["delete"]:
+                        path.unlink()
+                    migrated += 1
+                if options["delete"] and not options["dry_run"] and not any(job_dir.iterdir()):
+                    job_dir.rmdir()
+
+        self.stdout.write(self.style.SUCCESS(f"Migrated {migrated} report files ({skipped} skipped)."))
@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-19 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportCatalogueEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('namespace', models.CharField(max_length=50)),
+                ('job_id', models.CharField(max_length=255)),
+                ('storage', models.CharField(choices=[('store', 'Report store'), ('file', 'Reports volume file')], default='store', max_length=10)),
+                ('path', models.CharField(blank=True, max_length=1024)),
+                ('reported_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Report Catalogue Entry',
+                'verbose_name_plural': 'Report Catalogue Entries',
+                'db_table': 'core_report_catalogue',
+                'indexes': [models.Index(fields=['namespace', '-reported_at'], name='core_report_catalogue_latest')],
+                'constraints': [models.UniqueConstraint(fields=('namespace', 'job_id'), name='core_report_catalogue_unique_job')],
+            },
+        ),
+    ]
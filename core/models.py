@@ -6,3 +6,33 @@ class TimeStampedModel(models.Model):
     
     class Meta:
         abstract = True
+
+
+class ReportCatalogueEntry(models.Model):
+    """Index of persisted analysis reports, so "latest report" and "report for
+    job X" are single indexed lookups instead of listings of the report store.
+    """
+
+    class Storage(models.TextChoices):
+        STORE = 'store', 'Report store'
+        FILE = 'file', 'Reports volume file'
+
+    namespace = models.CharField(max_length=50)
+    job_id = models.CharField(max_length=255)
+    storage = models.CharField(max_length=10, choices=Storage.choices, default=Storage.STORE)
+    path = models.CharField(max_length=1024, blank=True)
+    reported_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'core_report_catalogue'
+        verbose_name = 'Report Catalogue Entry'
+        verbose_name_plural = 'Report Catalogue Entries'
+        constraints = [
+            models.UniqueConstraint(fields=['namespace', 'job_id'], name='core_report_catalogue_unique_job'),
+        ]
+        indexes = [
+            models.Index(fields=['namespace', '-reported_at'], name='core_report_catalogue_latest'),
+        ]
+
+    def __str__(self):
+        return f"{self.namespace}/{self.job_id}"
@@ -1,8 +1,31 @@
+from .http_client import CircuitOpenError, ServiceClient, get_client, http_metrics, reset_clients
 from .object_storage import MinioUploadError, build_minio_client, object_exists, put_object
+from .report_catalogue import forget_report, latest_report, load_catalogued_report, record_report
+from .report_store import (
+    FileSystemReportStore,
+    MinioReportStore,
+    ReportStore,
+    ReportStoreError,
+    get_report_store,
+)
 
 __all__ = [
+    "CircuitOpenError",
+    "FileSystemReportStore",
+    "MinioReportStore",
     "MinioUploadError",
+    "ReportStore",
+    "ReportStoreError",
+    "ServiceClient",
     "build_minio_client",
+    "forget_report",
+    "get_client",
+    "get_report_store",
+    "http_metrics",
+    "latest_report",
+    "load_catalogued_report",
     "object_exists",
     "put_object",
+    "record_report",
+    "reset_clients",
 ]
@@ -0,0 +1,299 @@
+import http.cookiejar
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+__all__ = [
+    "CircuitOpenError",
+    "ServiceClient",
+    "get_client",
+    "http_metrics",
+    "reset_clients",
+]
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+DEFAULT_SERVICE_CONFIG = {
+    "timeout": 30,
+    "retries": 2,
+    "backoff": 0.5,
+    "max_backoff": 10.0,
+    "retry_statuses": (502, 503, 504),
+    "failure_threshold": 5,
+    "reset_timeout": 30.0,
+    "pool_maxsize": 10,
+}
+
+# Per-service defaults; settings.HTTP_CLIENT_SERVICES overrides any key.
+SERVICE_DEFAULTS = {
+    "scan": {"timeout": 300, "backoff": 1.0},
+    "github": {"timeout": 15},
+    "robustness": {"timeout": 60},
+    "hal": {"timeout": 30, "retries": 1},
+    "mlflow": {"timeout": 15},
+    "data_management": {"timeout": 30},
+    "keycloak": {"timeout": 10, "retries": 1},
+}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a service's circuit is open."""
+
+
+class _CircuitBreaker:
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                # Let a single probe through; its outcome closes or re-opens the circuit.
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """Free the half-open probe slot after a call that neither passed nor failed the service."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class _ServiceMetrics:
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuits = 0
+        self.responses = Counter()
+        self.last_error = ""
+        self._latencies = deque(maxlen=512)
+        self._lock = threading.Lock()
+
+    def record(self, *, latency: float | None = None, status: int | None = None, error: str = "") -> None:
+        with self._lock:
+            self.requests += 1
+            if latency is not None:
+                self._latencies.append(latency)
+            if status is not None:
+                self.responses[f"{status // 100}xx"] += 1
+            if error or (status is not None and status >= 500):
+                self.failures += 1
+                self.last_error = error or f"HTTP {status}"
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            summary = {
+                "requests": self.requests,
+                "failures": self.failures,
+                "retries": self.retries,
+                "short_circuits": self.short_circuits,
+                "responses": dict(self.responses),
+                "last_error": self.last_error,
+            }
+        if latencies:
+            summary["latency_ms"] = {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p50": round(latencies[len(latencies) // 2] * 1000, 1),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+                "max": round(latencies[-1] * 1000, 1),
+            }
+        return summary
+
+
+class ServiceClient:
+    """Pooled HTTP client for one backend service.
+
+    Idempotent methods are retried on connection errors, timeouts and the
+    configured gateway statuses with full-jitter exponential backoff; other
+    methods only when the caller passes retries explicitly. Consecutive
+    failures open a circuit breaker that fails fast with CircuitOpenError
+    until reset_timeout has passed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        timeout: float,
+        retries: int,
+        backoff: float,
+        max_backoff: float,
+        retry_statuses,
+        failure_threshold: int,
+        reset_timeout: float,
+        pool_maxsize: int,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.retries = max(0, int(retries))
+        self.backoff = max(0.0, float(backoff))
+        self.max_backoff = float(max_backoff)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.breaker = _CircuitBreaker(int(failure_threshold), float(reset_timeout))
+        self.metrics = _ServiceMetrics()
+        self.session = requests.Session()
+        # The session is shared by every user of the process: never keep a server's cookies.
+        self.session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=int(pool_maxsize), max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _sleep_before_retry(self, attempt: int, response: requests.Response | None = None) -> None:
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** (attempt - 1))))
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and str(retry_after).isdigit():
+            delay = max(delay, min(float(retry_after), self.max_backoff))
+        self.metrics.incr("retries")
+        time.sleep(delay)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retries: int | None = None,
+        request_factory: Callable[[], dict] | None = None,
+        raise_for_status: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request through the service's session.
+
+        request_factory rebuilds one-shot kwargs (e.g. a streamed body) for
+        every attempt. With raise_for_status, 4xx/5xx responses raise
+        requests.HTTPError after retries are exhausted.
+        """
+        method = method.upper()
+        if retries is None:
+            retries = self.retries if method in IDEMPOTENT_METHODS else 0
+        kwargs.setdefault("timeout", self.timeout)
+        attempts = 1 + max(0, retries)
+
+        for attempt in range(1, attempts + 1):
+            if not self.breaker.allow():
+                self.metrics.incr("short_circuits")
+                raise CircuitOpenError(f"{self.name} is unavailable (circuit open); not calling {url}")
+            started = time.monotonic()
+            try:
+                attempt_kwargs = {**kwargs, **request_factory()} if request_factory else kwargs
+                response = self.session.request(method, url, **attempt_kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                self.metrics.record(latency=time.monotonic() - started, error=type(exc).__name__)
+                self.breaker.record_failure()
+                if attempt >= attempts:
+                    raise
+                logger.info("%s %s %s failed (%s); retrying", self.name, method, url, type(exc).__name__)
+                self._sleep_before_retry(attempt)
+                continue
+            except BaseException as exc:
+                if isinstance(exc, requests.RequestException):
+                    self.metrics.record(latency=time.monotonic() - started, error=type(exc).__name__)
+                # Says nothing about the service's health, but must not hold the probe slot forever
+                self.breaker.release_probe()
+                raise
+
+            status = response.status_code
+            self.metrics.record(latency=time.monotonic() - started, status=status)
+            if status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            if status in self.retry_statuses and attempt < attempts:
+                logger.info("%s %s %s returned %s; retrying", self.name, method, url, status)
+                self._sleep_before_retry(attempt, response)
+                response.close()
+                continue
+            if raise_for_status:
+                response.raise_for_status()
+            return response
+
+        raise requests.RequestException(f"{self.name} {method} {url} failed without a response.")
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+
+_CLIENTS: dict[str, ServiceClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(name: str) -> ServiceClient:
+    """Return the process-wide client for a service, creating it on first use."""
+    client = _CLIENTS.get(name)
+    if client is not None:
+        return client
+    with _CLIENTS_LOCK:
+        if name not in _CLIENTS:
+            overrides = getattr(settings, "HTTP_CLIENT_SERVICES", {}) or {}
+            config = {**DEFAULT_SERVICE_CONFIG, **SERVICE_DEFAULTS.get(name, {}), **overrides.get(name, {})}
+            _CLIENTS[name] = ServiceClient(name, **config)
+        return _CLIENTS[name]
+
+
+def reset_clients() -> None:
+    """Drop every client (sessions, breakers and metrics); used by tests and after settings changes."""
+    with _CLIENTS_LOCK:
+        for client in _CLIENTS.values():
+            client.session.close()
+        _CLIENTS.clear()
+
+
+def http_metrics() -> dict[str, dict[str, Any]]:
+    """Per-service request, failure, retry and latency counters for this process."""
+    return {
+        name: {**client.metrics.snapshot(), "circuit": client.breaker.state}
+        for name, client in sorted(_CLIENTS.items())
+    }
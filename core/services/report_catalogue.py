@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from django.utils import timezone
+
+from ..models import ReportCatalogueEntry
+from .report_store import get_report_store
+
+__all__ = [
+    "forget_report",
+    "latest_report",
+    "load_catalogued_report",
+    "record_report",
+]
+
+
+def record_report(namespace: str, job_id: str, *, path: str = "", reported_at=None) -> ReportCatalogueEntry:
+    """Register a persisted report; a path marks a plain file on the reports volume."""
+    entry, _ = ReportCatalogueEntry.objects.update_or_create(
+        namespace=namespace,
+        job_id=str(job_id),
+        defaults={
+            "storage": ReportCatalogueEntry.Storage.FILE if path else ReportCatalogueEntry.Storage.STORE,
+            "path": str(path or ""),
+            "reported_at": reported_at or timezone.now(),
+        },
+    )
+    return entry
+
+
+def forget_report(namespace: str, job_id: str) -> None:
+    ReportCatalogueEntry.objects.filter(namespace=namespace, job_id=str(job_id)).delete()
+
+
+def load_catalogued_report(entry: ReportCatalogueEntry, name: str = "final_report") -> Any | None:
+    """Load the JSON document an entry points at, or None if it has disappeared."""
+    if entry.storage == ReportCatalogueEntry.Storage.FILE:
+        try:
+            return json.loads(Path(entry.path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+    return get_report_store().load(entry.namespace, entry.job_id, name)
+
+
+def latest_report(namespace: str, name: str = "final_report") -> Any | None:
+    """Return the most recently persisted report of a namespace.
+
+    Entries whose report has since been removed are dropped as they are found.
+    """
+    for entry in ReportCatalogueEntry.objects.filter(namespace=namespace).order_by("-reported_at").iterator():
+        data = load_catalogued_report(entry, name)
+        if data is not None:
+            return data
+        entry.delete()
+    return None
@@ -0,0 +1,260 @@
+import abc
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from django.conf import settings
+
+from .object_storage import MinioUploadError, _setting, build_minio_client
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is used when it is not installed
+    zstandard = None
+
+__all__ = [
+    "FileSystemReportStore",
+    "MinioReportStore",
+    "ReportStore",
+    "ReportStoreError",
+    "get_report_store",
+]
+
+CONTENT_TYPE = "application/json"
+_SUFFIXES = {"zstd": ".json.zst", "gzip": ".json.gz"}
+
+
+class ReportStoreError(RuntimeError):
+    pass
+
+
+def _compress(payload: bytes) -> tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(payload), "zstd"
+    return gzip.compress(payload, compresslevel=6), "gzip"
+
+
+def _decoding_stream(stream, encoding: str | None):
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ReportStoreError("Report is zstd-compressed but the zstandard package is not installed.")
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+    if encoding == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    return stream
+
+
+class _CompressedLRU:
+    """Process-wide LRU of hot reports, kept compressed and bounded by total size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def fits(self, size: int | None) -> bool:
+        # A single report may take at most a quarter of the budget.
+        return size is not None and size <= self.max_bytes // 4
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body: bytes, encoding: str | None) -> None:
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (body, encoding)
+            self._size += len(body)
+            while self._size > self.max_bytes and self._entries:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def discard(self, key) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+
+_CACHE = _CompressedLRU(max_bytes=int(getattr(settings, "REPORT_STORE_CACHE_MB", 64)) * 1024 * 1024)
+
+
+class ReportStore(abc.ABC):
+    """Stores JSON reports as compressed compact JSON under namespace/job_id/name.
+
+    Subclasses provide _write, _open and iter_reports; reads are
+    decompressed as they stream in and small reports are kept in a shared LRU.
+    """
+
+    location = ""
+
+    def save(self, namespace: str, job_id: str, name: str, data: Any) -> None:
+        key = f"{namespace}/{job_id}/{name}"
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        body, encoding = _compress(payload)
+        self._write(key, body, encoding)
+        _CACHE.discard((self.location, key))
+
+    def load(self, namespace: str, job_id: str, name: str) -> Any | None:
+        """Return the stored JSON document, or None if it does not exist."""
+        key = f"{namespace}/{job_id}/{name}"
+        cached = _CACHE.get((self.location, key))
+        if cached is not None:
+            body, encoding = cached
+            return json.load(_decoding_stream(io.BytesIO(body), encoding))
+
+        opened = self._open(key)
+        if opened is None:
+            return None
+        raw, encoding, size = opened
+        try:
+            stream = raw
+            if _CACHE.fits(size):
+                body = raw.read()
+                _CACHE.put((self.location, key), body, encoding)
+                stream = io.BytesIO(body)
+            return json.load(_decoding_stream(stream, encoding))
+        finally:
+            raw.close()
+
+    @abc.abstractmethod
+    def iter_reports(self, namespace: str, name: str) -> Iterator[tuple[str, datetime]]:
+        """Yield (job_id, last_modified) for every stored report called name."""
+
+    @abc.abstractmethod
+    def _write(self, key: str, body: bytes, encoding: str) -> None:
+        """Store an encoded report body under key."""
+
+    @abc.abstractmethod
+    def _open(self, key: str):
+        """Return (binary stream, content encoding, size in bytes) or None if missing."""
+
+
+class MinioReportStore(ReportStore):
+
+    def __init__(self, *, bucket_name: str, prefix: str = "reports"):
+        self.bucket_name = bucket_name
+        self.prefix = prefix.strip("/")
+        self.location = f"s3://{bucket_name}/{self.prefix}"
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = build_minio_client()
+        return self._client
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}.json" if self.prefix else f"{key}.json"
+
+    def _write(self, key, body, encoding):
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            self.client.put_object(
+                Bucket=self.bucket_name,
+                Key=self._object_key(key),
+                Body=body,
+                ContentType=CONTENT_TYPE,
+                ContentEncoding=encoding,
+            )
+        except (ClientError, BotoCoreError, MinioUploadError) as exc:
+            raise ReportStoreError(str(exc)) from exc
+
+    def _open(self, key):
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            response = self.client.get_object(Bucket=self.bucket_name, Key=self._object_key(key))
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise ReportStoreError(str(exc)) from exc
+        except (BotoCoreError, MinioUploadError) as exc:
+            raise ReportStoreError(str(exc)) from exc
+        return response["Body"], response.get("ContentEncoding"), response.get("ContentLength")
+
+    def iter_reports(self, namespace, name):
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        prefix = self._object_key(namespace)[: -len(".json")] + "/"
+        suffix = f"/{name}.json"
+        try:
+            pages = self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket_name, Prefix=prefix)
+            for page in pages:
+                for obj in page.get("Contents", []):
+                    object_key = obj["Key"]
+                    if object_key.endswith(suffix):
+                        yield object_key[len(prefix): -len(suffix)], obj["LastModified"]
+        except (ClientError, BotoCoreError, MinioUploadError) as exc:
+            raise ReportStoreError(str(exc)) from exc
+
+
+class FileSystemReportStore(ReportStore):
+    """Local-directory store for development and tests; same layout as the MinIO store."""
+
+    def __init__(self, *, root):
+        self.root = Path(root)
+        self.location = f"file://{self.root}"
+
+    def _write(self, key, body, encoding):
+        path = self.root / f"{key}{_SUFFIXES[encoding]}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(body)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise ReportStoreError(str(exc)) from exc
+        for other in _SUFFIXES.values():
+            if other != _SUFFIXES[encoding]:
+                (self.root / f"{key}{other}").unlink(missing_ok=True)
+
+    def _open(self, key):
+        for encoding, suffix in _SUFFIXES.items():
+            path = self.root / f"{key}{suffix}"
+            try:
+                return open(path, "rb"), encoding, path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return None
+
+    def iter_reports(self, namespace, name):
+        base = self.root / namespace
+        if not base.is_dir():
+            return
+        for job_dir in base.iterdir():
+            for suffix in _SUFFIXES.values():
+                path = job_dir / f"{name}{suffix}"
+                if path.is_file():
+                    yield job_dir.name, datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+                    break
+
+
+def get_report_store() -> ReportStore:
+    """Return the store configured by REPORT_STORE_BACKEND ("minio" or "filesystem")."""
+    backend = str(getattr(settings, "REPORT_STORE_BACKEND", "minio") or "minio").lower()
+    if backend == "filesystem":
+        return FileSystemReportStore(root=getattr(settings, "REPORT_STORE_ROOT"))
+    if backend != "minio":
+        raise ReportStoreError(f"Unknown REPORT_STORE_BACKEND {backend!r}.")
+    return MinioReportStore(
+        bucket_name=_setting("OBJECT_STORAGE_BUCKET_REPORTS", "OBJECT_STORAGE_BUCKET"),
+        prefix=getattr(settings, "REPORT_STORE_PREFIX", "reports"),
+    )
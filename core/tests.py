@@ -1,3 +1,222 @@
-from django.test import TestCase
+import gzip
+import http.client
+import io
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+import requests
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import ReportCatalogueEntry
+from core.services import (
+    CircuitOpenError,
+    FileSystemReportStore,
+    ServiceClient,
+    get_client,
+    get_report_store,
+    http_metrics,
+    latest_report,
+    record_report,
+    reset_clients,
+)
+
+
+class FileSystemReportStoreTests(TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name)
+        self.store = FileSystemReportStore(root=self.root)
+
+    def test_round_trip_is_compressed_compact_json(self):
+        self.store.save("code-analysis", "job-1", "final_report", {"issues_found": 2, "items": [1, 2]})
+
+        stored = self.root / "code-analysis" / "job-1" / "final_report.json.gz"
+        self.assertEqual(gzip.decompress(stored.read_bytes()), b'{"issues_found":2,"items":[1,2]}')
+        self.assertEqual(self.store.load("code-analysis", "job-1", "final_report"), {"issues_found": 2, "items": [1, 2]})
+        self.assertIsNone(self.store.load("code-analysis", "missing", "final_report"))
+
+    def test_save_replaces_cached_copy(self):
+        self.store.save("robustness", "job-1", "final_report", {"v": 1})
+        self.assertEqual(self.store.load("robustness", "job-1", "final_report"), {"v": 1})
+
+        self.store.save("robustness", "job-1", "final_report", {"v": 2})
+
+        self.assertEqual(self.store.load("robustness", "job-1", "final_report"), {"v": 2})
+        self.assertEqual([job_id for job_id, _ in self.store.iter_reports("robustness", "final_report")], ["job-1"])
+
+
+class MigrateReportsCommandTests(TestCase):
+
+    def test_moves_local_reports_into_store(self):
+        with tempfile.TemporaryDirectory() as base_dir, tempfile.TemporaryDirectory() as store_dir:
+            job_dir = Path(base_dir) / "analysis_reports" / "job-1"
+            job_dir.mkdir(parents=True)
+            (job_dir / "final_report.json").write_text(json.dumps({"issues_found": 1}, indent=2), encoding="utf-8")
+            (job_dir / "meta.json").write_text(json.dumps({"source_label": "Local ZIP File"}), encoding="utf-8")
+
+            with override_settings(
+                BASE_DIR=Path(base_dir),
+                REPORTS_DIR=str(Path(base_dir) / "robustness_reports"),
+                REPORT_STORE_ROOT=store_dir,
+            ):
+                call_command("migrate_reports_to_store", "--delete", stdout=io.StringIO())
+                store = get_report_store()
+                self.assertEqual(store.load("code-analysis", "job-1", "final_report"), {"issues_found": 1})
+                self.assertEqual(store.load("code-analysis", "job-1", "meta"), {"source_label": "Local ZIP File"})
+            self.assertFalse(job_dir.exists())
+
+
+class ReportCatalogueTests(TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp = Path(tmp_dir.name)
+        store_override = override_settings(
+            REPORT_STORE_ROOT=str(self.tmp / "store"), REPORTS_DIR=str(self.tmp / "volume"),
+        )
+        store_override.enable()
+        self.addCleanup(store_override.disable)
+
+    def test_latest_report_skips_entries_whose_report_is_gone(self):
+        store = get_report_store()
+        store.save("robustness", "old", "final_report", {"run": "old"})
+        record_report("robustness", "old", reported_at=timezone.now() - timedelta(hours=1))
+        record_report("robustness", "vanished")
+
+        self.assertEqual(latest_report("robustness"), {"run": "old"})
+        self.assertFalse(ReportCatalogueEntry.objects.filter(job_id="vanished").exists())
+
+    def test_rebuild_indexes_store_and_volume(self):
+        get_report_store().save("robustness", "stored-job", "final_report", {"run": "stored"})
+        volume_job = self.tmp / "volume" / "backend-job"
+        volume_job.mkdir(parents=True)
+        (volume_job / "metrics.json").write_text('{"run": "volume"}', encoding="utf-8")
+
+        call_command("rebuild_report_catalogue", stdout=io.StringIO())
+
+        entries = dict(ReportCatalogueEntry.objects.values_list("job_id", "storage"))
+        self.assertEqual(entries, {
+            "stored-job": ReportCatalogueEntry.Storage.STORE,
+            "backend-job": ReportCatalogueEntry.Storage.FILE,
+        })
+
+
+def _response(status):
+    response = MagicMock(status_code=status)
+    response.headers = {}
+    return response
+
+
+@patch("core.services.http_client.time.sleep")
+class ServiceClientTests(TestCase):
+
+    def setUp(self):
+        self.client_ = ServiceClient(
+            "svc", timeout=5, retries=2, backoff=0.1, max_backoff=1.0,
+            retry_statuses=(503,), failure_threshold=3, reset_timeout=60, pool_maxsize=2,
+        )
+        self.addCleanup(self.client_.session.close)
+
+    def test_get_retries_gateway_errors_then_succeeds(self, mock_sleep):
+        with patch.object(self.client_.session, "request", side_effect=[_response(503), _response(200)]) as mock_request:
+            response = self.client_.get("http://svc.test/ping")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], 5)
+        self.assertEqual(mock_sleep.call_count, 1)
+        metrics = self.client_.metrics.snapshot()
+        self.assertEqual((metrics["requests"], metrics["retries"]), (2, 1))
+        self.assertEqual(metrics["responses"], {"5xx": 1, "2xx": 1})
+
+    def test_post_is_not_retried_by_default(self, mock_sleep):
+        with patch.object(self.client_.session, "request", side_effect=requests.ConnectionError()) as mock_request:
+            with self.assertRaises(requests.ConnectionError):
+                self.client_.post("http://svc.test/jobs", json={})
+
+        self.assertEqual(mock_request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_request_factory_rebuilds_body_per_attempt(self, mock_sleep):
+        bodies = iter([b"first", b"second"])
+        with patch.object(self.client_.session, "request", side_effect=[_response(503), _response(200)]) as mock_request:
+            self.client_.post("http://svc.test/jobs", retries=1, request_factory=lambda: {"data": next(bodies)})
+
+        self.assertEqual([c.kwargs["data"] for c in mock_request.call_args_list], [b"first", b"second"])
+
+    def test_circuit_opens_after_consecutive_failures(self, mock_sleep):
+        with patch.object(self.client_.session, "request", side_effect=requests.ConnectionError()) as mock_request:
+            with self.assertRaises(requests.ConnectionError):
+                self.client_.get("http://svc.test/ping")
+            with self.assertRaises(CircuitOpenError):
+                self.client_.get("http://svc.test/ping")
+
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(self.client_.breaker.state, "open")
+        self.assertEqual(self.client_.metrics.snapshot()["short_circuits"], 1)
+
+    def test_half_open_probe_closes_circuit(self, mock_sleep):
+        self.client_.breaker.reset_timeout = 0
+        for _ in range(3):
+            self.client_.breaker.record_failure()
+
+        with patch.object(self.client_.session, "request", return_value=_response(200)):
+            self.client_.get("http://svc.test/ping")
+
+        self.assertEqual(self.client_.breaker.state, "closed")
+
+    def test_half_open_probe_is_released_after_other_errors(self, mock_sleep):
+        self.client_.breaker.reset_timeout = 0
+        for _ in range(3):
+            self.client_.breaker.record_failure()
+
+        with patch.object(self.client_.session, "request", side_effect=requests.TooManyRedirects()):
+            with self.assertRaises(requests.TooManyRedirects):
+                self.client_.get("http://svc.test/ping")
+        with patch.object(self.client_.session, "request", return_value=_response(200)):
+            self.client_.get("http://svc.test/ping")
+
+        self.assertEqual(self.client_.breaker.state, "closed")
+
+    def test_session_keeps_no_cookies(self, mock_sleep):
+        headers = http.client.HTTPMessage()
+        headers["Set-Cookie"] = "sessionid=user-a; Path=/"
+        response = MagicMock(_original_response=MagicMock(msg=headers))
+        request = requests.Request("GET", "http://svc.test/ping").prepare()
+
+        requests.cookies.extract_cookies_to_jar(self.client_.session.cookies, request, response)
+
+        self.assertEqual(len(self.client_.session.cookies), 0)
+
+    def test_raise_for_status_after_retries(self, mock_sleep):
+        failing = _response(503)
+        failing.raise_for_status.side_effect = requests.HTTPError(response=failing)
+        with patch.object(self.client_.session, "request", return_value=failing):
+            with self.assertRaises(requests.HTTPError):
+                self.client_.get("http://svc.test/ping", raise_for_status=True)
+
+
+class GetClientTests(TestCase):
+
+    def setUp(self):
+        reset_clients()
+        self.addCleanup(reset_clients)
+
+    @override_settings(HTTP_CLIENT_SERVICES={"github": {"retries": 0, "timeout": 3}})
+    def test_settings_override_service_defaults(self):
+        client = get_client("github")
+
+        self.assertIs(client, get_client("github"))
+        self.assertEqual((client.retries, client.timeout), (0, 3))
+        self.assertEqual(get_client("scan").timeout, 300)
+        self.assertEqual(set(http_metrics()), {"github", "scan"})
+        self.assertEqual(http_metrics()["github"]["circuit"], "closed")
@@ -11,4 +11,5 @@ urlpatterns = [
     path('dashboard/', views.dashboard, name='dashboard'),
     path('hpc/', views.hpc, name='hpc'),
     path('ai-models/', views.ai_models, name='ai_models'),
+    path('internal/http-metrics/', views.http_client_metrics, name='http_client_metrics'),
 ]
\ No newline at end of file
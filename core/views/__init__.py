@@ -1,6 +1,7 @@
 from .ai_models import ai_models
 from .dashboard import dashboard
 from .hpc import hpc
+from .internal import http_client_metrics
 from .public import (
     collaboration_hub,
     contact_form,
@@ -20,4 +21,5 @@ __all__ = [
     "error_does_not_exist",
     "home",
     "hpc",
+    "http_client_metrics",
 ]
@@ -9,7 +9,7 @@ from projects.models import Project
 
 @login_required
 def dashboard(request):
-    projects_count = Project.objects.count()
+    projects_count = Project.objects.active().count()
     datasets_count = Dataset.objects.filter(publisher__isnull=True).count()
 
     datasets_counts_by_label = {
@@ -0,0 +1,10 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from core.services import http_metrics
+
+
+@staff_member_required
+def http_client_metrics(request):
+    """Per-service outbound HTTP counters for this worker process."""
+    return JsonResponse({"services": http_metrics()})
@@ -4,6 +4,8 @@ from urllib.parse import quote
 import requests
 from django.conf import settings
 
+from core.services import get_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +27,7 @@ def provision_user_datasets(username: str, datasets: dict[str, str]) -> None:
     datasets: {minio_prefix: local_name}
     """
     try:
-        response = requests.post(
+        response = get_client("data_management").post(
             f"{_base_url()}/api/v1/provision/user",
             headers=_headers(),
             json={
@@ -48,7 +50,7 @@ def delete_dataset_cache(username: str, dataset_local_name: str) -> None:
     encoded_username = quote(str(username), safe="")
     encoded_name = quote(str(dataset_local_name), safe="")
     try:
-        response = requests.delete(
+        response = get_client("data_management").delete(
             f"{_base_url()}/api/v1/datasets/cache/{encoded_username}/{encoded_name}",
             headers=_headers(),
             timeout=15,
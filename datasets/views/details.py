@@ -31,7 +31,7 @@ def dataset_details(request, dataset_id):
         "metadata": dataset.metadata,
     }
 
-    user_projects = Project.objects.filter(
+    user_projects = Project.objects.active().filter(
         Q(creator=request.user) | Q(collaborators=request.user)
     ).distinct().order_by("-created_at")
 
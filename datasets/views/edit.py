@@ -7,6 +7,8 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 
+from core.services import get_client
+
 from ..forms import GeneralDatasetForm
 from ..models import Dataset
 from ..services import delete_dataset_cache, provision_user_datasets
@@ -76,7 +78,7 @@ def dataset_delete(request, dataset_id):
     # Step 2: delete from MinIO — compensate by re-provisioning JupyterHub if this fails
     url = f"{settings.DATA_MANAGEMENT_SERVER_URL}/api/v1/datasets/{username}/{dataset_slug}"
     try:
-        response = requests.delete(
+        response = get_client("data_management").delete(
             url,
             headers={"X-API-Key": settings.DATA_MANAGEMENT_SERVER_API_KEY},
             timeout=10,
@@ -26,7 +26,7 @@ def dataset_run(request, dataset_id):
     if not project_id:
         return JsonResponse({"error": "project_id is required."}, status=400)
 
-    project = get_object_or_404(Project, pk=project_id)
+    project = get_object_or_404(Project.objects.active(), pk=project_id)
 
     if not dataset.data_file:
         return JsonResponse({"error": "This dataset has no data file."}, status=400)
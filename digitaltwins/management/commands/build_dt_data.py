@@ -0,0 +1,21 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from digitaltwins.services import build_static_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile the digital twin data files (Riga buildings, BER power signals) into "
+        "memory-mapped artefacts in DT_DATA_CACHE_DIR, shared by all web and worker processes."
+    )
+
+    def handle(self, *args, **options):
+        try:
+            written = build_static_data()
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not build digital twin data: {exc}") from exc
+        for name, path in written.items():
+            self.stdout.write(f"{name}: {path} ({os.path.getsize(path) // 1024} KB)")
+        self.stdout.write(self.style.SUCCESS(f"Built {len(written)} digital twin data artefact(s)."))
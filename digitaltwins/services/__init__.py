@@ -1,5 +1,26 @@
+from .map_tiles import parse_suburb_borders, render_tile, tile_bounds
 from .simulation_results import save_simulation_result
+from .spatial_index import GridIndex, feature_limit_for_zoom, simplify_geometry, simplify_tolerance_for_zoom
+from .static_data import (
+    build_static_data,
+    load_ber_power_signals,
+    load_riga_buildings,
+    load_riga_suburbs,
+    riga_layer,
+)
 
 __all__ = [
+    "GridIndex",
+    "build_static_data",
+    "feature_limit_for_zoom",
+    "load_ber_power_signals",
+    "load_riga_buildings",
+    "load_riga_suburbs",
+    "parse_suburb_borders",
+    "render_tile",
+    "riga_layer",
     "save_simulation_result",
+    "simplify_geometry",
+    "simplify_tolerance_for_zoom",
+    "tile_bounds",
 ]
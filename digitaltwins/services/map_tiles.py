@@ -0,0 +1,132 @@
+import csv
+import hashlib
+import json
+import math
+
+from .spatial_index import feature_limit_for_zoom, simplify_geometry, simplify_tolerance_for_zoom
+
+__all__ = [
+    "TILE_EXTENT",
+    "lks92_to_wgs84",
+    "parse_suburb_borders",
+    "render_tile",
+    "tile_bounds",
+]
+
+# Grid resolution a tile's coordinates are quantised to, as in Mapbox Vector Tiles
+TILE_EXTENT = 4096
+# Share of a tile added around it when selecting features, so edges render seamlessly
+_TILE_BUFFER = 1 / 64
+
+# LKS-92 / Latvia TM (EPSG:3059), the projection of the suburb borders CSV
+_LKS92_A = 6378137
+_LKS92_F = 1 / 298.257222101
+_LKS92_K0 = 0.9996
+_LKS92_LON0 = math.radians(24)
+_LKS92_FE = 500000
+_LKS92_FN = -6000000
+
+
+def lks92_to_wgs84(easting, northing):
+    """Inverse transverse Mercator from LKS-92 metres to (lon, lat) degrees."""
+    e2 = _LKS92_F * (2 - _LKS92_F)
+    e4, e6 = e2 * e2, e2 * e2 * e2
+    ep2 = e2 / (1 - e2)
+    x = easting - _LKS92_FE
+    y = northing - _LKS92_FN
+    mu = (y / _LKS92_K0) / (_LKS92_A * (1 - e2 / 4 - 3 * e4 / 64 - 5 * e6 / 256))
+    e1 = (1 - math.sqrt(1 - e2)) / (1 + math.sqrt(1 - e2))
+    fp = (
+        mu
+        + (3 * e1 / 2 - 27 * e1 ** 3 / 32) * math.sin(2 * mu)
+        + (21 * e1 ** 2 / 16 - 55 * e1 ** 4 / 32) * math.sin(4 * mu)
+        + (151 * e1 ** 3 / 96) * math.sin(6 * mu)
+        + (1097 * e1 ** 4 / 512) * math.sin(8 * mu)
+    )
+    c1 = ep2 * math.cos(fp) ** 2
+    t1 = math.tan(fp) ** 2
+    n1 = _LKS92_A / math.sqrt(1 - e2 * math.sin(fp) ** 2)
+    r1 = _LKS92_A * (1 - e2) / (1 - e2 * math.sin(fp) ** 2) ** 1.5
+    d = x / (n1 * _LKS92_K0)
+
+    lat = fp - (n1 * math.tan(fp) / r1) * (
+        d ** 2 / 2
+        - (5 + 3 * t1 + 10 * c1 - 4 * c1 ** 2 - 9 * ep2) * d ** 4 / 24
+        + (61 + 90 * t1 + 298 * c1 + 45 * t1 ** 2 - 252 * ep2 - 3 * c1 ** 2) * d ** 6 / 720
+    )
+    lon = _LKS92_LON0 + (
+        d
+        - (1 + 2 * t1 + c1) * d ** 3 / 6
+        + (5 - 2 * c1 + 28 * t1 - 3 * c1 ** 2 + 8 * ep2 + 24 * t1 ** 2) * d ** 5 / 120
+    ) / math.cos(fp)
+    return [math.degrees(lon), math.degrees(lat)]
+
+
+def parse_suburb_borders(path):
+    """Read the suburb borders CSV (id;Region name;WKT polygon in LKS-92) as GeoJSON features."""
+    features = []
+    with open(path, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f, delimiter=';'):
+            name = (row.get('Region name') or '').strip()
+            wkt = (row.get('geometry') or '').strip()
+            start, end = wkt.find('(('), wkt.rfind('))')
+            if not name or start == -1 or end == -1:
+                continue
+            ring = []
+            for pair in wkt[start + 2:end].split(','):
+                parts = pair.split()
+                if len(parts) >= 2:
+                    ring.append(lks92_to_wgs84(float(parts[0]), float(parts[1])))
+            if ring:
+                features.append({
+                    'type': 'Feature',
+                    'properties': {'id': row.get('id'), 'name': name},
+                    'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+                })
+    return features
+
+
+def tile_bounds(z, x, y):
+    """(min_lon, min_lat, max_lon, max_lat) of a web-mercator XYZ tile."""
+    n = 2 ** z
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360 - 180, lat(y + 1), (x + 1) / n * 360 - 180, lat(y)
+
+
+def _quantise(coords, digits):
+    if coords and isinstance(coords[0], (int, float)):
+        return [round(c, digits) for c in coords]
+    return [_quantise(c, digits) for c in coords]
+
+
+def render_tile(index, z, x, y):
+    """Encode the features of a spatial index that fall in tile z/x/y.
+
+    The payload is compact GeoJSON: features are capped and simplified for
+    the zoom like the bbox API, and coordinates are rounded to a
+    TILE_EXTENT grid over the tile. Returns (body, etag).
+    """
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y)
+    pad_lon, pad_lat = (max_lon - min_lon) * _TILE_BUFFER, (max_lat - min_lat) * _TILE_BUFFER
+    features, truncated = index.query(
+        (min_lon - pad_lon, min_lat - pad_lat, max_lon + pad_lon, max_lat + pad_lat),
+        limit=feature_limit_for_zoom(z),
+    )
+
+    tolerance = simplify_tolerance_for_zoom(z)
+    digits = max(0, math.ceil(math.log10(TILE_EXTENT / (max_lon - min_lon))))
+    encoded = []
+    for feature in features:
+        geometry = simplify_geometry(feature.get('geometry'), tolerance)
+        if geometry and geometry.get('coordinates') is not None:
+            geometry = {**geometry, 'coordinates': _quantise(geometry['coordinates'], digits)}
+        encoded.append({**feature, 'geometry': geometry})
+
+    body = json.dumps(
+        {'type': 'FeatureCollection', 'features': encoded, 'truncated': truncated},
+        separators=(',', ':'),
+    ).encode('utf-8')
+    return body, hashlib.sha1(body).hexdigest()
@@ -0,0 +1,167 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+__all__ = [
+    "PackedFile",
+    "PackedRecords",
+    "PackedSeries",
+    "open_packed",
+    "source_version",
+    "write_packed",
+]
+
+# File layout: magic, header length, JSON header, then 8-byte aligned sections
+_MAGIC = b"EGDTPK01"
+_HEADER_LEN = struct.Struct("<I")
+_ALIGN = 8
+
+
+def source_version(path):
+    """Identify a source file's contents by size and mtime, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def _padding(offset):
+    return -offset % _ALIGN
+
+
+def write_packed(path, sections, meta=None, source=None):
+    """Atomically write typed arrays (or raw bytes) to a packed file.
+
+    sections maps names to array.array instances or bytes; meta is any JSON
+    payload kept in the header; source is the file the data was compiled
+    from, recorded so readers can detect a stale artefact.
+    """
+    layout, offset = {}, 0
+    blobs = []
+    for name, data in sections.items():
+        typecode = data.typecode if isinstance(data, array) else "B"
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        layout[name] = [offset, len(raw), typecode]
+        blobs.append(raw)
+        offset += len(raw) + _padding(len(raw))
+
+    header = json.dumps({
+        "meta": meta or {},
+        "source": source_version(source) if source is not None else None,
+        "sections": layout,
+    }).encode("utf-8")
+    prefix = len(_MAGIC) + _HEADER_LEN.size + len(header)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_MAGIC + _HEADER_LEN.pack(len(header)) + header + b"\0" * _padding(prefix))
+            for raw in blobs:
+                f.write(raw + b"\0" * _padding(len(raw)))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+class PackedFile:
+    """A read-only, memory-mapped packed file.
+
+    Section views point straight into the page cache, so every process that
+    maps the same artefact shares one copy of the data.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if bytes(view[:len(_MAGIC)]) != _MAGIC:
+            raise ValueError(f"{path} is not a packed data file.")
+        (header_len,) = _HEADER_LEN.unpack_from(view, len(_MAGIC))
+        start = len(_MAGIC) + _HEADER_LEN.size
+        header = json.loads(bytes(view[start:start + header_len]))
+        self.meta = header["meta"]
+        self.source = header["source"]
+        self._data_start = start + header_len + _padding(start + header_len)
+        self._sections = header["sections"]
+        self._view = view
+
+    def __contains__(self, name):
+        return name in self._sections
+
+    def section(self, name):
+        offset, length, typecode = self._sections[name]
+        start = self._data_start + offset
+        return self._view[start:start + length].cast(typecode)
+
+
+def open_packed(path, source=None):
+    """Map a packed file, or return None if it is missing, unreadable or older than source.
+
+    A missing source does not invalidate the artefact, so deployments can
+    ship the compiled file alone.
+    """
+    try:
+        packed = PackedFile(path)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    if source is not None:
+        version = source_version(source)
+        if version is not None and version != packed.source:
+            return None
+    return packed
+
+
+class PackedSeries:
+    """Sequence of (x, y) tuples backed by two parallel float arrays."""
+
+    def __init__(self, xs, ys):
+        self._xs, self._ys = xs, ys
+
+    def __len__(self):
+        return len(self._xs)
+
+    def __iter__(self):
+        return zip(self._xs, self._ys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(zip(self._xs[index], self._ys[index]))
+        return self._xs[index], self._ys[index]
+
+
+class PackedRecords:
+    """Sequence of JSON records stored back to back, decoded on access."""
+
+    def __init__(self, offsets, blob):
+        self._offsets, self._blob = offsets, blob
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return json.loads(bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]))
+
+    @staticmethod
+    def pack(records):
+        """Return (offsets, blob) arrays for a list of JSON-serialisable records."""
+        offsets, blob = array("Q", [0]), bytearray()
+        for record in records:
+            blob += json.dumps(record, separators=(",", ":")).encode("utf-8")
+            offsets.append(len(blob))
+        return offsets, blob
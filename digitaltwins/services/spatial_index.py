@@ -0,0 +1,206 @@
+import heapq
+import math
+from array import array
+
+from .packed_data import PackedRecords
+
+__all__ = [
+    "GridIndex",
+    "feature_limit_for_zoom",
+    "simplify_geometry",
+    "simplify_tolerance_for_zoom",
+]
+
+# Features returned per bbox request, by map zoom (anything above the last key uses its value)
+ZOOM_FEATURE_LIMITS = {12: 300, 13: 600, 14: 1200, 15: 2500, 16: 5000}
+# Geometries are returned untouched from this zoom on
+SIMPLIFY_MAX_ZOOM = 16
+# Target number of features per grid cell when sizing the index
+_TARGET_PER_CELL = 16
+
+
+def feature_limit_for_zoom(zoom):
+    """Maximum number of features a bbox response may carry at a zoom (None = deepest)."""
+    if zoom is None:
+        return ZOOM_FEATURE_LIMITS[max(ZOOM_FEATURE_LIMITS)]
+    for level in sorted(ZOOM_FEATURE_LIMITS):
+        if zoom <= level:
+            return ZOOM_FEATURE_LIMITS[level]
+    return ZOOM_FEATURE_LIMITS[max(ZOOM_FEATURE_LIMITS)]
+
+
+def simplify_tolerance_for_zoom(zoom):
+    """Half a web-mercator pixel in degrees, or 0 when no simplification applies."""
+    if zoom is None or zoom >= SIMPLIFY_MAX_ZOOM:
+        return 0.0
+    return 360.0 / (256 * 2 ** max(zoom, 0)) / 2
+
+
+def _perpendicular_distance(point, start, end):
+    (x, y), (x1, y1), (x2, y2) = point, start, end
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return math.hypot(x - x1, y - y1)
+    return abs(dy * x - dx * y + x2 * y1 - y2 * x1) / math.hypot(dx, dy)
+
+
+def _simplify_line(points, tolerance):
+    """Douglas-Peucker on a coordinate list, iterative to avoid deep recursion."""
+    if len(points) < 3:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_dist, index = 0.0, None
+        for i in range(first + 1, last):
+            dist = _perpendicular_distance(points[i], points[first], points[last])
+            if dist > max_dist:
+                max_dist, index = dist, i
+        if index is not None and max_dist > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [p for p, kept in zip(points, keep) if kept]
+
+
+def _simplify_ring(ring, tolerance):
+    simplified = _simplify_line(ring, tolerance)
+    # A closed ring needs at least four positions; keep tiny footprints as they are
+    return simplified if len(simplified) >= 4 else ring
+
+
+def simplify_geometry(geometry, tolerance):
+    """Return a GeoJSON geometry with its lines and rings simplified to tolerance (degrees)."""
+    if not geometry or tolerance <= 0:
+        return geometry
+    kind, coords = geometry.get('type'), geometry.get('coordinates')
+    if kind == 'LineString':
+        coords = _simplify_line(coords, tolerance)
+    elif kind == 'MultiLineString':
+        coords = [_simplify_line(line, tolerance) for line in coords]
+    elif kind == 'Polygon':
+        coords = [_simplify_ring(ring, tolerance) for ring in coords]
+    elif kind == 'MultiPolygon':
+        coords = [[_simplify_ring(ring, tolerance) for ring in polygon] for polygon in coords]
+    else:
+        return geometry
+    return {**geometry, 'coordinates': coords}
+
+
+class GridIndex:
+    """Uniform-grid spatial index over (bbox, item) pairs, built once.
+
+    Items are ranked by bbox area (largest first), so a query capped at
+    `limit` keeps the most prominent ones. A query only visits the cells the
+    bbox overlaps, instead of scanning every item. Boxes and cells live in
+    flat arrays, which lets the index be written to and mapped from a packed
+    file (see to_packed / from_packed).
+    """
+
+    def __init__(self, entries):
+        entries = sorted(entries, key=lambda e: -(e[0][2] - e[0][0]) * (e[0][3] - e[0][1]))
+        self.items = [item for _, item in entries]
+        self._boxes = array('d')
+        for bbox, _ in entries:
+            self._boxes.extend(bbox)
+
+        if not entries:
+            self._set_grid((0.0, 0.0, 0.0, 0.0), 1, 1.0, 1.0)
+            self._cell_offsets, self._cell_ranks = array('Q', [0, 0]), array('I')
+            return
+
+        boxes = self.bboxes
+        bounds = (
+            min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes),
+        )
+        side = max(1, math.ceil(math.sqrt(len(entries) / _TARGET_PER_CELL)))
+        self._set_grid(bounds, side, (bounds[2] - bounds[0]) / side or 1.0, (bounds[3] - bounds[1]) / side or 1.0)
+
+        buckets = [[] for _ in range(side * side)]
+        for rank, bbox in enumerate(boxes):
+            for cell in self._cells_for(bbox):
+                buckets[cell].append(rank)
+        self._cell_offsets, self._cell_ranks = array('Q', [0]), array('I')
+        for bucket in buckets:
+            self._cell_ranks.extend(bucket)
+            self._cell_offsets.append(len(self._cell_ranks))
+
+    def _set_grid(self, bounds, side, cell_width, cell_height):
+        self.bounds = tuple(bounds)
+        self.columns = self.rows = side
+        self.cell_width, self.cell_height = cell_width, cell_height
+
+    @classmethod
+    def from_packed(cls, packed):
+        """Rebuild an index over the sections of a PackedFile written by to_packed."""
+        index = cls.__new__(cls)
+        meta = packed.meta
+        index._set_grid(meta['bounds'], meta['side'], meta['cell_width'], meta['cell_height'])
+        index._boxes = packed.section('boxes')
+        index._cell_offsets = packed.section('cell_offsets')
+        index._cell_ranks = packed.section('cell_ranks')
+        index.items = PackedRecords(packed.section('item_offsets'), packed.section('items'))
+        return index
+
+    def to_packed(self):
+        """Return (sections, meta) for write_packed; items must be JSON-serialisable."""
+        item_offsets, items = PackedRecords.pack(self.items)
+        sections = {
+            'boxes': self._boxes,
+            'cell_offsets': self._cell_offsets,
+            'cell_ranks': self._cell_ranks,
+            'item_offsets': item_offsets,
+            'items': items,
+        }
+        meta = {
+            'bounds': list(self.bounds),
+            'side': self.columns,
+            'cell_width': self.cell_width,
+            'cell_height': self.cell_height,
+        }
+        return sections, meta
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def bboxes(self):
+        boxes = self._boxes
+        return [tuple(boxes[i:i + 4]) for i in range(0, len(boxes), 4)]
+
+    def _cell_range(self, low, high, origin, size, count):
+        first = max(0, min(count - 1, int((low - origin) // size)))
+        last = max(0, min(count - 1, int((high - origin) // size)))
+        return range(first, last + 1)
+
+    def _cells_for(self, bbox):
+        min_x, min_y, max_x, max_y = bbox
+        for col in self._cell_range(min_x, max_x, self.bounds[0], self.cell_width, self.columns):
+            for row in self._cell_range(min_y, max_y, self.bounds[1], self.cell_height, self.rows):
+                yield col * self.rows + row
+
+    def query(self, bbox, limit=None):
+        """Return (items, truncated) intersecting bbox, largest first, at most limit of them."""
+        min_x, min_y, max_x, max_y = bbox
+        b = self.bounds
+        if not len(self.items) or min_x > b[2] or max_x < b[0] or min_y > b[3] or max_y < b[1]:
+            return [], False
+        if min_x <= b[0] and min_y <= b[1] and max_x >= b[2] and max_y >= b[3]:
+            # Covers everything: the ranking already is the answer
+            items = self.items[:] if limit is None else self.items[:limit]
+            return items, len(items) < len(self.items)
+
+        boxes, offsets, ranks = self._boxes, self._cell_offsets, self._cell_ranks
+        matches = set()
+        for cell in self._cells_for(bbox):
+            for rank in ranks[offsets[cell]:offsets[cell + 1]]:
+                i = rank * 4
+                if boxes[i] <= max_x and boxes[i + 2] >= min_x and boxes[i + 1] <= max_y and boxes[i + 3] >= min_y:
+                    matches.add(rank)
+
+        truncated = limit is not None and len(matches) > limit
+        ranks = heapq.nsmallest(limit, matches) if truncated else sorted(matches)
+        return [self.items[rank] for rank in ranks], truncated
@@ -0,0 +1,163 @@
+import json
+import logging
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+from .map_tiles import parse_suburb_borders
+from .packed_data import PackedSeries, open_packed, source_version, write_packed
+from .spatial_index import GridIndex
+
+__all__ = [
+    "BER_POWER_TAGS",
+    "build_static_data",
+    "load_ber_power_signals",
+    "load_riga_buildings",
+    "load_riga_suburbs",
+    "riga_layer",
+]
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / 'static' / 'digitaltwins' / 'data'
+RIGA_BUILDINGS_PATH = _DATA_DIR / 'DT_data.json'
+RIGA_SUBURBS_PATH = _DATA_DIR / 'Borders of Riga suburbs.csv'
+BER_RESULTS_LP_PATH = _DATA_DIR / 'ber-hydrogen-sample.lp'
+BER_POWER_TAGS = ('JT_3001', 'JT_3002', 'JT_3003', 'ET_1001', 'IT_1101')
+
+
+def _artefact_path(name):
+    return Path(settings.DT_DATA_CACHE_DIR) / f'{name}.bin'
+
+
+def _iter_coordinates(coords):
+    if not coords:
+        return
+    if isinstance(coords[0], (int, float)):
+        yield coords
+        return
+    for item in coords:
+        yield from _iter_coordinates(item)
+
+
+def _feature_bbox(feature):
+    geometry = feature.get('geometry') or {}
+    lons, lats = [], []
+    for lon, lat in _iter_coordinates(geometry.get('coordinates')):
+        lons.append(lon)
+        lats.append(lat)
+    return (min(lons), min(lats), max(lons), max(lats)) if lons else None
+
+
+def _index_features(features):
+    indexed = []
+    for feature in features:
+        bbox = _feature_bbox(feature)
+        if bbox:
+            indexed.append((bbox, feature))
+    return GridIndex(indexed)
+
+
+def _read_riga_buildings():
+    with open(RIGA_BUILDINGS_PATH, encoding='utf-8') as f:
+        data = json.load(f, parse_constant=lambda _: None)
+    return _index_features(data.get('features', []))
+
+
+def _read_ber_power_signals():
+    series = {tag: [] for tag in BER_POWER_TAGS}
+    with open(BER_RESULTS_LP_PATH, encoding='utf-8') as f:
+        for line in f:
+            if not line.startswith('power,'):
+                continue
+            parts = line.rstrip('\n').split(' ')
+            if len(parts) != 3:
+                continue
+            tag, sep, raw_value = parts[1].partition('=')
+            if not sep or tag not in series:
+                continue
+            try:
+                value = float(raw_value)
+                ts_seconds = int(parts[2]) / 1_000_000_000
+            except ValueError:
+                continue
+            series[tag].append((ts_seconds, value))
+    for tag in series:
+        series[tag].sort(key=lambda point: point[0])
+    return series
+
+
+@lru_cache(maxsize=1)
+def load_riga_buildings():
+    """Spatial index of the Riga buildings, mapped from its artefact when one is current."""
+    packed = open_packed(_artefact_path('riga-buildings'), RIGA_BUILDINGS_PATH)
+    if packed is not None:
+        return GridIndex.from_packed(packed)
+    return _read_riga_buildings()
+
+
+@lru_cache(maxsize=1)
+def load_riga_suburbs():
+    # A few dozen KB of CSV: cheap enough to parse in every process
+    return _index_features(parse_suburb_borders(RIGA_SUBURBS_PATH))
+
+
+@lru_cache(maxsize=1)
+def load_ber_power_signals():
+    """{tag: [(ts_seconds, value), ...]} sorted by time, mapped from its artefact when one is current."""
+    packed = open_packed(_artefact_path('ber-power-signals'), BER_RESULTS_LP_PATH)
+    if packed is not None:
+        return {
+            tag: PackedSeries(packed.section(f'{tag}.ts'), packed.section(f'{tag}.value'))
+            for tag in BER_POWER_TAGS
+        }
+    return _read_ber_power_signals()
+
+
+def riga_layer(layer):
+    """Return (loader, version) of a Riga map layer, or None for an unknown layer.
+
+    The version changes whenever the layer's data does, for cache keys.
+    """
+    if layer == 'buildings':
+        version = source_version(RIGA_BUILDINGS_PATH) or source_version(_artefact_path('riga-buildings'))
+        return load_riga_buildings, version
+    if layer == 'suburbs':
+        return load_riga_suburbs, source_version(RIGA_SUBURBS_PATH)
+    return None
+
+
+def build_static_data():
+    """Compile the digital twin data files into memory-mappable artefacts.
+
+    Writes the Riga buildings index and the BER power signals to
+    DT_DATA_CACHE_DIR so web and worker processes map one shared copy instead
+    of each parsing the sources on first use. Missing sources are skipped.
+    Returns {name: path} of the artefacts written.
+    """
+    written = {}
+
+    if RIGA_BUILDINGS_PATH.exists():
+        sections, meta = _read_riga_buildings().to_packed()
+        written['riga-buildings'] = write_packed(
+            _artefact_path('riga-buildings'), sections, meta=meta, source=RIGA_BUILDINGS_PATH,
+        )
+    else:
+        logger.warning('Riga buildings source %s not found; skipping its artefact.', RIGA_BUILDINGS_PATH)
+
+    if BER_RESULTS_LP_PATH.exists():
+        sections = {}
+        for tag, points in _read_ber_power_signals().items():
+            sections[f'{tag}.ts'] = array('d', (ts for ts, _ in points))
+            sections[f'{tag}.value'] = array('d', (value for _, value in points))
+        written['ber-power-signals'] = write_packed(
+            _artefact_path('ber-power-signals'), sections, source=BER_RESULTS_LP_PATH,
+        )
+    else:
+        logger.warning('BER results source %s not found; skipping its artefact.', BER_RESULTS_LP_PATH)
+
+    for loader in (load_riga_buildings, load_ber_power_signals):
+        loader.cache_clear()
+    return written
@@ -1,9 +1,32 @@
+import hashlib
+import json
+import math
+import struct
+import sys
+import tempfile
+from array import array
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase, Client
 from django.urls import reverse
 
+from core.services import reset_clients
+
+from . import views
+from .services import (
+    load_ber_power_signals,
+    load_riga_buildings,
+    load_riga_suburbs,
+    simplify_geometry,
+    simplify_tolerance_for_zoom,
+)
+
 User = get_user_model()
 
 
@@ -14,6 +37,7 @@ class EngreenPvSimulateTests(TestCase):
         self.user = User.objects.create_user(username='testuser', email='test@example.com', password='pass')
         self.client.force_login(self.user)
         self.url = reverse('engreen-pv-simulate')
+        self.addCleanup(reset_clients)
 
     def _post(self, payload):
         return self.client.post(
@@ -117,7 +141,7 @@ class EngreenPvSimulateTests(TestCase):
 
     # ── HAL proxy (happy path) ────────────────────────────────────────────────
 
-    @patch('digitaltwins.views.requests.post')
+    @patch('core.services.http_client.requests.Session.request')
     def test_existing_mode_short_term_success(self, mock_post):
         mock_resp = MagicMock()
         mock_resp.ok = True
@@ -133,7 +157,7 @@ class EngreenPvSimulateTests(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertIn('summary', resp.json())
 
-    @patch('digitaltwins.views.requests.post')
+    @patch('core.services.http_client.requests.Session.request')
     def test_new_mode_historical_success(self, mock_post):
         mock_resp = MagicMock()
         mock_resp.ok = True
@@ -149,7 +173,7 @@ class EngreenPvSimulateTests(TestCase):
         })
         self.assertEqual(resp.status_code, 200)
 
-    @patch('digitaltwins.views.requests.post')
+    @patch('core.services.http_client.requests.Session.request')
     def test_hal_timeout_returns_504(self, mock_post):
         import requests as req_lib
         mock_post.side_effect = req_lib.Timeout()
@@ -160,7 +184,7 @@ class EngreenPvSimulateTests(TestCase):
         })
         self.assertEqual(resp.status_code, 504)
 
-    @patch('digitaltwins.views.requests.post')
+    @patch('core.services.http_client.requests.Session.request')
     def test_hal_5xx_returns_502(self, mock_post):
         import requests as req_lib
         mock_resp = MagicMock()
@@ -173,7 +197,7 @@ class EngreenPvSimulateTests(TestCase):
         })
         self.assertEqual(resp.status_code, 502)
 
-    @patch('digitaltwins.views.requests.post')
+    @patch('core.services.http_client.requests.Session.request')
     def test_hal_4xx_returns_422(self, mock_post):
         import requests as req_lib
         mock_resp = MagicMock()
@@ -185,3 +209,351 @@ class EngreenPvSimulateTests(TestCase):
             'station': 'IT001E61366665', 'days': 7,
         })
         self.assertEqual(resp.status_code, 422)
+
+
+class StaticDataTestMixin:
+    """Points the digital twin data loaders at files written into a temporary directory."""
+
+    def use_static_data(self, *, buildings=None, ber_lines=None):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.data_dir = Path(tmp_dir.name)
+
+        sources = {}
+        if buildings is not None:
+            self.buildings_path = self.data_dir / 'DT_data.json'
+            self.buildings_path.write_text(json.dumps({'type': 'FeatureCollection', 'features': buildings}))
+            sources['RIGA_BUILDINGS_PATH'] = self.buildings_path
+        if ber_lines is not None:
+            self.ber_path = self.data_dir / 'ber.lp'
+            self.ber_path.write_text('\n'.join(ber_lines) + '\n')
+            sources['BER_RESULTS_LP_PATH'] = self.ber_path
+        for name, value in sources.items():
+            patcher = patch(f'digitaltwins.services.static_data.{name}', value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        settings_override = self.settings(DT_DATA_CACHE_DIR=str(self.data_dir / 'cache'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for loader in (load_riga_buildings, load_riga_suburbs, load_ber_power_signals):
+            loader.cache_clear()
+            self.addCleanup(loader.cache_clear)
+
+
+class RigaBuildingsApiTests(StaticDataTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='rigauser', email='riga@example.com', password=None)
+        self.client.force_login(self.user)
+        self.url = reverse('rea-riga-buildings-api')
+
+        # 20x20 grid of square footprints, every tenth one large
+        features = []
+        for i in range(20):
+            for j in range(20):
+                size = 0.004 if (i * 20 + j) % 10 == 0 else 0.001
+                lon, lat = 24.0 + i * 0.005, 56.9 + j * 0.005
+                ring = [[lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat]]
+                features.append({
+                    'type': 'Feature',
+                    'properties': {'id': f'{i}-{j}'},
+                    'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+                })
+        self.use_static_data(buildings=features)
+
+    def _get(self, **params):
+        bbox = {'min_lon': 24.0, 'min_lat': 56.9, 'max_lon': 24.1, 'max_lat': 57.0}
+        return self.client.get(self.url, {**bbox, **params})
+
+    def test_missing_bbox_returns_400(self):
+        resp = self.client.get(self.url, {'min_lon': 24.0})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_non_finite_bbox_returns_400(self):
+        for value in ('nan', 'inf', '-inf'):
+            self.assertEqual(self._get(min_lon=value).status_code, 400)
+
+    def test_invalid_zoom_returns_400(self):
+        self.assertEqual(self._get(zoom='abc').status_code, 400)
+
+    def test_bbox_query_matches_linear_scan(self):
+        bbox = (24.012, 56.931, 24.047, 56.962)
+        resp = self.client.get(self.url, dict(zip(('min_lon', 'min_lat', 'max_lon', 'max_lat'), bbox)))
+        ids = {f['properties']['id'] for f in resp.json()['features']}
+
+        expected = {
+            item['properties']['id']
+            for (a, b, c, d), item in zip(load_riga_buildings().bboxes, load_riga_buildings().items)
+            if a <= bbox[2] and c >= bbox[0] and b <= bbox[3] and d >= bbox[1]
+        }
+        self.assertTrue(expected)
+        self.assertEqual(ids, expected)
+        self.assertFalse(resp.json()['truncated'])
+
+    def test_bbox_outside_data_is_empty(self):
+        resp = self.client.get(self.url, {'min_lon': 10, 'min_lat': 10, 'max_lon': 11, 'max_lat': 11})
+        self.assertEqual(resp.json()['features'], [])
+
+    def test_low_zoom_caps_features_and_keeps_largest(self):
+        with patch.dict('digitaltwins.services.spatial_index.ZOOM_FEATURE_LIMITS', {12: 30, 16: 500}, clear=True):
+            resp = self._get(zoom=12)
+        body = resp.json()
+        self.assertTrue(body['truncated'])
+        self.assertEqual(len(body['features']), 30)
+        # the 40 large footprints rank first
+        for feature in body['features']:
+            i, j = map(int, feature['properties']['id'].split('-'))
+            self.assertEqual((i * 20 + j) % 10, 0)
+
+    def test_simplify_geometry_drops_redundant_vertices(self):
+        detailed = [[24.0, 56.9], [24.002, 56.9000001], [24.004, 56.9], [24.004, 56.904], [24.0, 56.904], [24.0, 56.9]]
+        simplified = simplify_geometry({'type': 'Polygon', 'coordinates': [detailed]}, simplify_tolerance_for_zoom(12))
+        self.assertEqual(len(simplified['coordinates'][0]), 5)
+        self.assertEqual(simplify_geometry({'type': 'Point', 'coordinates': [1, 2]}, 1.0)['coordinates'], [1, 2])
+        self.assertEqual(simplify_tolerance_for_zoom(17), 0.0)
+
+
+class RigaTileTests(StaticDataTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tileuser', email='tile@example.com', password=None)
+        self.client.force_login(self.user)
+
+        lon, lat = 24.105, 56.949
+        ring = [[lon, lat], [lon + 0.001, lat], [lon + 0.001, lat + 0.001], [lon, lat + 0.001], [lon, lat]]
+        self.use_static_data(buildings=[{
+            'type': 'Feature',
+            'properties': {'id': 'b1'},
+            'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+        }])
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _tile_url(self, layer, z, lon=24.1055, lat=56.9495):
+        n = 2 ** z
+        x = int((lon + 180) / 360 * n)
+        y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+        return reverse('rea-riga-tile', args=[layer, z, x, y])
+
+    def test_building_tile_contains_feature_with_etag(self):
+        resp = self.client.get(self._tile_url('buildings', 16))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp['ETag'])
+        self.assertIn('private', resp['Cache-Control'])
+        self.assertEqual([f['properties']['id'] for f in json.loads(resp.content)['features']], ['b1'])
+
+    def test_matching_etag_returns_304(self):
+        url = self._tile_url('buildings', 16)
+        etag = self.client.get(url)['ETag']
+        with patch('digitaltwins.views.render_tile') as mock_render:
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        mock_render.assert_not_called()
+
+    def test_tile_away_from_data_is_empty(self):
+        resp = self.client.get(self._tile_url('buildings', 16, lon=25.0, lat=57.5))
+        self.assertEqual(json.loads(resp.content)['features'], [])
+
+    def test_suburb_tile_reprojects_borders(self):
+        resp = self.client.get(self._tile_url('suburbs', 10))
+        names = {f['properties']['name'] for f in json.loads(resp.content)['features']}
+        self.assertIn('Central', names)
+        ring = json.loads(resp.content)['features'][0]['geometry']['coordinates'][0]
+        for lon, lat in ring:
+            self.assertTrue(23.8 < lon < 24.5 and 56.8 < lat < 57.2)
+
+    def test_unknown_layer_and_out_of_range_tiles_404(self):
+        self.assertEqual(self.client.get(reverse('rea-riga-tile', args=['roads', 12, 0, 0])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('rea-riga-tile', args=['buildings', 12, 4096, 0])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('rea-riga-tile', args=['buildings', 3, 0, 0])).status_code, 404)
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self._tile_url('buildings', 16)).status_code, 302)
+
+
+class StaticDataArtefactTests(StaticDataTestMixin, TestCase):
+
+    def setUp(self):
+        features = []
+        for i in range(50):
+            lon, lat = 24.0 + i * 0.002, 56.9 + (i % 7) * 0.002
+            ring = [[lon, lat], [lon + 0.001, lat], [lon + 0.001, lat + 0.001], [lon, lat]]
+            features.append({
+                'type': 'Feature',
+                'properties': {'id': i, 'year': None},
+                'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+            })
+
+        lines = []
+        for k in range(20):
+            ts = (1_700_000_000 + k) * 1_000_000_000
+            lines.append(f'power,site=ber JT_3001={k * 1.5} {ts}')
+            lines.append(f'power,site=ber JT_3002={k * 1.0} {ts}')
+            lines.append(f'power,site=ber JT_3003={k * 0.5} {ts}')
+        lines.append('power,site=ber ET_1001=400.0 1700000000000000000')
+        lines.append('power,site=ber IT_1101=12.5 1700000000000000000')
+        self.use_static_data(buildings=features, ber_lines=list(reversed(lines)))
+
+    def test_without_artefacts_sources_are_parsed(self):
+        self.assertIsInstance(load_riga_buildings().items, list)
+        self.assertIsInstance(load_ber_power_signals()['JT_3001'], list)
+
+    def test_artefacts_match_parsed_sources(self):
+        bbox = (24.01, 56.9, 24.05, 56.91)
+        parsed_buildings = load_riga_buildings().query(bbox)
+        parsed_signals = {tag: list(points) for tag, points in load_ber_power_signals().items()}
+
+        out = StringIO()
+        call_command('build_dt_data', stdout=out)
+        self.assertIn('Built 2', out.getvalue())
+        self.assertTrue((self.data_dir / 'cache' / 'riga-buildings.bin').exists())
+
+        index = load_riga_buildings()
+        self.assertNotIsInstance(index.items, list)
+        self.assertEqual(index.query(bbox), parsed_buildings)
+        self.assertEqual(len(index), 50)
+
+        signals = load_ber_power_signals()
+        self.assertEqual({tag: list(points) for tag, points in signals.items()}, parsed_signals)
+        self.assertEqual(signals['JT_3001'][-1], (1_700_000_019.0, 28.5))
+        self.assertEqual(signals['JT_3001'][::10], parsed_signals['JT_3001'][::10])
+
+    def test_stale_artefact_is_ignored(self):
+        call_command('build_dt_data', stdout=StringIO())
+        self.buildings_path.write_text(json.dumps({'type': 'FeatureCollection', 'features': []}))
+        load_riga_buildings.cache_clear()
+        self.assertEqual(len(load_riga_buildings()), 0)
+
+    def test_results_page_renders_from_artefact(self):
+        call_command('build_dt_data', stdout=StringIO())
+        user = User.objects.create_user(username='beruser', email='ber@example.com', password=None)
+        self.client.force_login(user)
+        resp = self.client.get(reverse('ber-hydrogen-results'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context['kpis']['peak_total_power'], 28.5)
+
+
+def _rdn_request(n_assets=3, n_setpoints=4, step_seconds=0.1, request_id=42):
+    start = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+    timestamps = [
+        (start + timedelta(seconds=step_seconds * i)).isoformat().replace('+00:00', 'Z') for i in range(n_setpoints)
+    ]
+    assets = {
+        f'asset_{a + 1:03d}': {
+            'assetType': 'PV',
+            'assetTimeSeries': [
+                {'timestamp_UTC': ts, 'MW': 10.0 + a + i * 0.5, 'MVAr': (2.0 - a) if (a + i) % 3 else None}
+                for i, ts in enumerate(timestamps)
+            ],
+        }
+        for a in range(n_assets)
+    }
+    return {
+        'userId': 'rdn@example.com',
+        'userOrganisation': 'Independent',
+        'useCase': 'MarketResultsTechnicalValidation',
+        'requestId': request_id,
+        'requestTimestamp_UTC': timestamps[0],
+        'inputData': {'gridSection': 'C', 'asset': assets},
+    }
+
+
+class RdnGridSimulateTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='rdnuser', email='rdn@example.com', password=None)
+        self.client.force_login(self.user)
+        self.url = reverse('rdn-grid-simulate')
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _post(self, payload, **extra):
+        return self.client.post(self.url, data=payload, content_type='application/json', **extra)
+
+    def test_output_shape(self):
+        resp = self._post(_rdn_request())
+        self.assertEqual(resp.status_code, 200)
+        output = resp.json()['outputData']
+        self.assertEqual(len(output), 4)
+        # 100 ms between setpoints at a 2 ms step
+        self.assertEqual(len(output[0]['GridFrequency_Hz']), 50)
+        self.assertEqual(sorted(output[0]['grid']), ['grid_001', 'grid_002', 'grid_003'])
+        self.assertEqual(len(output[0]['grid']['grid_002']['phase_b']['Current_kA']), 50)
+
+    def test_output_is_reproducible_per_request_id(self):
+        # Digest of the output produced by the original per-sample implementation
+        output = views._generate_rdn_mock_output(views._validate_rdn_grid_input(_rdn_request())[0])['outputData']
+        self.assertEqual(
+            hashlib.sha256(json.dumps(output).encode()).hexdigest(),
+            'a8c597705f7bf6832df4bf8d466a79db3e18efec4d2513d08c92d4da4e9030a0',
+        )
+        other = views._generate_rdn_mock_output(views._validate_rdn_grid_input(_rdn_request(request_id=43))[0])
+        self.assertNotEqual(other['outputData'], output)
+
+    def test_invalid_request_returns_400(self):
+        payload = _rdn_request()
+        payload['inputData']['gridSection'] = 'Z'
+        self.assertEqual(self._post(payload).status_code, 400)
+
+    def test_ndjson_streams_one_line_per_timestamp(self):
+        expected = self._post(_rdn_request()).json()
+        cache.clear()
+        resp = self._post(_rdn_request(), HTTP_ACCEPT='application/x-ndjson')
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp['Content-Type'], 'application/x-ndjson')
+        self.assertIn('Accept', resp['Vary'])
+
+        self.assertIsNone(views._load_rdn_follow(42))
+        head, *entries, trailer = [json.loads(line) for line in b''.join(resp.streaming_content).splitlines()]
+        self.assertEqual(head['requestId'], 42)
+        self.assertEqual(entries, expected['outputData'])
+        self.assertEqual(trailer, {'end': True, 'entries': 4})
+        self.assertEqual(views._load_rdn_follow(42)['gridSection'], 'C')
+
+    def test_failed_stream_ends_with_error_record_and_stores_no_follow_up(self):
+        with patch('digitaltwins.views._rdn_frequency_series', side_effect=[[50.0], RuntimeError('boom')]), \
+                self.assertLogs('digitaltwins.views', level='ERROR'):
+            resp = self._post(_rdn_request(step_seconds=0.002), HTTP_ACCEPT='application/x-ndjson')
+            lines = [json.loads(line) for line in b''.join(resp.streaming_content).splitlines()]
+
+        self.assertEqual(len(lines), 3)
+        self.assertIn('error', lines[-1])
+        self.assertIsNone(views._load_rdn_follow(42))
+
+    def test_columnar_payload_decodes_to_json_values(self):
+        expected = self._post(_rdn_request()).json()
+        resp = self._post(_rdn_request(), HTTP_ACCEPT='application/vnd.energyguard.rdn-columnar')
+        body = b''.join(resp.streaming_content)
+        self.assertLess(len(body), len(json.dumps(expected)) / 2)
+
+        self.assertEqual(body[:4], b'RDNC')
+        (header_len,) = struct.unpack_from('<I', body, 4)
+        header = json.loads(body[8:8 + header_len])
+        values = array('f')
+        values.frombytes(body[8 + header_len:])
+        if sys.byteorder == 'big':
+            values.byteswap()
+
+        self.assertEqual(header['series'][:3], ['GridFrequency_Hz', 'grid_001.phase_a.Voltage_kV', 'grid_001.phase_a.Current_kA'])
+        self.assertEqual([e['InputPowerSetpoint'] for e in header['outputData']],
+                         [{g: v['InputPowerSetpoint'] for g, v in e['grid'].items()} for e in expected['outputData']])
+        offset = 0
+        for meta, entry in zip(header['outputData'], expected['outputData']):
+            n = meta['samples']
+            for name in header['series']:
+                if name == 'GridFrequency_Hz':
+                    series = entry['GridFrequency_Hz']
+                else:
+                    grid_id, phase, quantity = name.split('.')
+                    series = entry['grid'][grid_id][phase][quantity]
+                for got, want in zip(values[offset:offset + n], series):
+                    self.assertAlmostEqual(got, want, delta=abs(want) * 1e-6 + 1e-6)
+                offset += n
+        self.assertEqual(offset, len(values))
+
+    def test_unsupported_accept_falls_back_to_json(self):
+        resp = self._post(_rdn_request(), HTTP_ACCEPT='text/html')
+        self.assertEqual(resp['Content-Type'], 'application/json')
+        self.assertFalse(resp.streaming)
@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     path('riga/rea-riga-dt/', views.rea_riga_dt, name='riga-map'),
     path('riga/rea-riga-dt/buildings/', views.rea_riga_buildings_api, name='rea-riga-buildings-api'),
+    path('riga/rea-riga-dt/tiles/<str:layer>/<int:z>/<int:x>/<int:y>.json', views.rea_riga_tile, name='rea-riga-tile'),
     path('list/', views.digitaltwins_list, name='digitaltwins-list'),
     path('cea-hydrogen/ai-scenario-generation/', views.cea_ai_scenario_generation, name='cea-ai-scenario-generation'),
     path('cea-hydrogen/dt-simulation/', views.cea_dt_simulation, name='cea-dt-simulation'),
@@ -4,24 +4,37 @@ import logging
 import math
 import random
 import re
+import struct
+import sys
+from array import array
 from datetime import datetime, timezone
-from functools import lru_cache
+from functools import lru_cache, partial
 from math import ceil
-from pathlib import Path
 
 import requests
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from django.http import Http404, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
-from django.views.decorators.http import require_POST
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition, require_POST
 
+from core.services import get_client
 from core.services.object_storage import MinioUploadError
 from datasets.services import provision_user_datasets
 
-from .services import save_simulation_result
+from .services import (
+    feature_limit_for_zoom,
+    load_ber_power_signals,
+    load_riga_buildings,
+    render_tile,
+    riga_layer,
+    save_simulation_result,
+    simplify_geometry,
+    simplify_tolerance_for_zoom,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +61,7 @@ def _check_simulate_rate_limit(user_id, prefix, limit=_SIMULATE_RATE_LIMIT, wind
 
 def _fetch_engreen_stations():
     try:
-        resp = requests.get(f'{_HAL_BASE}/stations', timeout=_HAL_STATIONS_TIMEOUT)
+        resp = get_client('hal').get(f'{_HAL_BASE}/stations', timeout=_HAL_STATIONS_TIMEOUT)
         resp.raise_for_status()
         return resp.json()
     except requests.RequestException as exc:
@@ -191,6 +204,13 @@ _RDN_DEFAULT_LAST_RESOLUTION_MS = 900_000  # 15 min, used only when there's a si
 
 _RDN_FOLLOW_CACHE_TTL = 3600  # seconds
 
+# rdn_grid_simulate output formats, negotiated via Accept
+_RDN_JSON = 'application/json'
+_RDN_NDJSON = 'application/x-ndjson'
+_RDN_COLUMNAR = 'application/vnd.energyguard.rdn-columnar'
+_RDN_OUTPUT_TYPES = [_RDN_JSON, _RDN_NDJSON, _RDN_COLUMNAR]
+_RDN_COLUMNAR_MAGIC = b'RDNC'
+
 _RDN_SIMULATE_RATE_LIMIT = 5  # lower than the default: mock generation is CPU-heavier
 _RDN_SIMULATE_RATE_WINDOW = 60
 
@@ -344,13 +364,34 @@ def _rdn_n_points_for_resolution(resolution_ms):
     return max(1, round(span_ms / _RDN_STEP_MS))
 
 
-def _rdn_transient(steady_value, amplitude, t_seconds, tau, freq_hz, phase_rad):
-    return steady_value + amplitude * math.exp(-t_seconds / tau) * math.cos(2 * math.pi * freq_hz * t_seconds + phase_rad)
+_RDN_SERIES_LENGTH = _rdn_n_points_for_resolution(_RDN_MAX_SPAN_MS)  # longest series a setpoint can produce
+
+
+@lru_cache(maxsize=None)
+def _rdn_decay(tau):
+    """exp(-t/tau) over the full sample grid, shared by every series with that time constant."""
+    return [math.exp(-(k * (_RDN_STEP_MS / 1000.0)) / tau) for k in range(_RDN_SERIES_LENGTH)]
+
+
+@lru_cache(maxsize=None)
+def _rdn_oscillation(freq_hz, phase_rad):
+    """cos(2*pi*f*t + phase) over the full sample grid."""
+    return [math.cos(2 * math.pi * freq_hz * (k * (_RDN_STEP_MS / 1000.0)) + phase_rad) for k in range(_RDN_SERIES_LENGTH)]
+
+
+_RDN_PHASE_OFFSETS = {'phase_a': 0.0, 'phase_b': -2 * math.pi / 3, 'phase_c': 2 * math.pi / 3}
 
 
 def _rdn_bus_series(mw, mvar, nominal_kv, n_points, rng):
     """Placeholder physics: a damped oscillation around a steady-state value
-    derived from the setpoint. NOT a real power-flow/EMT solution."""
+    derived from the setpoint. NOT a real power-flow/EMT solution.
+
+    Each sample is steady + amplitude * exp(-t/tau) * cos(2*pi*f*t + phase)
+    plus uniform jitter. The exp/cos terms come from tables shared by every
+    asset and setpoint, and each phase's draws are taken from rng in one
+    batch (voltage, current alternating, as uniform(-1, 1) would), so the
+    output is identical to evaluating the formula sample by sample.
+    """
     mw = mw or 0.0
     mvar = mvar or 0.0
     apparent_mva = math.hypot(mw, mvar)
@@ -361,98 +402,197 @@ def _rdn_bus_series(mw, mvar, nominal_kv, n_points, rng):
 
     v_amp = steady_v_kv * 0.005
     i_amp = steady_i_ka * 0.02
-    tau_v, tau_i = 0.05, 0.08
+    decay_v, decay_i = _rdn_decay(0.05), _rdn_decay(0.08)
     f_osc = 5.0
 
-    phase_offsets = {'phase_a': 0.0, 'phase_b': -2 * math.pi / 3, 'phase_c': 2 * math.pi / 3}
+    random = rng.random
     out = {}
-    for phase_name, phase_offset in phase_offsets.items():
-        v_series, i_series = [], []
-        for k in range(n_points):
-            t = k * (_RDN_STEP_MS / 1000.0)
-            jitter_v = rng.uniform(-1, 1) * v_amp * 0.1
-            jitter_i = rng.uniform(-1, 1) * i_amp * 0.1
-            v_series.append(round(_rdn_transient(steady_v_kv, v_amp, t, tau_v, f_osc, phase_offset) + jitter_v, 4))
-            i_series.append(round(_rdn_transient(steady_i_ka, i_amp, t, tau_i, f_osc, phase_offset) + jitter_i, 5))
-        out[phase_name] = {'Voltage_kV': v_series, 'Current_kA': i_series}
+    for phase_name, phase_offset in _RDN_PHASE_OFFSETS.items():
+        osc = _rdn_oscillation(f_osc, phase_offset)
+        draws = [random() for _ in range(2 * n_points)]
+        out[phase_name] = {
+            'Voltage_kV': [
+                round(steady_v_kv + v_amp * d * c + (-1 + 2 * r) * v_amp * 0.1, 4)
+                for d, c, r in zip(decay_v, osc, draws[0::2])
+            ],
+            'Current_kA': [
+                round(steady_i_ka + i_amp * d * c + (-1 + 2 * r) * i_amp * 0.1, 5)
+                for d, c, r in zip(decay_i, osc, draws[1::2])
+            ],
+        }
     return out
 
 
 def _rdn_frequency_series(total_imbalance_mw, n_points, rng):
     base_hz = 50.0
     d_hz = max(-0.2, min(0.2, -0.00005 * total_imbalance_mw))
-    tau_f, f_osc = 2.0, 0.3
+    steady_hz, amp_hz = base_hz + d_hz, abs(d_hz) * 0.3
+    decay, osc = _rdn_decay(2.0), _rdn_oscillation(0.3, 0.0)
     noise_smoothing = 0.03  # lower = smoother, slower-wandering noise instead of per-sample jitter
+    random = rng.random
     values = []
     noise = 0.0
-    for k in range(n_points):
-        noise += noise_smoothing * (rng.uniform(-1, 1) * 0.01 - noise)
-        values.append(round(
-            _rdn_transient(base_hz + d_hz, abs(d_hz) * 0.3, k * (_RDN_STEP_MS / 1000.0), tau_f, f_osc, 0.0) + noise,
-            4,
-        ))
+    for _, d, c in zip(range(n_points), decay, osc):
+        noise += noise_smoothing * ((-1 + 2 * random()) * 0.01 - noise)
+        values.append(round(steady_hz + amp_hz * d * c + noise, 4))
     return values
 
 
-def _generate_rdn_mock_output(cleaned_input):
+def _rdn_output_head(cleaned_input):
+    return {
+        'userId': cleaned_input['userId'],
+        'useCase': cleaned_input['useCase'],
+        'requestId': cleaned_input['requestId'],
+        'timestamp_UTC': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+    }
+
+
+def _rdn_grid_id(asset_id):
+    return 'grid_' + asset_id.split('_', 1)[1]
+
+
+def _rdn_setpoint(point):
+    setpoint = {}
+    if point.get('MW') is not None:
+        setpoint['MW'] = point['MW']
+    if point.get('MVAr') is not None:
+        setpoint['MVAr'] = point['MVAr']
+    return setpoint
+
+
+def _rdn_setpoint_samples(cleaned_input):
+    """[(timestamp, n_points)] for each input setpoint, shared by every asset."""
+    assets = cleaned_input['inputData']['asset']
+    timestamps = [item['timestamp_UTC'] for item in assets[min(assets)]['assetTimeSeries']]
+    timestamps_ms = [_iso_to_epoch_ms(ts) for ts in timestamps]
+    return [
+        (ts, _rdn_n_points_for_resolution(_rdn_derive_resolution_ms(timestamps_ms, idx)))
+        for idx, ts in enumerate(timestamps)
+    ]
+
+
+def _iter_rdn_output_data(cleaned_input):
+    """Yield the outputData entries one input timestamp at a time."""
     grid_section = cleaned_input['inputData']['gridSection']
     nominal_kv = _RDN_NOMINAL_KV_BY_SECTION[grid_section]
     assets = cleaned_input['inputData']['asset']
     request_id = cleaned_input['requestId']
-
     asset_ids = sorted(assets)
-    timestamps = [item['timestamp_UTC'] for item in assets[asset_ids[0]]['assetTimeSeries']]
-    timestamps_ms = [_iso_to_epoch_ms(ts) for ts in timestamps]
-
-    output_data = []
-    for idx, ts in enumerate(timestamps):
-        resolution_ms = _rdn_derive_resolution_ms(timestamps_ms, idx)
-        n_points = _rdn_n_points_for_resolution(resolution_ms)
 
+    for idx, (ts, n_points) in enumerate(_rdn_setpoint_samples(cleaned_input)):
         total_mw = sum((assets[aid]['assetTimeSeries'][idx].get('MW') or 0.0) for aid in asset_ids)
 
         grid_entry = {}
         for a_idx, aid in enumerate(asset_ids):
             asset = assets[aid]
             point = asset['assetTimeSeries'][idx]
-            mw, mvar = point.get('MW'), point.get('MVAr')
             rng = random.Random(request_id * 1_000_000 + a_idx * 1000 + idx)
-            grid_id = 'grid_' + aid.split('_', 1)[1]
-            setpoint = {}
-            if mw is not None:
-                setpoint['MW'] = mw
-            if mvar is not None:
-                setpoint['MVAr'] = mvar
-            grid_entry[grid_id] = {
+            grid_entry[_rdn_grid_id(aid)] = {
                 'BusType': asset['assetType'],
-                'InputPowerSetpoint': setpoint,
-                **_rdn_bus_series(mw, mvar, nominal_kv, n_points, rng),
+                'InputPowerSetpoint': _rdn_setpoint(point),
+                **_rdn_bus_series(point.get('MW'), point.get('MVAr'), nominal_kv, n_points, rng),
             }
 
         freq_rng = random.Random(request_id * 1_000_000 + 999 * 1000 + idx)
-        output_data.append({
+        yield {
             'InputTimestamp_UTC': ts,
             'GridFrequency_Hz': _rdn_frequency_series(total_mw, n_points, freq_rng),
             'grid': grid_entry,
-        })
+        }
 
-    return {
-        'userId': cleaned_input['userId'],
-        'useCase': cleaned_input['useCase'],
-        'requestId': request_id,
-        'timestamp_UTC': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-        'outputData': output_data,
+
+def _generate_rdn_mock_output(cleaned_input):
+    output_data = list(_iter_rdn_output_data(cleaned_input))
+    return {**_rdn_output_head(cleaned_input), 'outputData': output_data}
+
+
+def _stream_rdn_ndjson(cleaned_input):
+    """The simulation result as NDJSON: a header line, one line per outputData entry, then a trailer.
+
+    The trailer is {"end": true, "entries": n}, or {"error": ...} when
+    generation fails mid-stream; a body ending without either was cut short.
+    """
+    entries = 0
+    try:
+        yield json.dumps(_rdn_output_head(cleaned_input)) + '\n'
+        for entry in _iter_rdn_output_data(cleaned_input):
+            yield json.dumps(entry) + '\n'
+            entries += 1
+    except Exception:
+        yield json.dumps({'error': 'Could not generate the simulation result.'}) + '\n'
+        raise
+    yield json.dumps({'end': True, 'entries': entries}) + '\n'
+
+
+def _rdn_columnar_series(cleaned_input):
+    names = ['GridFrequency_Hz']
+    for aid in sorted(cleaned_input['inputData']['asset']):
+        names.extend(
+            f'{_rdn_grid_id(aid)}.{phase}.{quantity}'
+            for phase in _RDN_PHASE_OFFSETS for quantity in ('Voltage_kV', 'Current_kA')
+        )
+    return names
+
+
+def _stream_rdn_columnar(cleaned_input):
+    """The simulation result as a compact columnar payload.
+
+    Layout: the magic bytes RDNC, a little-endian uint32 header length and a
+    JSON header (metadata, setpoints, per-entry sample counts and the series
+    order), then for each outputData entry every series in that order as
+    `samples` little-endian float32 values.
+    """
+    assets = cleaned_input['inputData']['asset']
+    asset_ids = sorted(assets)
+    header = {
+        **_rdn_output_head(cleaned_input),
+        'dtype': '<f4',
+        'series': _rdn_columnar_series(cleaned_input),
+        'grid': [{'id': _rdn_grid_id(aid), 'BusType': assets[aid]['assetType']} for aid in asset_ids],
+        'outputData': [
+            {
+                'InputTimestamp_UTC': ts,
+                'samples': n_points,
+                'InputPowerSetpoint': {
+                    _rdn_grid_id(aid): _rdn_setpoint(assets[aid]['assetTimeSeries'][idx]) for aid in asset_ids
+                },
+            }
+            for idx, (ts, n_points) in enumerate(_rdn_setpoint_samples(cleaned_input))
+        ],
     }
+    encoded = json.dumps(header).encode('utf-8')
+    encoded += b' ' * (-len(encoded) % 4)  # keeps the float32 data 4-byte aligned
+    yield _RDN_COLUMNAR_MAGIC + struct.pack('<I', len(encoded)) + encoded
+
+    for entry in _iter_rdn_output_data(cleaned_input):
+        values = array('f', entry['GridFrequency_Hz'])
+        for aid in asset_ids:
+            bus = entry['grid'][_rdn_grid_id(aid)]
+            for phase in _RDN_PHASE_OFFSETS:
+                values.extend(bus[phase]['Voltage_kV'])
+                values.extend(bus[phase]['Current_kA'])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        yield values.tobytes()
+
+
+def _logged_rdn_stream(chunks, request_id, on_complete):
+    # Errors can no longer change the status once streaming started: log and cut the body short
+    try:
+        yield from chunks
+    except Exception:
+        logger.exception('RDN mock generation failed for request %s', request_id)
+        return
+    # Only a fully delivered result can be followed up
+    on_complete()
 
 
 def _dt_render(request, template, **extra):
     return render(request, template, {'show_sidebar': True, 'active_navbar_page': 'facilities', **extra})
 
 
-_BER_RESULTS_LP_PATH = Path(__file__).resolve().parent / 'static' / 'digitaltwins' / 'data' / 'ber-hydrogen-sample.lp'
 _BER_EXPERIMENT_ID = 'BER-2026-000123'
 _BER_SERIAL_NUMBER = 6
-_BER_POWER_TAGS = ('JT_3001', 'JT_3002', 'JT_3003', 'ET_1001', 'IT_1101')
 _BER_CHART_MAX_POINTS = 1500
 
 BER_SIGNAL_INFO = {
@@ -464,30 +604,6 @@ BER_SIGNAL_INFO = {
 }
 
 
-@lru_cache(maxsize=1)
-def _parse_ber_power_signals():
-    series = {tag: [] for tag in _BER_POWER_TAGS}
-    with open(_BER_RESULTS_LP_PATH, encoding='utf-8') as f:
-        for line in f:
-            if not line.startswith('power,'):
-                continue
-            parts = line.rstrip('\n').split(' ')
-            if len(parts) != 3:
-                continue
-            tag, sep, raw_value = parts[1].partition('=')
-            if not sep or tag not in series:
-                continue
-            try:
-                value = float(raw_value)
-                ts_seconds = int(parts[2]) / 1_000_000_000
-            except ValueError:
-                continue
-            series[tag].append((ts_seconds, value))
-    for tag in series:
-        series[tag].sort(key=lambda point: point[0])
-    return series
-
-
 def _downsample(points, max_points=_BER_CHART_MAX_POINTS):
     n = len(points)
     if n <= max_points:
@@ -567,7 +683,7 @@ def _power_chart_axis_range(peak_total_power, step=2):
 
 @login_required
 def ber_hydrogen_results(request):
-    series = _parse_ber_power_signals()
+    series = load_ber_power_signals()
 
     all_timestamps = [ts for points in series.values() for ts, _ in points]
     if not all_timestamps:
@@ -610,38 +726,27 @@ def ber_hydrogen_results(request):
     )
 
 
-_RIGA_BUILDINGS_PATH = Path(__file__).resolve().parent / 'static' / 'digitaltwins' / 'data' / 'DT_data.json'
-
-
-def _iter_coordinates(coords):
-    if not coords:
-        return
-    if isinstance(coords[0], (int, float)):
-        yield coords
-        return
-    for item in coords:
-        yield from _iter_coordinates(item)
+_RIGA_TILE_MIN_ZOOM = 10
+_RIGA_TILE_MAX_ZOOM = 19
+_RIGA_TILE_CACHE_TTL = 24 * 3600  # seconds; keys carry the source file version
+_RIGA_TILE_MAX_AGE = 3600         # browser cache lifetime before revalidating with the ETag
 
 
-def _feature_bbox(feature):
-    geometry = feature.get('geometry') or {}
-    lons, lats = [], []
-    for lon, lat in _iter_coordinates(geometry.get('coordinates')):
-        lons.append(lon)
-        lats.append(lat)
-    return (min(lons), min(lats), max(lons), max(lats)) if lons else None
+def _riga_tile(layer, z, x, y):
+    """Return (body, etag) of a map tile, rendering it once per source file version."""
+    source = riga_layer(layer)
+    if source is None:
+        raise Http404('Unknown tile layer.')
+    loader, version = source
+    if not _RIGA_TILE_MIN_ZOOM <= z <= _RIGA_TILE_MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise Http404('Tile out of range.')
 
-
-@lru_cache(maxsize=1)
-def _load_riga_buildings():
-    with open(_RIGA_BUILDINGS_PATH, encoding='utf-8') as f:
-        data = json.load(f, parse_constant=lambda _: None)
-    indexed = []
-    for feature in data.get('features', []):
-        bbox = _feature_bbox(feature)
-        if bbox:
-            indexed.append((bbox, feature))
-    return indexed
+    key = f'dt:riga-tile:{layer}:{version}:{z}/{x}/{y}'
+    tile = cache.get(key)
+    if tile is None:
+        tile = render_tile(loader(), z, x, y)
+        cache.set(key, tile, _RIGA_TILE_CACHE_TTL)
+    return tile
 
 
 @login_required
@@ -658,12 +763,32 @@ def rea_riga_buildings_api(request):
         max_lat = float(request.GET['max_lat'])
     except (KeyError, ValueError):
         return JsonResponse({'error': 'Invalid or missing bbox parameters.'}, status=400)
+    if not all(math.isfinite(v) for v in (min_lon, min_lat, max_lon, max_lat)):
+        return JsonResponse({'error': 'Invalid or missing bbox parameters.'}, status=400)
 
-    features = [
-        feature for (f_min_lon, f_min_lat, f_max_lon, f_max_lat), feature in _load_riga_buildings()
-        if f_min_lon <= max_lon and f_max_lon >= min_lon and f_min_lat <= max_lat and f_max_lat >= min_lat
-    ]
-    return JsonResponse({'type': 'FeatureCollection', 'features': features})
+    zoom = request.GET.get('zoom')
+    if zoom is not None:
+        try:
+            zoom = int(float(zoom))
+        except (ValueError, OverflowError):
+            return JsonResponse({'error': 'Invalid zoom parameter.'}, status=400)
+
+    features, truncated = load_riga_buildings().query(
+        (min_lon, min_lat, max_lon, max_lat), limit=feature_limit_for_zoom(zoom),
+    )
+    tolerance = simplify_tolerance_for_zoom(zoom)
+    if tolerance:
+        features = [{**f, 'geometry': simplify_geometry(f.get('geometry'), tolerance)} for f in features]
+    return JsonResponse({'type': 'FeatureCollection', 'features': features, 'truncated': truncated})
+
+
+@login_required
+@condition(etag_func=lambda request, layer, z, x, y: _riga_tile(layer, z, x, y)[1])
+def rea_riga_tile(request, layer, z, x, y):
+    body, _ = _riga_tile(layer, z, x, y)
+    response = HttpResponse(body, content_type='application/json')
+    patch_cache_control(response, private=True, max_age=_RIGA_TILE_MAX_AGE)
+    return response
 
 
 @login_required
@@ -775,7 +900,7 @@ def engreen_pv_simulate(request):
         hal_url = f'{_HAL_BASE}/simulate/annual/optimistic'
 
     try:
-        resp = requests.post(hal_url, json=payload, timeout=_HAL_SIMULATE_TIMEOUT)
+        resp = get_client('hal').post(hal_url, json=payload, timeout=_HAL_SIMULATE_TIMEOUT)
         resp.raise_for_status()
         try:
             data = resp.json()
@@ -828,20 +953,31 @@ def rdn_grid_simulate(request):
     if error:
         return JsonResponse({'error': error}, status=400)
 
-    try:
-        result = _generate_rdn_mock_output(cleaned)
-    except Exception:
-        logger.exception('RDN mock generation failed for request %s', cleaned.get('requestId'))
-        return JsonResponse({'error': 'Could not generate the simulation result.'}, status=500)
-
-    _store_rdn_follow(
+    store_follow = partial(
+        _store_rdn_follow,
         cleaned['requestId'],
         cleaned['inputData']['gridSection'],
         cleaned['useCase'],
         {aid: a['assetType'] for aid, a in cleaned['inputData']['asset'].items()},
     )
 
-    return JsonResponse(result)
+    # Clients opt into a streamed format via Accept; anything else gets the JSON document
+    media_type = request.get_preferred_type(_RDN_OUTPUT_TYPES) or _RDN_JSON
+    if media_type == _RDN_JSON:
+        try:
+            response = JsonResponse(_generate_rdn_mock_output(cleaned))
+        except Exception:
+            logger.exception('RDN mock generation failed for request %s', cleaned.get('requestId'))
+            return JsonResponse({'error': 'Could not generate the simulation result.'}, status=500)
+        store_follow()
+    else:
+        stream = _stream_rdn_ndjson(cleaned) if media_type == _RDN_NDJSON else _stream_rdn_columnar(cleaned)
+        response = StreamingHttpResponse(
+            _logged_rdn_stream(stream, cleaned['requestId'], store_follow), content_type=media_type,
+        )
+
+    patch_vary_headers(response, ['Accept'])
+    return response
 
 
 @login_required
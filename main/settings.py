@@ -324,6 +324,38 @@ OBJECT_STORAGE_SECRET_KEY = env("OBJECT_STORAGE_SECRET_KEY")
 OBJECT_STORAGE_VERIFY_SSL = env.bool("OBJECT_STORAGE_VERIFY_SSL")
 OBJECT_STORAGE_BUCKET = env("OBJECT_STORAGE_BUCKET")
 OBJECT_STORAGE_BUCKET_SIMULATIONS = env("OBJECT_STORAGE_BUCKET_SIMULATIONS", default="dt-results")
+OBJECT_STORAGE_BUCKET_CODE_ANALYSIS = env("OBJECT_STORAGE_BUCKET_CODE_ANALYSIS", default=OBJECT_STORAGE_BUCKET)
+OBJECT_STORAGE_BUCKET_REPORTS = env("OBJECT_STORAGE_BUCKET_REPORTS", default=OBJECT_STORAGE_BUCKET)
+
+# Persisted analysis reports (code analysis, robustness): "minio" or "filesystem" (REPORT_STORE_ROOT)
+REPORT_STORE_BACKEND = env('REPORT_STORE_BACKEND', default='minio')
+REPORT_STORE_PREFIX = env('REPORT_STORE_PREFIX', default='reports')
+REPORT_STORE_ROOT = env('REPORT_STORE_ROOT', default=str(BASE_DIR / 'report_store'))
+REPORT_STORE_CACHE_MB = env.int('REPORT_STORE_CACHE_MB', default=64)
+
+# Memory-mapped digital twin data compiled by `manage.py build_dt_data`
+DT_DATA_CACHE_DIR = env('DT_DATA_CACHE_DIR', default=str(BASE_DIR / 'dt_cache'))
+
+# Cache shared by the web and qcluster processes: token, MLflow and
+# notification entries are invalidated from either side, so it must not be
+# per-process. Redis when REDIS_URL is set, otherwise the database
+# (`manage.py createcachetable`).
+REDIS_URL = env('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'energyguard',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
 
 # Django-Q2 (async task queue)
 Q_CLUSTER = {
@@ -341,6 +373,8 @@ JUPYTERHUB_URL = env('JUPYTERHUB_URL')
 
 # Code Analysis (Semgrep backend)
 SCAN_API_URL = env('SCAN_API_URL', default='').rstrip('/')
+# Bump whenever the backend's Semgrep rules change so cached scan results are not reused.
+SCAN_RULESET_VERSION = env('SCAN_RULESET_VERSION', default='default')
 
 REPORTS_DIR = str(BASE_DIR / 'robustness_reports')
 ROBUSTNESS_API_URL = env('ROBUSTNESS_API_URL', default='')
@@ -350,5 +384,16 @@ ROBUSTNESS_API_POLL_TIMEOUT = env.int('ROBUSTNESS_API_POLL_TIMEOUT', default=30)
 ROBUSTNESS_API_POLL_INTERVAL = float(env('ROBUSTNESS_API_POLL_INTERVAL', default='2.0'))
 SCAN_API_TIMEOUT = env.int('SCAN_API_TIMEOUT', default=300)
 
+# Shared HTTP client (core.services.http_client): per-service overrides of
+# timeout, retries, backoff, max_backoff, retry_statuses, failure_threshold,
+# reset_timeout and pool_maxsize.
+HTTP_CLIENT_SERVICES = {
+    'scan': {
+        # SCAN_API_MAX_RETRIES counts attempts, not retries.
+        'retries': max(1, env.int('SCAN_API_MAX_RETRIES', default=3)) - 1,
+        'backoff': max(0.0, float(env('SCAN_API_RETRY_BACKOFF_SEC', default='1.0'))),
+    },
+}
+
 # Engreen HAL simulation service
 HAL_BASE_URL = env('HAL_BASE_URL')
\ No newline at end of file
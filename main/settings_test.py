@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 os.environ.setdefault('HAL_BASE_URL', 'http://hal.test.invalid')
 
@@ -21,3 +22,13 @@ class _DisableMigrations:
 
 
 MIGRATION_MODULES = _DisableMigrations()
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+REPORT_STORE_BACKEND = "filesystem"
+REPORT_STORE_ROOT = tempfile.mkdtemp(prefix="report-store-")
+DT_DATA_CACHE_DIR = tempfile.mkdtemp(prefix="dt-cache-")
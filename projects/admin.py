@@ -1,7 +1,27 @@
 from django.contrib import admin
-from .models import Experiment, Project, ProjectCollaborator
+from .models import ArtifactPurge, Experiment, MetricDirection, MlflowSyncState, Project, ProjectCollaborator
 
 # Register your models here.
 admin.site.register(Project)
 admin.site.register(ProjectCollaborator)
 admin.site.register(Experiment)
+
+
+@admin.register(MetricDirection)
+class MetricDirectionAdmin(admin.ModelAdmin):
+    list_display = ('key', 'higher_is_better')
+    list_editable = ('higher_is_better',)
+    search_fields = ('key',)
+
+
+@admin.register(MlflowSyncState)
+class MlflowSyncStateAdmin(admin.ModelAdmin):
+    list_display = ('experiment', 'watermark', 'synced_at', 'last_error')
+    readonly_fields = ('watermark', 'synced_at', 'last_error')
+
+
+@admin.register(ArtifactPurge)
+class ArtifactPurgeAdmin(admin.ModelAdmin):
+    list_display = ('mlflow_experiment_id', 'status', 'deleted_count', 'attempts', 'updated_at')
+    list_filter = ('status',)
+    readonly_fields = ('start_after', 'deleted_count', 'attempts', 'last_error')
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django_q.tasks import async_task
+
+from projects.models import ArtifactPurge
+from projects.services import artifact_purge_task, run_artifact_purge
+
+
+class Command(BaseCommand):
+    help = "Resume unfinished MLflow artifact purges from their checkpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sync", action="store_true", help="Run purges in this process instead of enqueueing them.")
+        parser.add_argument("--include-running", action="store_true",
+                            help="Also resume purges marked running, e.g. after a worker crash.")
+
+    def handle(self, *args, **options):
+        statuses = [ArtifactPurge.Status.PENDING, ArtifactPurge.Status.FAILED]
+        if options["include_running"]:
+            statuses.append(ArtifactPurge.Status.RUNNING)
+        purges = ArtifactPurge.objects.filter(status__in=statuses).order_by("updated_at")
+
+        count = 0
+        for purge in purges.iterator():
+            if options["sync"]:
+                status = run_artifact_purge(purge.pk)
+                self.stdout.write(f"{purge}: {status}")
+            else:
+                async_task(artifact_purge_task, purge.pk)
+            count += 1
+        verb = "Ran" if options["sync"] else "Enqueued"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {count} artifact purges."))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import Experiment
+from projects.services import MlflowClientError, sync_all_experiments, sync_experiment_runs
+
+
+class Command(BaseCommand):
+    help = (
+        "Mirror MLflow runs, metrics and model versions of our experiments into local tables. "
+        "Incremental by default; schedule it (cron or a django-q Schedule) to keep leaderboards fresh."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--experiment", type=int, help="Only sync this experiment (primary key).")
+        parser.add_argument("--full", action="store_true", help="Ignore the watermark and drop runs deleted in MLflow.")
+
+    def handle(self, *args, **options):
+        if options["experiment"] is None:
+            result = sync_all_experiments(full=options["full"])
+            self.stdout.write(self.style.SUCCESS(
+                f"Synced {result['synced']} experiments ({result['failed']} failed)."
+            ))
+            return
+
+        try:
+            experiment = Experiment.objects.exclude(mlflow_experiment_id="").get(pk=options["experiment"])
+        except Experiment.DoesNotExist as exc:
+            raise CommandError(f"Experiment {options['experiment']} does not exist or has no MLflow experiment.") from exc
+        try:
+            count = sync_experiment_runs(experiment, full=options["full"])
+        except MlflowClientError as exc:
+            raise CommandError(f"MLflow sync failed: {exc}") from exc
+        self.stdout.write(self.style.SUCCESS(f"Synced {count} runs of experiment {experiment.pk}."))
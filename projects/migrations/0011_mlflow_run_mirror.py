@@ -0,0 +1,105 @@
+# Generated by Django 6.0 on 2026-10-19 17:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0010_update_project_type_choices'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricDirection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(max_length=250, unique=True)),
+                ('higher_is_better', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'Metric Direction',
+                'verbose_name_plural': 'Metric Directions',
+                'db_table': 'mlflow_metric_direction',
+                'ordering': ['key'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MlflowRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('run_id', models.CharField(max_length=64, unique=True)),
+                ('status', models.CharField(blank=True, default='', max_length=20)),
+                ('start_time', models.BigIntegerField(blank=True, null=True)),
+                ('end_time', models.BigIntegerField(blank=True, null=True)),
+                ('experiment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mlflow_runs', to='experiments.experiment')),
+            ],
+            options={
+                'verbose_name': 'MLflow Run',
+                'verbose_name_plural': 'MLflow Runs',
+                'db_table': 'mlflow_run',
+            },
+        ),
+        migrations.CreateModel(
+            name='MlflowModelVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('version', models.CharField(max_length=32)),
+                ('source', models.TextField(blank=True, default='')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='model_versions', to='experiments.mlflowrun')),
+            ],
+            options={
+                'db_table': 'mlflow_model_version',
+            },
+        ),
+        migrations.CreateModel(
+            name='MlflowRunMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=250)),
+                ('value', models.FloatField()),
+                ('experiment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mlflow_run_metrics', to='experiments.experiment')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to='experiments.mlflowrun')),
+            ],
+            options={
+                'db_table': 'mlflow_run_metric',
+            },
+        ),
+        migrations.CreateModel(
+            name='MlflowSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('watermark', models.BigIntegerField(blank=True, null=True)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('experiment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='mlflow_sync', to='experiments.experiment')),
+            ],
+            options={
+                'verbose_name': 'MLflow Sync State',
+                'verbose_name_plural': 'MLflow Sync States',
+                'db_table': 'mlflow_sync_state',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='mlflowrun',
+            index=models.Index(fields=['experiment', 'start_time'], name='mlflow_run_exp_start'),
+        ),
+        migrations.AddConstraint(
+            model_name='mlflowmodelversion',
+            constraint=models.UniqueConstraint(fields=('name', 'version'), name='mlflow_model_version_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='mlflowrunmetric',
+            index=models.Index(fields=['experiment', 'key', 'value'], name='mlflow_metric_exp_key_value'),
+        ),
+        migrations.AddConstraint(
+            model_name='mlflowrunmetric',
+            constraint=models.UniqueConstraint(fields=('run', 'key'), name='mlflow_run_metric_unique_key'),
+        ),
+    ]
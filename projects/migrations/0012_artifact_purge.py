@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0011_mlflow_run_mirror'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtifactPurge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('mlflow_experiment_id', models.CharField(max_length=64, unique=True)),
+                ('bucket_name', models.CharField(max_length=255)),
+                ('prefix', models.CharField(max_length=1024)),
+                ('start_after', models.CharField(blank=True, default='', max_length=1024)),
+                ('deleted_count', models.PositiveBigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'verbose_name': 'Artifact Purge',
+                'verbose_name_plural': 'Artifact Purges',
+                'db_table': 'mlflow_artifact_purge',
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='mlflow_purge_status')],
+            },
+        ),
+    ]
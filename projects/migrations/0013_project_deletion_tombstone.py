@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-19 18:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0012_artifact_purge'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='deletion_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='deletion_status',
+            field=models.CharField(choices=[('active', 'Active'), ('deleting', 'Deleting'), ('failed', 'Deletion failed')], default='active', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='deletion_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['deletion_status', 'creator'], name='project_deletio_7841ee_idx'),
+        ),
+    ]
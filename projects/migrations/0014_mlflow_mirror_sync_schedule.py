@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.get_or_create(
+        name="sync_mlflow_mirror",
+        defaults={
+            "func": "projects.services.run_mirror.sync_all_experiments",
+            "schedule_type": "I",
+            "minutes": 15,
+            "repeats": -1,
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name="sync_mlflow_mirror").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0013_project_deletion_tombstone"),
+        ("django_q", "0018_task_success_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
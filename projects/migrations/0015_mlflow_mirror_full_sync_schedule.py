@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.get_or_create(
+        name="sync_mlflow_mirror_full",
+        defaults={
+            "func": "projects.services.run_mirror.sync_all_experiments",
+            "kwargs": "full=True",
+            "schedule_type": "D",
+            "repeats": -1,
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name="sync_mlflow_mirror_full").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0014_mlflow_mirror_sync_schedule"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
@@ -4,7 +4,18 @@ from django.db import models
 from core.models import TimeStampedModel
 
 
+class ProjectQuerySet(models.QuerySet):
+    def active(self):
+        """Projects that are not tombstoned for deletion."""
+        return self.filter(deletion_status=Project.DeletionStatus.ACTIVE)
+
+
 class Project(TimeStampedModel):
+    class DeletionStatus(models.TextChoices):
+        ACTIVE = 'active', 'Active'
+        DELETING = 'deleting', 'Deleting'
+        FAILED = 'failed', 'Deletion failed'
+
     class ProjectType(models.TextChoices):
         AI_MODEL = 'ai_model', 'AI Model'
         AI_SERVICE = 'ai_service', 'AI Service'
@@ -20,10 +31,22 @@ class Project(TimeStampedModel):
     project_type = models.CharField(max_length=20, choices=ProjectType, default=ProjectType.AI_MODEL)
     description = models.TextField(blank=True)
     visibility = models.BooleanField(default=False)
+    # Deletion tombstone: the project is hidden as soon as deletion is
+    # requested and removed by a background job once its experiments are gone.
+    deletion_status = models.CharField(max_length=10, choices=DeletionStatus, default=DeletionStatus.ACTIVE)
+    deletion_requested_at = models.DateTimeField(null=True, blank=True)
+    deletion_total = models.PositiveIntegerField(default=0)
+    deletion_error = models.TextField(blank=True, default='')
+
+    objects = ProjectQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    @property
+    def is_deleting(self):
+        return self.deletion_status != self.DeletionStatus.ACTIVE
+
     def is_accessible_by(self, user):
         if self.visibility:
             return True
@@ -36,7 +59,7 @@ class Project(TimeStampedModel):
         verbose_name = 'Project'
         verbose_name_plural = 'Projects'
         ordering = ["-created_at"]
-        indexes = [models.Index(fields=['name']),]
+        indexes = [models.Index(fields=['name']), models.Index(fields=['deletion_status', 'creator'])]
 
 
 class Experiment(TimeStampedModel):
@@ -80,3 +103,135 @@ class ProjectCollaborator(TimeStampedModel):
                 fields=["collaborator", "project"], name="unique_person_project"
             )
         ]
+
+
+class MetricDirection(TimeStampedModel):
+    """Whether a larger value of an MLflow metric key is better (accuracy) or
+    worse (loss). Keys without a row are treated as lower-is-better.
+    """
+
+    key = models.CharField(max_length=250, unique=True)
+    higher_is_better = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = "mlflow_metric_direction"
+        verbose_name = "Metric Direction"
+        verbose_name_plural = "Metric Directions"
+        ordering = ["key"]
+
+    def __str__(self):
+        return f"{self.key} ({'higher' if self.higher_is_better else 'lower'} is better)"
+
+
+class MlflowRun(TimeStampedModel):
+    """Local mirror of an MLflow run of one of our experiments."""
+
+    experiment = models.ForeignKey(Experiment, on_delete=models.CASCADE, related_name="mlflow_runs")
+    run_id = models.CharField(max_length=64, unique=True)
+    status = models.CharField(max_length=20, blank=True, default="")
+    # Epoch milliseconds, as MLflow reports them.
+    start_time = models.BigIntegerField(null=True, blank=True)
+    end_time = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        db_table = "mlflow_run"
+        verbose_name = "MLflow Run"
+        verbose_name_plural = "MLflow Runs"
+        indexes = [
+            models.Index(fields=["experiment", "start_time"], name="mlflow_run_exp_start"),
+        ]
+
+    def __str__(self):
+        return self.run_id
+
+
+class MlflowRunMetric(models.Model):
+    """Latest value of one metric of a mirrored run."""
+
+    run = models.ForeignKey(MlflowRun, on_delete=models.CASCADE, related_name="metrics")
+    # Denormalised from run so leaderboards never join through mlflow_run.
+    experiment = models.ForeignKey(Experiment, on_delete=models.CASCADE, related_name="mlflow_run_metrics")
+    key = models.CharField(max_length=250)
+    value = models.FloatField()
+
+    class Meta:
+        db_table = "mlflow_run_metric"
+        constraints = [
+            models.UniqueConstraint(fields=["run", "key"], name="mlflow_run_metric_unique_key"),
+        ]
+        indexes = [
+            models.Index(fields=["experiment", "key", "value"], name="mlflow_metric_exp_key_value"),
+        ]
+
+    def __str__(self):
+        return f"{self.key}={self.value}"
+
+
+class MlflowModelVersion(models.Model):
+    """Registered model version logged from a mirrored run."""
+
+    run = models.ForeignKey(MlflowRun, on_delete=models.CASCADE, related_name="model_versions")
+    name = models.CharField(max_length=255)
+    version = models.CharField(max_length=32)
+    source = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "mlflow_model_version"
+        constraints = [
+            models.UniqueConstraint(fields=["name", "version"], name="mlflow_model_version_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class MlflowSyncState(models.Model):
+    """Incremental sync position of an experiment's run mirror."""
+
+    experiment = models.OneToOneField(Experiment, on_delete=models.CASCADE, related_name="mlflow_sync")
+    # Runs starting at or after this epoch-ms watermark are re-fetched on the next sync.
+    watermark = models.BigIntegerField(null=True, blank=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "mlflow_sync_state"
+        verbose_name = "MLflow Sync State"
+        verbose_name_plural = "MLflow Sync States"
+
+    def __str__(self):
+        return f"{self.experiment} @ {self.watermark}"
+
+
+class ArtifactPurge(TimeStampedModel):
+    """Checkpointed deletion of an MLflow experiment's artifacts from object storage.
+
+    Keys are deleted in listing order; start_after is the last key of the
+    last fully deleted page, so an interrupted purge resumes from there.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    mlflow_experiment_id = models.CharField(max_length=64, unique=True)
+    bucket_name = models.CharField(max_length=255)
+    prefix = models.CharField(max_length=1024)
+    start_after = models.CharField(max_length=1024, blank=True, default="")
+    deleted_count = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=Status, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "mlflow_artifact_purge"
+        verbose_name = "Artifact Purge"
+        verbose_name_plural = "Artifact Purges"
+        indexes = [
+            models.Index(fields=["status", "updated_at"], name="mlflow_purge_status"),
+        ]
+
+    def __str__(self):
+        return f"{self.bucket_name}/{self.prefix} ({self.status})"
@@ -2,24 +2,73 @@ from .mlflow_client import (
     MlflowClientError,
     create_experiment_permission,
     create_experiment,
-    delete_artifacts_from_object_storage,
     delete_experiment,
+    get_experiment_lifecycle_stage,
     get_experiment_tags,
+    invalidate_experiment_cache,
+    iter_experiment_runs,
     list_experiment_runs,
+    list_registered_model_versions_for_runs,
     make_deleted_experiment_name,
+    map_concurrently,
+    mlflow_auth_headers,
     set_experiment_tags,
+    summarize_experiment_runs,
     update_experiment_name,
 )
+from .artifact_purge import (
+    artifact_purge_task,
+    delete_artifacts_from_object_storage,
+    enqueue_artifact_purge,
+    run_artifact_purge,
+)
+from .project_deletion import (
+    project_deletion_progress,
+    project_deletion_task,
+    request_project_deletion,
+    run_project_deletion,
+)
+from .run_metrics import RunMetricsAggregator, is_better
+from .run_mirror import (
+    higher_is_better_metrics,
+    metric_leaderboard,
+    mirrored_model_versions,
+    mirrored_runs,
+    sync_all_experiments,
+    sync_experiment_runs,
+)
 
 __all__ = [
     "MlflowClientError",
+    "RunMetricsAggregator",
+    "artifact_purge_task",
     "create_experiment_permission",
     "create_experiment",
     "delete_artifacts_from_object_storage",
     "delete_experiment",
+    "enqueue_artifact_purge",
+    "get_experiment_lifecycle_stage",
     "get_experiment_tags",
+    "higher_is_better_metrics",
+    "invalidate_experiment_cache",
+    "is_better",
+    "iter_experiment_runs",
     "list_experiment_runs",
+    "list_registered_model_versions_for_runs",
     "make_deleted_experiment_name",
+    "map_concurrently",
+    "metric_leaderboard",
+    "mirrored_model_versions",
+    "mirrored_runs",
+    "mlflow_auth_headers",
+    "project_deletion_progress",
+    "project_deletion_task",
+    "request_project_deletion",
+    "run_artifact_purge",
+    "run_project_deletion",
     "set_experiment_tags",
+    "summarize_experiment_runs",
+    "sync_all_experiments",
+    "sync_experiment_runs",
     "update_experiment_name",
 ]
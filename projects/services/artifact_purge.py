@@ -0,0 +1,161 @@
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import transaction
+from django_q.tasks import async_task
+
+from core.services.object_storage import MinioUploadError, build_minio_client
+
+from ..models import ArtifactPurge
+from .mlflow_client import MlflowClientError
+
+__all__ = [
+    "artifact_purge_task",
+    "delete_artifacts_from_object_storage",
+    "enqueue_artifact_purge",
+    "record_artifact_purge",
+    "run_artifact_purge",
+]
+
+logger = logging.getLogger(__name__)
+
+# S3 DeleteObjects accepts at most 1000 keys, which is also the listing page size.
+DELETE_BATCH_SIZE = 1000
+
+
+def _purge_workers() -> int:
+    try:
+        return max(1, int(os.getenv("MLFLOW_ARTIFACT_PURGE_WORKERS", "4")))
+    except ValueError:
+        return 4
+
+
+def _artifact_bucket() -> str:
+    return os.getenv("MLFLOW_ARTIFACT_BUCKET", "mlflow-bucket")
+
+
+def _time_budget() -> float:
+    try:
+        return max(1.0, float(os.getenv("MLFLOW_ARTIFACT_PURGE_TIME_BUDGET", "600")))
+    except ValueError:
+        return 600.0
+
+
+def _delete_batch(client, bucket_name: str, keys: list[str]) -> int:
+    response = client.delete_objects(
+        Bucket=bucket_name,
+        Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+    )
+    errors = response.get("Errors") or []
+    if errors:
+        first = errors[0]
+        raise MinioUploadError(
+            f"{len(errors)} of {len(keys)} artifacts were not deleted "
+            f"(first: {first.get('Key')}: {first.get('Code')} {first.get('Message')})"
+        )
+    return len(keys)
+
+
+def record_artifact_purge(mlflow_experiment_id: str) -> ArtifactPurge | None:
+    """Create (or reuse) the purge record for an experiment's artifacts."""
+    experiment = str(mlflow_experiment_id or "").strip().strip("/")
+    if not experiment:
+        return None
+    purge, _ = ArtifactPurge.objects.get_or_create(
+        mlflow_experiment_id=experiment,
+        defaults={"bucket_name": _artifact_bucket(), "prefix": f"{experiment}/"},
+    )
+    return purge
+
+
+def run_artifact_purge(purge_id: int, time_budget: float | None = None) -> str:
+    """Delete a purge's remaining artifacts with parallel DeleteObjects batches.
+
+    Listing stays sequential while up to MLFLOW_ARTIFACT_PURGE_WORKERS batches
+    are deleted concurrently. The checkpoint only moves past a page once every
+    earlier page has been deleted. When time_budget (seconds) runs out the
+    purge is left pending for the next run. Returns the resulting status.
+    """
+    purge = ArtifactPurge.objects.get(pk=purge_id)
+    if purge.status == ArtifactPurge.Status.COMPLETED:
+        return purge.status
+    purge.status = ArtifactPurge.Status.RUNNING
+    purge.attempts += 1
+    purge.save(update_fields=["status", "attempts", "updated_at"])
+
+    deadline = time.monotonic() + time_budget if time_budget else None
+    in_flight = deque()
+
+    def _checkpoint(wait: bool) -> None:
+        while in_flight and (wait or in_flight[0][0].done()):
+            future, last_key = in_flight.popleft()
+            purge.deleted_count += future.result()
+            purge.start_after = last_key
+            purge.save(update_fields=["deleted_count", "start_after", "updated_at"])
+
+    finished = False
+    try:
+        client = build_minio_client()
+        workers = _purge_workers()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifact-purge") as pool:
+            request = {"Bucket": purge.bucket_name, "Prefix": purge.prefix, "MaxKeys": DELETE_BATCH_SIZE}
+            if purge.start_after:
+                request["StartAfter"] = purge.start_after
+            while True:
+                page = client.list_objects_v2(**request)
+                keys = [obj["Key"] for obj in page.get("Contents") or [] if obj.get("Key")]
+                if keys:
+                    in_flight.append((pool.submit(_delete_batch, client, purge.bucket_name, keys), keys[-1]))
+                if len(in_flight) >= workers:
+                    in_flight[0][0].result()
+                _checkpoint(wait=False)
+                if not page.get("IsTruncated"):
+                    finished = True
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                request["ContinuationToken"] = page["NextContinuationToken"]
+                request.pop("StartAfter", None)
+            _checkpoint(wait=True)
+    except Exception as exc:
+        logger.exception("Artifact purge %s failed after %s deletions", purge.pk, purge.deleted_count)
+        purge.status = ArtifactPurge.Status.FAILED
+        purge.last_error = str(exc)[:2000]
+        purge.save(update_fields=["status", "last_error", "updated_at"])
+        return purge.status
+
+    purge.status = ArtifactPurge.Status.COMPLETED if finished else ArtifactPurge.Status.PENDING
+    purge.last_error = ""
+    purge.save(update_fields=["status", "last_error", "updated_at"])
+    return purge.status
+
+
+def artifact_purge_task(purge_id: int) -> str:
+    """django-q entry point; re-enqueues itself until the purge completes."""
+    status = run_artifact_purge(purge_id, time_budget=_time_budget())
+    if status == ArtifactPurge.Status.PENDING:
+        async_task(artifact_purge_task, purge_id)
+    return status
+
+
+def enqueue_artifact_purge(mlflow_experiment_id: str) -> ArtifactPurge | None:
+    """Record an artifact purge and start it in the background once the current transaction commits."""
+    purge = record_artifact_purge(mlflow_experiment_id)
+    if purge is not None and purge.status != ArtifactPurge.Status.COMPLETED:
+        transaction.on_commit(lambda: async_task(artifact_purge_task, purge.pk))
+    return purge
+
+
+def delete_artifacts_from_object_storage(mlflow_experiment_id: str) -> None:
+    """Purge synchronously and raise MlflowClientError unless every artifact was deleted."""
+    purge = record_artifact_purge(mlflow_experiment_id)
+    if purge is None:
+        return
+    if run_artifact_purge(purge.pk) != ArtifactPurge.Status.COMPLETED:
+        purge.refresh_from_db()
+        raise MlflowClientError(
+            f"Artifact cleanup failed for experiment {purge.mlflow_experiment_id}: {purge.last_error}"
+        )
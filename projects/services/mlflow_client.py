@@ -1,12 +1,33 @@
+import hashlib
+import logging
 import os
 import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from urllib.parse import quote
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, TypeVar
 
 import requests
-from django.conf import settings
+from django.core.cache import cache
 
 from accounts.services.tokens import get_user_access_token
+from core.services import get_client
+
+from .run_metrics import RunMetricsAggregator
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# MLflow caps runs/search pages at 1000 runs.
+RUNS_PAGE_SIZE = 1000
+
+# run_id IN (...) filters are sent as query parameters; keep them well under URL limits.
+MODEL_VERSION_SEARCH_BATCH = 50
 
 
 class MlflowClientError(Exception):
@@ -28,6 +49,11 @@ def _auth_headers(user: Any | None = None) -> dict[str, str]:
     return headers
 
 
+def mlflow_auth_headers(user: Any | None = None) -> dict[str, str]:
+    """Resolve a user's MLflow headers once, before fanning requests out to threads."""
+    return _auth_headers(user=user)
+
+
 def _service_credentials() -> tuple[str, str]:
     username = str(os.getenv("MLFLOW_TRACKING_USERNAME", "")).strip()
     password = str(os.getenv("MLFLOW_TRACKING_PASSWORD", "")).strip()
@@ -43,6 +69,7 @@ def _request(
     params: dict[str, Any] | None = None,
     user: Any | None = None,
     use_service_credentials: bool = False,
+    headers: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     url = f"{_tracking_uri()}{path}"
     request_kwargs: dict[str, Any] = {
@@ -51,14 +78,14 @@ def _request(
     if use_service_credentials:
         request_kwargs["auth"] = _service_credentials()
     else:
-        request_kwargs["headers"] = _auth_headers(user=user)
+        request_kwargs["headers"] = headers if headers is not None else _auth_headers(user=user)
     if method.upper() == "GET":
         request_kwargs["params"] = params or {}
     else:
         request_kwargs["json"] = payload or {}
 
     try:
-        response = requests.request(method, url, **request_kwargs)
+        response = get_client("mlflow").request(method, url, **request_kwargs)
     except requests.RequestException as exc:
         raise MlflowClientError(f"MLflow {method} {path} request failed: {exc}") from exc
     if response.status_code >= 400:
@@ -70,6 +97,86 @@ def _request(
     return response.json()
 
 
+def _cache_setting(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _cache_scope(user: Any | None) -> str:
+    """MLflow permissions are per user, so cached reads never cross users."""
+    user_id = getattr(user, "pk", None)
+    return f"u{user_id}" if user_id is not None else "anon"
+
+
+def _experiment_generation(experiment_id: str) -> int:
+    return cache.get(f"mlflow:gen:{experiment_id}", 0)
+
+
+def invalidate_experiment_cache(experiment_id: str) -> None:
+    """Drop every cached read for an experiment, for all users.
+
+    Bumps the experiment's generation counter, which is part of every cache
+    key. The counter lives in the default cache, so the invalidation reaches
+    other web and qcluster processes only because CACHES is shared (Redis or
+    DatabaseCache; accounts.W001 flags a per-process one). With a per-process
+    cache, other processes keep serving their entries until MLFLOW_CACHE_TTL
+    lapses and they revalidate.
+    """
+    key = f"mlflow:gen:{experiment_id}"
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def _revalidate_async(cache_key: str, fetch: Callable[[], Any]) -> None:
+    # cache.add acts as a short lock so one request refreshes a stale entry.
+    if not cache.add(f"{cache_key}:refreshing", 1, timeout=60):
+        return
+
+    def _refresh():
+        try:
+            _store_cached(cache_key, fetch())
+        except MlflowClientError as exc:
+            logger.info("MLflow revalidation of %s failed; keeping stale data: %s", cache_key, exc)
+        finally:
+            cache.delete(f"{cache_key}:refreshing")
+
+    threading.Thread(target=_refresh, name="mlflow-revalidate", daemon=True).start()
+
+
+def _store_cached(cache_key: str, value: Any) -> None:
+    ttl = _cache_setting("MLFLOW_CACHE_TTL", 60)
+    stale_ttl = _cache_setting("MLFLOW_CACHE_STALE_TTL", 3600)
+    cache.set(cache_key, {"value": value, "fresh_until": time.time() + ttl}, timeout=ttl + stale_ttl)
+
+
+def _cached_read(kind: str, experiment_id: str | None, user: Any | None, params: Any, fetch: Callable[[], T]) -> T:
+    """Read-through cache with stale-while-revalidate.
+
+    Fresh entries are returned as-is. Stale entries are returned immediately
+    while one background refresh runs, and are also served when MLflow is
+    failing. fetch must not touch the database.
+    """
+    if _cache_setting("MLFLOW_CACHE_TTL", 60) == 0:
+        return fetch()
+    digest = hashlib.sha1(repr(params).encode("utf-8")).hexdigest()[:16]
+    generation = _experiment_generation(experiment_id) if experiment_id else 0
+    cache_key = f"mlflow:{kind}:{_cache_scope(user)}:{experiment_id or '-'}:{generation}:{digest}"
+
+    entry = cache.get(cache_key)
+    if entry is not None:
+        if entry["fresh_until"] <= time.time():
+            _revalidate_async(cache_key, fetch)
+        return entry["value"]
+    value = fetch()
+    _store_cached(cache_key, value)
+    return value
+
+
 def create_experiment(name: str, tags: dict[str, str] | None = None, user: Any | None = None) -> str:
     payload: dict[str, Any] = {"name": name}
     if tags:
@@ -101,17 +208,11 @@ def set_experiment_tags(
             user=user,
             use_service_credentials=use_service_credentials,
         )
+    invalidate_experiment_cache(str(experiment_id))
 
 
 def get_experiment_tags(experiment_id: str, user: Any | None = None) -> dict[str, str]:
-    data = _request(
-        "GET",
-        "/api/2.0/mlflow/experiments/get",
-        None,
-        params={"experiment_id": str(experiment_id)},
-        user=user,
-    )
-    raw_tags = data.get("experiment", {}).get("tags", []) or []
+    raw_tags = get_experiment(experiment_id, user=user).get("tags", []) or []
     tags: dict[str, str] = {}
     for tag in raw_tags:
         key = tag.get("key")
@@ -122,14 +223,40 @@ def get_experiment_tags(experiment_id: str, user: Any | None = None) -> dict[str
 
 
 def get_experiment(experiment_id: str, user: Any | None = None) -> dict[str, Any]:
-    data = _request(
-        "GET",
-        "/api/2.0/mlflow/experiments/get",
-        None,
-        params={"experiment_id": str(experiment_id)},
-        user=user,
-    )
-    return data.get("experiment", {}) or {}
+    headers = _auth_headers(user=user)
+
+    def _fetch() -> dict[str, Any]:
+        data = _request(
+            "GET",
+            "/api/2.0/mlflow/experiments/get",
+            None,
+            params={"experiment_id": str(experiment_id)},
+            headers=headers,
+        )
+        return data.get("experiment", {}) or {}
+
+    return _cached_read("experiment", str(experiment_id), user, None, _fetch)
+
+
+def get_experiment_lifecycle_stage(experiment_id: str) -> str | None:
+    """Current lifecycle stage ("active" or "deleted") of an experiment, or None if it does not exist.
+
+    Uncached and read with service credentials, for background jobs that must
+    see the tracking server's present state.
+    """
+    try:
+        data = _request(
+            "GET",
+            "/api/2.0/mlflow/experiments/get",
+            None,
+            params={"experiment_id": str(experiment_id)},
+            use_service_credentials=True,
+        )
+    except MlflowClientError as exc:
+        if "RESOURCE_DOES_NOT_EXIST" in str(exc):
+            return None
+        raise
+    return (data.get("experiment") or {}).get("lifecycle_stage") or "active"
 
 
 def delete_experiment(experiment_id: str, user: Any | None = None) -> None:
@@ -140,6 +267,7 @@ def delete_experiment(experiment_id: str, user: Any | None = None) -> None:
         user=user,
         use_service_credentials=True,
     )
+    invalidate_experiment_cache(str(experiment_id))
 
 
 def update_experiment_name(experiment_id: str, new_name: str, user: Any | None = None) -> None:
@@ -150,6 +278,7 @@ def update_experiment_name(experiment_id: str, new_name: str, user: Any | None =
         user=user,
         use_service_credentials=True,
     )
+    invalidate_experiment_cache(str(experiment_id))
 
 
 def create_experiment_permission(
@@ -165,18 +294,111 @@ def create_experiment_permission(
         {"permission": str(permission)},
         use_service_credentials=True,
     )
+    invalidate_experiment_cache(str(experiment_id))
 
 
-def list_experiment_runs(
-    experiment_id: str, max_results: int = 25, user: Any | None = None
-) -> list[dict[str, Any]]:
-    payload = {
+def _max_concurrency() -> int:
+    try:
+        return max(1, int(os.getenv("MLFLOW_MAX_CONCURRENCY", "8")))
+    except ValueError:
+        return 8
+
+
+def map_concurrently(func: Callable[[T], R], items: Iterable[T], max_workers: int | None = None) -> list[R]:
+    """Apply func to every item on a bounded thread pool, preserving order.
+
+    The first exception raised by any call is re-raised once all calls have
+    finished. func must not touch the database: resolve users and tokens
+    before fanning out.
+    """
+    items = list(items)
+    workers = min(max_workers or _max_concurrency(), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mlflow") as pool:
+        futures = [pool.submit(func, item) for item in items]
+    return [future.result() for future in futures]
+
+
+def iter_experiment_runs(
+    experiment_id: str,
+    user: Any | None = None,
+    headers: dict[str, str] | None = None,
+    order_by: Iterable[str] = ("attributes.start_time ASC", "attributes.end_time ASC"),
+    page_size: int = RUNS_PAGE_SIZE,
+    filter_string: str = "",
+    use_service_credentials: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Yield every run of an experiment, following next_page_token one page at a time."""
+    if headers is None and not use_service_credentials:
+        headers = _auth_headers(user=user)
+    payload: dict[str, Any] = {
         "experiment_ids": [str(experiment_id)],
-        "max_results": max_results,
-        "order_by": ["attributes.start_time DESC"],
+        "max_results": page_size,
+        "order_by": list(order_by),
     }
-    data = _request("POST", "/api/2.0/mlflow/runs/search", payload, user=user)
-    return data.get("runs", []) or []
+    if filter_string:
+        payload["filter"] = filter_string
+    while True:
+        data = _request(
+            "POST",
+            "/api/2.0/mlflow/runs/search",
+            payload,
+            headers=headers,
+            use_service_credentials=use_service_credentials,
+        )
+        yield from data.get("runs", []) or []
+        page_token = data.get("next_page_token")
+        if not page_token:
+            return
+        payload = {**payload, "page_token": page_token}
+
+
+def list_experiment_runs(
+    experiment_id: str,
+    max_results: int = 25,
+    user: Any | None = None,
+    headers: dict[str, str] | None = None,
+) -> list[dict[str, Any]]:
+    """Newest runs first, up to max_results, paging through MLflow as needed."""
+    if headers is None:
+        headers = _auth_headers(user=user)
+
+    def _fetch() -> list[dict[str, Any]]:
+        runs = iter_experiment_runs(
+            experiment_id,
+            headers=headers,
+            order_by=("attributes.start_time DESC",),
+            page_size=min(max_results, RUNS_PAGE_SIZE),
+        )
+        return list(islice(runs, max_results))
+
+    return _cached_read("runs", str(experiment_id), user, max_results, _fetch)
+
+
+def summarize_experiment_runs(
+    experiment_ids: Iterable[str], user: Any | None = None, higher_is_better: frozenset[str] = frozenset()
+) -> dict[str, dict[str, Any]]:
+    """RunMetricsAggregator summaries for several experiments, keyed by experiment id.
+
+    Experiments are streamed in parallel and each summary is cached on its own,
+    so memory grows with the compact per-run rows rather than raw run payloads.
+    """
+    experiment_ids = list(dict.fromkeys(str(experiment_id) for experiment_id in experiment_ids))
+    headers = _auth_headers(user=user)
+
+    def _summarize(experiment_id: str) -> dict[str, Any]:
+        return _cached_read(
+            "run-summary",
+            experiment_id,
+            user,
+            sorted(higher_is_better),
+            lambda: RunMetricsAggregator(higher_is_better)
+            .extend(iter_experiment_runs(experiment_id, headers=headers))
+            .summary(),
+        )
+
+    return dict(zip(experiment_ids, map_concurrently(_summarize, experiment_ids)))
 
 
 def list_run_artifacts(run_id: str, path: str = "", user: Any | None = None) -> list[dict[str, Any]]:
@@ -201,17 +423,89 @@ def get_run(run_id: str, user: Any | None = None) -> dict[str, Any]:
     return data.get("run", {}) or {}
 
 
-def list_registered_model_versions_for_run(run_id: str, user: Any | None = None) -> list[dict[str, Any]]:
+def list_registered_model_versions_for_run(
+    run_id: str,
+    user: Any | None = None,
+    headers: dict[str, str] | None = None,
+    use_service_credentials: bool = False,
+) -> list[dict[str, Any]]:
     data = _request(
         "GET",
         "/api/2.0/mlflow/model-versions/search",
         None,
         params={"filter": f"run_id='{str(run_id)}'"},
         user=user,
+        headers=headers,
+        use_service_credentials=use_service_credentials,
     )
     return data.get("model_versions", []) or []
 
 
+def _search_model_versions_batch(
+    run_ids: list[str], headers: dict[str, str] | None, use_service_credentials: bool = False
+) -> list[dict[str, Any]]:
+    quoted = ",".join(f"'{run_id}'" for run_id in run_ids)
+    params: dict[str, Any] = {"filter": f"run_id IN ({quoted})"}
+    versions: list[dict[str, Any]] = []
+    while True:
+        data = _request(
+            "GET",
+            "/api/2.0/mlflow/model-versions/search",
+            None,
+            params=params,
+            headers=headers,
+            use_service_credentials=use_service_credentials,
+        )
+        versions.extend(data.get("model_versions", []) or [])
+        page_token = data.get("next_page_token")
+        if not page_token:
+            return versions
+        params = {**params, "page_token": page_token}
+
+
+def list_registered_model_versions_for_runs(
+    run_ids: Iterable[str], user: Any | None = None, use_service_credentials: bool = False
+) -> dict[str, list[dict[str, Any]]]:
+    """Registered model versions for many runs, keyed by run id.
+
+    Uses one run_id IN (...) search per MODEL_VERSION_SEARCH_BATCH runs, sent
+    in parallel. Tracking servers that reject IN filters fall back to
+    concurrent per-run searches. Service-credential reads are not cached.
+    """
+    run_ids = list(dict.fromkeys(str(run_id) for run_id in run_ids if run_id))
+    if not run_ids:
+        return {}
+    headers = None if use_service_credentials else _auth_headers(user=user)
+
+    def _fetch() -> dict[str, list[dict[str, Any]]]:
+        by_run: dict[str, list[dict[str, Any]]] = {run_id: [] for run_id in run_ids}
+        batches = [
+            run_ids[i:i + MODEL_VERSION_SEARCH_BATCH] for i in range(0, len(run_ids), MODEL_VERSION_SEARCH_BATCH)
+        ]
+        try:
+            for versions in map_concurrently(
+                lambda batch: _search_model_versions_batch(batch, headers, use_service_credentials), batches
+            ):
+                for version in versions:
+                    run_id = str(version.get("run_id") or "")
+                    if run_id in by_run:
+                        by_run[run_id].append(version)
+        except MlflowClientError:
+            results = map_concurrently(
+                lambda run_id: list_registered_model_versions_for_run(
+                    run_id, headers=headers, use_service_credentials=use_service_credentials
+                ),
+                run_ids,
+            )
+            by_run = dict(zip(run_ids, results))
+        return by_run
+
+    if use_service_credentials:
+        return _fetch()
+    # Versions are registered outside this app, so these entries rely on the TTL alone.
+    return _cached_read("model-versions", None, user, sorted(run_ids), _fetch)
+
+
 def make_registered_model_links(name: str, version: str | int | None = None) -> dict[str, str]:
     base = _tracking_uri()
     encoded_name = quote(str(name), safe="")
@@ -224,63 +518,6 @@ def make_registered_model_links(name: str, version: str | int | None = None) ->
     }
 
 
-def _setting(primary: str, fallback: str = "", default: Any = None) -> Any:
-    if hasattr(settings, primary):
-        return getattr(settings, primary)
-    if fallback and hasattr(settings, fallback):
-        return getattr(settings, fallback)
-    return default
-
-def delete_artifacts_from_object_storage(experiment_id: str) -> None:
-    experiment = str(experiment_id or "").strip().strip("/")
-    if not experiment:
-        return
-
-    access_key = getattr(settings, "OBJECT_STORAGE_ACCESS_KEY", "") or getattr(settings, "MINIO_ACCESS_KEY", "")
-    secret_key = getattr(settings, "OBJECT_STORAGE_SECRET_KEY", "") or getattr(settings, "MINIO_SECRET_KEY", "")
-    endpoint = getattr(settings, "OBJECT_STORAGE_ENDPOINT", None) or getattr(settings, "MINIO_ENDPOINT", None)
-    verify_ssl = getattr(settings, "OBJECT_STORAGE_VERIFY_SSL", None)
-    if verify_ssl is None:
-        verify_ssl = getattr(settings, "MINIO_VERIFY_SSL", True)
-
-    if not access_key or not secret_key:
-        raise MlflowClientError("Object storage credentials are missing.")
-
-    try:
-        import boto3
-
-        client = boto3.client(
-            "s3",
-            endpoint_url=endpoint,
-            aws_access_key_id=access_key,
-            aws_secret_access_key=secret_key,
-            verify=verify_ssl,
-        )
-
-        bucket_name = "mlflow-bucket"
-        prefix = f"{experiment}/"
-        continuation_token = None
-        while True:
-            request = {"Bucket": bucket_name, "Prefix": prefix}
-            if continuation_token:
-                request["ContinuationToken"] = continuation_token
-
-            page = client.list_objects_v2(**request)
-            contents = page.get("Contents") or []
-            for start in range(0, len(contents), 1000):
-                batch = contents[start : start + 1000]
-                keys = [{"Key": obj["Key"]} for obj in batch if obj.get("Key")]
-                print("keys", keys)
-                if keys:
-                    client.delete_objects(Bucket=bucket_name, Delete={"Objects": keys})
-
-            if not page.get("IsTruncated"):
-                break
-            continuation_token = page.get("NextContinuationToken")
-    except Exception as exc:
-        raise MlflowClientError(f"Artifact cleanup failed for experiment {experiment}: {exc}") from exc
-
-
 def make_deleted_experiment_name() -> str:
     return f"deleted-{secrets.token_hex(8)}"
 
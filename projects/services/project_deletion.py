@@ -0,0 +1,153 @@
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.db import transaction
+from django.utils import timezone
+from django_q.tasks import async_task
+
+from ..models import Experiment, Project
+from .artifact_purge import enqueue_artifact_purge
+from .mlflow_client import (
+    MlflowClientError,
+    delete_experiment,
+    get_experiment_lifecycle_stage,
+    make_deleted_experiment_name,
+    map_concurrently,
+    update_experiment_name,
+)
+
+__all__ = [
+    "project_deletion_progress",
+    "project_deletion_task",
+    "request_project_deletion",
+    "run_project_deletion",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def _deletion_retries() -> int:
+    try:
+        return max(1, int(os.getenv("PROJECT_DELETION_RETRIES", "3")))
+    except ValueError:
+        return 3
+
+
+def _deletion_stale_after() -> int:
+    try:
+        return max(60, int(os.getenv("PROJECT_DELETION_STALE_SECONDS", "3600")))
+    except ValueError:
+        return 3600
+
+
+def _deletion_is_stale(project: Project) -> bool:
+    """A deletion still marked in progress long after it was queued lost its task."""
+    requested_at = project.deletion_requested_at
+    return requested_at is None or timezone.now() - requested_at >= timedelta(seconds=_deletion_stale_after())
+
+
+def _retire_mlflow_experiment(mlflow_experiment_id: str) -> str:
+    """Rename and delete one MLflow experiment, retrying with backoff.
+
+    Idempotent: an experiment already deleted (or gone) in MLflow, e.g. by a
+    run that crashed before its local cleanup, counts as retired. Runs on
+    worker threads, so it only talks to MLflow (with service credentials) and
+    never to the database. Returns an error message, or "" on success.
+    """
+    if not mlflow_experiment_id:
+        return ""
+    attempts = _deletion_retries()
+    for attempt in range(1, attempts + 1):
+        try:
+            if get_experiment_lifecycle_stage(mlflow_experiment_id) in (None, "deleted"):
+                return ""
+            update_experiment_name(mlflow_experiment_id, make_deleted_experiment_name())
+            delete_experiment(mlflow_experiment_id)
+            return ""
+        except MlflowClientError as exc:
+            if attempt == attempts:
+                return str(exc)
+            time.sleep(0.5 * 2 ** (attempt - 1))
+    return ""
+
+
+def request_project_deletion(project_id: int) -> Project:
+    """Tombstone a project and schedule its deletion after the transaction commits.
+
+    A project already being deleted is only re-queued once its deletion has
+    gone stale (PROJECT_DELETION_STALE_SECONDS), e.g. after a worker crash.
+    Raises DatabaseError if another request holds the project row.
+    """
+    with transaction.atomic():
+        project = Project.objects.select_for_update(nowait=True).get(pk=project_id)
+        if project.deletion_status != Project.DeletionStatus.DELETING or _deletion_is_stale(project):
+            project.deletion_status = Project.DeletionStatus.DELETING
+            project.deletion_requested_at = timezone.now()
+            project.deletion_total = project.experiments.count()
+            project.deletion_error = ""
+            project.save(
+                update_fields=[
+                    "deletion_status", "deletion_requested_at", "deletion_total", "deletion_error", "updated_at",
+                ]
+            )
+            transaction.on_commit(lambda: async_task(project_deletion_task, project.pk))
+    return project
+
+
+def run_project_deletion(project_id: int) -> str:
+    """Delete a tombstoned project's experiments concurrently, then the project.
+
+    MLflow experiments are retired in parallel; each experiment whose MLflow
+    side succeeded is deleted locally right away and its artifacts queued for
+    purging, so a rerun only revisits the ones that failed. The project row is
+    deleted last. Returns "deleted", or the project's deletion status.
+    """
+    try:
+        project = Project.objects.get(pk=project_id)
+    except Project.DoesNotExist:
+        return "deleted"
+    if project.deletion_status == Project.DeletionStatus.ACTIVE:
+        return project.deletion_status
+
+    experiments = list(Experiment.objects.filter(project_id=project.pk).order_by("id"))
+    outcomes = map_concurrently(_retire_mlflow_experiment, [e.mlflow_experiment_id for e in experiments])
+
+    errors: list[str] = []
+    for experiment, error in zip(experiments, outcomes):
+        if error:
+            errors.append(f"{experiment}: {error}")
+            continue
+        with transaction.atomic():
+            experiment.delete()
+            enqueue_artifact_purge(experiment.mlflow_experiment_id)
+
+    if errors:
+        logger.error("Project %s deletion stopped: %s experiment(s) failed", project.pk, len(errors))
+        project.deletion_status = Project.DeletionStatus.FAILED
+        project.deletion_error = "\n".join(errors)[:2000]
+        project.save(update_fields=["deletion_status", "deletion_error", "updated_at"])
+        return project.deletion_status
+
+    project.delete()
+    return "deleted"
+
+
+def project_deletion_task(project_id: int) -> str:
+    """django-q entry point for run_project_deletion."""
+    return run_project_deletion(project_id)
+
+
+def project_deletion_progress(project: Project) -> dict[str, Any]:
+    remaining = project.experiments.count()
+    total = max(project.deletion_total, remaining)
+    return {
+        "id": project.pk,
+        "name": project.name,
+        "status": project.deletion_status,
+        "total_experiments": total,
+        "deleted_experiments": total - remaining,
+        "error": project.deletion_error,
+    }
@@ -0,0 +1,78 @@
+import bisect
+from typing import Any, Iterable
+
+__all__ = [
+    "RunMetricsAggregator",
+    "is_better",
+]
+
+
+def is_better(metric_name: str, candidate: float, current: float, higher_is_better: frozenset[str]) -> bool:
+    if metric_name in higher_is_better:
+        return candidate > current
+    return candidate < current
+
+
+def _chronological_key(row: dict[str, Any]) -> tuple[int, int]:
+    return row.get("start_time") or 0, row.get("end_time") or 0
+
+
+class RunMetricsAggregator:
+    """Single-pass summary of an experiment's MLflow runs.
+
+    Feed runs in any order; runs/search pages ordered by start time ASC are
+    appended directly. Only a compact row per run is kept, never the raw
+    run payload. Metrics in higher_is_better keep their maximum as best,
+    all others their minimum.
+    """
+
+    def __init__(self, higher_is_better: frozenset[str] = frozenset()):
+        self.higher_is_better = higher_is_better
+        self.latest_run_metrics: dict[str, Any] = {}
+        self.best_metrics: dict[str, dict[str, Any]] = {}
+        self.chronological: list[dict[str, Any]] = []
+        self._keys: list[tuple[int, int]] = []
+
+    def add(self, run: dict[str, Any]) -> None:
+        info = run.get("info", {})
+        data = run.get("data", {})
+        run_id = info.get("run_id")
+        metrics = {m.get("key"): m.get("value") for m in data.get("metrics", []) if m.get("key")}
+        row = {
+            "run_id": run_id,
+            "status": info.get("status"),
+            "start_time": info.get("start_time"),
+            "end_time": info.get("end_time"),
+            "metrics": metrics,
+        }
+
+        key = _chronological_key(row)
+        if not self.latest_run_metrics or key >= _chronological_key(self.latest_run_metrics):
+            self.latest_run_metrics = row
+
+        position = bisect.bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self.chronological.insert(position, {"run_id": run_id, "metrics": metrics})
+
+        for metric_name, metric_value in metrics.items():
+            try:
+                numeric_value = float(metric_value)
+            except (TypeError, ValueError):
+                continue
+            current_best = self.best_metrics.get(metric_name)
+            if current_best is None or is_better(
+                metric_name, numeric_value, current_best["value"], self.higher_is_better
+            ):
+                self.best_metrics[metric_name] = {"value": numeric_value, "run_id": run_id}
+
+    def extend(self, runs: Iterable[dict[str, Any]]) -> "RunMetricsAggregator":
+        for run in runs:
+            self.add(run)
+        return self
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "latest_run_metrics": self.latest_run_metrics,
+            "best_metrics": self.best_metrics,
+            "all_run_metrics_chronological": self.chronological,
+        }
@@ -0,0 +1,214 @@
+import logging
+import math
+from itertools import batched
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from ..models import Experiment, MetricDirection, MlflowModelVersion, MlflowRun, MlflowRunMetric, MlflowSyncState
+from .mlflow_client import MlflowClientError, iter_experiment_runs, list_registered_model_versions_for_runs
+
+__all__ = [
+    "higher_is_better_metrics",
+    "metric_leaderboard",
+    "mirrored_model_versions",
+    "mirrored_runs",
+    "sync_all_experiments",
+    "sync_experiment_runs",
+]
+
+logger = logging.getLogger(__name__)
+
+SYNC_BATCH_SIZE = 500
+UNFINISHED_STATUSES = ("RUNNING", "SCHEDULED")
+
+
+def higher_is_better_metrics() -> frozenset[str]:
+    return frozenset(MetricDirection.objects.filter(higher_is_better=True).values_list("key", flat=True))
+
+
+def _metric_rows(run: dict[str, Any]) -> list[tuple[str, float]]:
+    rows = []
+    for metric in (run.get("data") or {}).get("metrics", []) or []:
+        key = metric.get("key")
+        try:
+            value = float(metric.get("value"))
+        except (TypeError, ValueError):
+            continue
+        if key and math.isfinite(value):
+            rows.append((key, value))
+    return rows
+
+
+@transaction.atomic
+def _upsert_runs(experiment: Experiment, runs: list[dict[str, Any]]) -> dict[str, int]:
+    mirrored = [
+        MlflowRun(
+            experiment=experiment,
+            run_id=info["run_id"],
+            status=info.get("status") or "",
+            start_time=info.get("start_time"),
+            end_time=info.get("end_time"),
+        )
+        for info in ((run.get("info") or {}) for run in runs)
+        if info.get("run_id")
+    ]
+    MlflowRun.objects.bulk_create(
+        mirrored,
+        update_conflicts=True,
+        unique_fields=["run_id"],
+        update_fields=["experiment", "status", "start_time", "end_time", "updated_at"],
+    )
+    pks = dict(MlflowRun.objects.filter(run_id__in=[run.run_id for run in mirrored]).values_list("run_id", "pk"))
+    MlflowRunMetric.objects.filter(run_id__in=pks.values()).delete()
+    MlflowRunMetric.objects.bulk_create(
+        [
+            MlflowRunMetric(run_id=pks[run["info"]["run_id"]], experiment=experiment, key=key, value=value)
+            for run in runs
+            if (run.get("info") or {}).get("run_id") in pks
+            for key, value in _metric_rows(run)
+        ],
+        batch_size=1000,
+    )
+    return pks
+
+
+def _upsert_model_versions(run_pks: dict[str, int]) -> None:
+    """Replace the mirrored model versions of these runs with MLflow's current ones."""
+    versions_by_run = list_registered_model_versions_for_runs(run_pks, use_service_credentials=True)
+    with transaction.atomic():
+        MlflowModelVersion.objects.filter(run_id__in=run_pks.values()).delete()
+        MlflowModelVersion.objects.bulk_create(
+            [
+                MlflowModelVersion(
+                    run_id=run_pks[run_id],
+                    name=str(version.get("name") or ""),
+                    version=str(version.get("version") or ""),
+                    source=version.get("source") or "",
+                )
+                for run_id, versions in versions_by_run.items()
+                for version in versions
+                if version.get("name") and run_id in run_pks
+            ],
+            update_conflicts=True,
+            unique_fields=["name", "version"],
+            update_fields=["run", "source"],
+        )
+
+
+def sync_experiment_runs(experiment: Experiment, full: bool = False) -> int:
+    """Mirror an experiment's MLflow runs, metrics and model versions locally.
+
+    Incremental syncs only fetch runs starting at or after the stored
+    watermark. The watermark stops at the oldest run still in progress, so
+    unfinished runs are re-read until they finish. Model versions are
+    refreshed for every mirrored run on each sync. A full sync also drops
+    mirrored runs that no longer exist in MLflow. Returns the number of runs read.
+    """
+    state, _ = MlflowSyncState.objects.get_or_create(experiment=experiment)
+    watermark = None if full else state.watermark
+    runs = iter_experiment_runs(
+        experiment.mlflow_experiment_id,
+        filter_string=f"attributes.start_time >= {int(watermark)}" if watermark is not None else "",
+        use_service_credentials=True,
+    )
+
+    seen: dict[str, int] = {}
+    try:
+        for page in batched(runs, SYNC_BATCH_SIZE):
+            seen.update(_upsert_runs(experiment, list(page)))
+        if full:
+            experiment.mlflow_runs.exclude(run_id__in=seen).delete()
+        # Versions can be registered against (or removed from) runs of any age,
+        # so every mirrored run is re-checked, not only the ones read above.
+        mirrored_pks = dict(experiment.mlflow_runs.values_list("run_id", "pk"))
+        if mirrored_pks:
+            _upsert_model_versions(mirrored_pks)
+    except MlflowClientError as exc:
+        state.last_error = str(exc)[:2000]
+        state.save(update_fields=["last_error"])
+        raise
+
+    mirrored = experiment.mlflow_runs.filter(start_time__isnull=False)
+    unfinished = mirrored.filter(status__in=UNFINISHED_STATUSES).aggregate(start=Min("start_time"))["start"]
+    newest = mirrored.aggregate(start=Max("start_time"))["start"]
+    state.watermark = unfinished if unfinished is not None else newest
+    state.synced_at = timezone.now()
+    state.last_error = ""
+    state.save(update_fields=["watermark", "synced_at", "last_error"])
+    return len(seen)
+
+
+def sync_all_experiments(full: bool = False) -> dict[str, int]:
+    """Sync every experiment linked to MLflow; safe to schedule as a django-q task."""
+    synced = failed = 0
+    for experiment in Experiment.objects.exclude(mlflow_experiment_id="").order_by("pk"):
+        try:
+            sync_experiment_runs(experiment, full=full)
+            synced += 1
+        except MlflowClientError:
+            logger.exception("MLflow mirror sync failed for experiment %s", experiment.pk)
+            failed += 1
+    return {"synced": synced, "failed": failed}
+
+
+def metric_leaderboard(project_id: int, key: str, limit: int = 10) -> list[dict[str, Any]]:
+    """Best mirrored runs of a project for one metric, honouring its direction."""
+    higher_is_better = MetricDirection.objects.filter(key=key, higher_is_better=True).exists()
+    rows = (
+        MlflowRunMetric.objects
+        .filter(experiment__project_id=project_id, key=key)
+        .order_by("-value" if higher_is_better else "value", "run__start_time")
+        .values("value", "run__run_id", "run__start_time", "experiment_id", "experiment__name")[:limit]
+    )
+    return [
+        {
+            "value": row["value"],
+            "run_id": row["run__run_id"],
+            "start_time": row["run__start_time"],
+            "experiment_id": row["experiment_id"],
+            "experiment_name": row["experiment__name"],
+        }
+        for row in rows
+    ]
+
+
+def mirrored_runs(experiment_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+    """Mirrored runs of experiments in the runs/search payload shape, oldest first."""
+    runs: dict[int, dict[int, dict[str, Any]]] = {experiment_id: {} for experiment_id in experiment_ids}
+    for run in MlflowRun.objects.filter(experiment_id__in=experiment_ids).order_by("start_time", "pk"):
+        runs[run.experiment_id][run.pk] = {
+            "info": {
+                "run_id": run.run_id,
+                "status": run.status,
+                "start_time": run.start_time,
+                "end_time": run.end_time,
+            },
+            "data": {"metrics": []},
+        }
+    metrics = MlflowRunMetric.objects.filter(experiment_id__in=experiment_ids).values_list(
+        "experiment_id", "run_id", "key", "value"
+    )
+    for experiment_id, run_pk, key, value in metrics:
+        run = runs[experiment_id].get(run_pk)
+        if run is not None:
+            run["data"]["metrics"].append({"key": key, "value": value})
+    return {experiment_id: list(by_pk.values()) for experiment_id, by_pk in runs.items()}
+
+
+def mirrored_model_versions(experiment_ids: list[int]) -> dict[str, list[dict[str, Any]]]:
+    """Mirrored registered model versions of experiments, keyed by MLflow run id."""
+    versions_by_run: dict[str, list[dict[str, Any]]] = {}
+    rows = (
+        MlflowModelVersion.objects
+        .filter(run__experiment_id__in=experiment_ids)
+        .order_by("run__start_time", "name", "version")
+        .values("name", "version", "source", "run__run_id")
+    )
+    for row in rows:
+        versions_by_run.setdefault(row["run__run_id"], []).append(
+            {"name": row["name"], "version": row["version"], "source": row["source"], "run_id": row["run__run_id"]}
+        )
+    return versions_by_run
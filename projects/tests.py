@@ -1,3 +1,582 @@
-from django.test import TestCase
+import io
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from projects.models import ArtifactPurge, Experiment, MetricDirection, MlflowModelVersion, MlflowRun, MlflowSyncState, Project
+from projects.services import (
+    MlflowClientError,
+    RunMetricsAggregator,
+    enqueue_artifact_purge,
+    get_experiment_tags,
+    iter_experiment_runs,
+    list_experiment_runs,
+    list_registered_model_versions_for_runs,
+    map_concurrently,
+    project_deletion_progress,
+    run_artifact_purge,
+    run_project_deletion,
+    set_experiment_tags,
+    sync_experiment_runs,
+)
+
+User = get_user_model()
+
+
+def _run(run_id, start_time, status="FINISHED", **metrics):
+    return {
+        "info": {"run_id": run_id, "status": status, "start_time": start_time, "end_time": start_time + 1},
+        "data": {"metrics": [{"key": key, "value": value} for key, value in metrics.items()]},
+    }
+
+
+class FakeMlflow:
+    """Stands in for mlflow_client._request and records every call."""
+
+    def __init__(self, runs_by_experiment, versions, reject_in_filter=False):
+        self.runs_by_experiment = runs_by_experiment
+        self.versions = versions
+        self.reject_in_filter = reject_in_filter
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, method, path, payload=None, params=None, **kwargs):
+        with self._lock:
+            self.calls.append((path, payload, params))
+        if path == "/api/2.0/mlflow/runs/search":
+            runs = self.runs_by_experiment.get(payload["experiment_ids"][0], [])
+            if payload.get("filter"):
+                since = int(payload["filter"].rsplit(">=", 1)[1])
+                runs = [run for run in runs if run["info"]["start_time"] >= since]
+            offset = int(payload.get("page_token") or 0)
+            page = runs[offset:offset + payload["max_results"]]
+            if offset + payload["max_results"] < len(runs):
+                return {"runs": page, "next_page_token": str(offset + payload["max_results"])}
+            return {"runs": page}
+        if path == "/api/2.0/mlflow/model-versions/search":
+            run_filter = params["filter"]
+            if " IN " in run_filter and self.reject_in_filter:
+                raise MlflowClientError("INVALID_PARAMETER_VALUE")
+            return {"model_versions": [v for v in self.versions if f"'{v['run_id']}'" in run_filter]}
+        raise AssertionError(f"unexpected MLflow call {path}")
+
+    def paths(self, path):
+        return [call for call in self.calls if call[0] == path]
+
+
+class MapConcurrentlyTests(TestCase):
+
+    def test_preserves_order_and_reraises(self):
+        self.assertEqual(map_concurrently(lambda x: x * 2, range(20), max_workers=4), list(range(0, 40, 2)))
+
+        def _fail(x):
+            if x == 3:
+                raise MlflowClientError("boom")
+            return x
+
+        with self.assertRaises(MlflowClientError):
+            map_concurrently(_fail, range(6), max_workers=3)
+
+
+class RunPaginationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.fake = FakeMlflow({"11": [_run(f"r{i}", i, loss=i) for i in range(7)]}, [])
+
+    def test_iterator_follows_page_tokens(self):
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            run_ids = [run["info"]["run_id"] for run in iter_experiment_runs("11", page_size=3)]
+
+        self.assertEqual(run_ids, [f"r{i}" for i in range(7)])
+        self.assertEqual([c[1].get("page_token") for c in self.fake.calls], [None, "3", "6"])
+
+    def test_list_stops_at_max_results(self):
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            runs = list_experiment_runs("11", max_results=5)
+
+        self.assertEqual(len(runs), 5)
+        self.assertEqual(len(self.fake.calls), 1)
+
+    def test_aggregator_orders_runs_arriving_out_of_order(self):
+        summary = RunMetricsAggregator().extend(
+            [_run("b", 200, loss=0.4), _run("a", 100, loss=0.2), _run("c", 300, loss="nan?")]
+        ).summary()
+
+        self.assertEqual([row["run_id"] for row in summary["all_run_metrics_chronological"]], ["a", "b", "c"])
+        self.assertEqual(summary["latest_run_metrics"]["run_id"], "c")
+        self.assertEqual(summary["best_metrics"]["loss"], {"value": 0.2, "run_id": "a"})
+
+
+class ModelVersionBatchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.versions = [
+            {"name": "forecaster", "version": "1", "run_id": "r1"},
+            {"name": "forecaster", "version": "2", "run_id": "r3"},
+        ]
+
+    def test_single_in_filter_search(self):
+        fake = FakeMlflow({}, self.versions)
+        with patch("projects.services.mlflow_client._request", side_effect=fake):
+            by_run = list_registered_model_versions_for_runs(["r1", "r2", "r3", "r1"])
+
+        searches = fake.paths("/api/2.0/mlflow/model-versions/search")
+        self.assertEqual(len(searches), 1)
+        self.assertEqual(searches[0][2]["filter"], "run_id IN ('r1','r2','r3')")
+        self.assertEqual({run_id: [v["version"] for v in vs] for run_id, vs in by_run.items()},
+                         {"r1": ["1"], "r2": [], "r3": ["2"]})
+
+    def test_falls_back_to_per_run_search(self):
+        fake = FakeMlflow({}, self.versions, reject_in_filter=True)
+        with patch("projects.services.mlflow_client._request", side_effect=fake):
+            by_run = list_registered_model_versions_for_runs(["r1", "r2", "r3"])
+
+        self.assertEqual(len(fake.paths("/api/2.0/mlflow/model-versions/search")), 4)
+        self.assertEqual(by_run["r3"][0]["version"], "2")
+
+
+class EvalResultsAllTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="pass")
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.project = Project.objects.create(name="Forecasting", creator=self.user)
+        Experiment.objects.create(project=self.project, creator=self.user, name="a", mlflow_experiment_id="11")
+        Experiment.objects.create(project=self.project, creator=self.user, name="b", mlflow_experiment_id="12")
+        Experiment.objects.create(project=self.project, creator=self.user, name="draft")
+
+    def test_fetches_runs_per_experiment_and_versions_once(self):
+        fake = FakeMlflow(
+            {"11": [_run("r2", 200, loss=0.2), _run("r1", 100, loss=0.5)], "12": [_run("r3", 300, loss=0.3)]},
+            [{"name": "forecaster", "version": "4", "run_id": "r2"}],
+        )
+        with patch("projects.services.mlflow_client._request", side_effect=fake):
+            response = self.client.get(reverse("eval_results_all", args=[self.project.id]))
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(len(fake.paths("/api/2.0/mlflow/runs/search")), 2)
+        self.assertEqual(len(fake.paths("/api/2.0/mlflow/model-versions/search")), 1)
+        self.assertEqual(body["latest_run_metrics"]["run_id"], "r3")
+        self.assertEqual(body["best_metrics"]["loss"]["run_id"], "r2")
+        self.assertEqual([m["version"] for m in body["registered_models"]], ["4"])
+        self.assertEqual(body["registered_models"][0]["experiment_name"], "a")
+
+
+class MlflowReadCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username="reader", email="reader@example.com", password="pass")
+        self.other = User.objects.create_user(username="other", email="other@example.com", password="pass")
+        self.fake = FakeMlflow({"11": [_run("r1", 100, loss=0.5)]}, [])
+
+    def _run_searches(self):
+        return len(self.fake.paths("/api/2.0/mlflow/runs/search"))
+
+    def test_runs_are_cached_per_user(self):
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            list_experiment_runs("11", user=self.user)
+            list_experiment_runs("11", user=self.user)
+            list_experiment_runs("11", user=self.other)
+
+        self.assertEqual(self._run_searches(), 2)
+
+    def test_stale_entry_is_served_while_revalidating(self):
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            list_experiment_runs("11", user=self.user)
+        self.fake.runs_by_experiment["11"] = [_run("r2", 200)]
+
+        with patch("projects.services.mlflow_client.time", MagicMock(time=lambda: 10 ** 12)), \
+                patch("projects.services.mlflow_client._revalidate_async") as mock_revalidate:
+            runs = list_experiment_runs("11", user=self.user)
+
+        self.assertEqual(runs[0]["info"]["run_id"], "r1")
+        mock_revalidate.assert_called_once()
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            mock_revalidate.call_args.args[1]()
+        self.assertEqual(self._run_searches(), 2)
+
+    def test_stale_entry_survives_failed_revalidation(self):
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            list_experiment_runs("11", user=self.user)
+
+        def _sync_thread(target, **kwargs):
+            target()
+            return MagicMock()
+
+        with patch("projects.services.mlflow_client.time", MagicMock(time=lambda: 10 ** 12)), \
+                patch("projects.services.mlflow_client._request", side_effect=MlflowClientError("down")), \
+                patch("projects.services.mlflow_client.threading.Thread", side_effect=_sync_thread):
+            runs = list_experiment_runs("11", user=self.user)
+            again = list_experiment_runs("11", user=self.user)
+
+        self.assertEqual(runs, again)
+        self.assertEqual(runs[0]["info"]["run_id"], "r1")
+
+    def test_wrapper_writes_invalidate_experiment(self):
+        experiment = {"experiment": {"experiment_id": "11", "tags": [{"key": "stage", "value": "dev"}]}}
+        with patch("projects.services.mlflow_client._request", return_value=experiment) as mock_request:
+            self.assertEqual(get_experiment_tags("11", user=self.user), {"stage": "dev"})
+            self.assertEqual(get_experiment_tags("11", user=self.user), {"stage": "dev"})
+            set_experiment_tags("11", {"stage": "prod"}, user=self.user)
+            get_experiment_tags("11", user=self.user)
+
+        gets = [c for c in mock_request.call_args_list if c.args[1] == "/api/2.0/mlflow/experiments/get"]
+        self.assertEqual(len(gets), 2)
+
+
+class MlflowMirrorTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username="mirror", email="mirror@example.com", password="pass")
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.project = Project.objects.create(name="Mirror", creator=self.user)
+        self.experiment = Experiment.objects.create(
+            project=self.project, creator=self.user, name="a", mlflow_experiment_id="11"
+        )
+        self.fake = FakeMlflow(
+            {"11": [
+                _run("r1", 100, loss=0.5, accuracy=0.70),
+                _run("r2", 200, loss=0.2, accuracy=0.90),
+                _run("r3", 300, status="RUNNING", loss=0.4, accuracy=0.80),
+            ]},
+            [{"name": "forecaster", "version": "1", "run_id": "r2", "source": "s3://m/1"}],
+        )
+
+    def _sync(self, **kwargs):
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            return sync_experiment_runs(self.experiment, **kwargs)
+
+    def test_sync_mirrors_runs_metrics_and_versions(self):
+        self.assertEqual(self._sync(), 3)
+
+        self.assertEqual(MlflowRun.objects.filter(experiment=self.experiment).count(), 3)
+        self.assertEqual(MlflowModelVersion.objects.get().run.run_id, "r2")
+        state = MlflowSyncState.objects.get(experiment=self.experiment)
+        self.assertEqual(state.watermark, 300)  # r3 is still running
+        self.assertIsNotNone(state.synced_at)
+
+    def test_incremental_sync_uses_watermark(self):
+        self._sync()
+        self.fake.runs_by_experiment["11"][2] = _run("r3", 300, loss=0.1)
+        self.fake.runs_by_experiment["11"].append(_run("r4", 400, loss=0.3))
+        self.fake.calls.clear()
+
+        self.assertEqual(self._sync(), 2)
+
+        self.assertEqual(self.fake.paths("/api/2.0/mlflow/runs/search")[0][1]["filter"], "attributes.start_time >= 300")
+        self.assertEqual(MlflowRun.objects.get(run_id="r3").metrics.get(key="loss").value, 0.1)
+        self.assertEqual(MlflowSyncState.objects.get(experiment=self.experiment).watermark, 400)
+
+    def test_incremental_sync_refreshes_versions_of_older_runs(self):
+        self._sync()
+        # r1 is below the watermark, so it is not re-read, but gains a version; r2 loses its one
+        self.fake.versions[:] = [{"name": "forecaster", "version": "2", "run_id": "r1", "source": "s3://m/2"}]
+
+        self._sync()
+
+        self.assertEqual(
+            list(MlflowModelVersion.objects.values_list("run__run_id", "version")), [("r1", "2")]
+        )
+
+    def test_full_sync_drops_deleted_runs(self):
+        self._sync()
+        del self.fake.runs_by_experiment["11"][0]
+
+        self._sync(full=True)
+
+        self.assertFalse(MlflowRun.objects.filter(run_id="r1").exists())
+
+    def test_leaderboard_honours_metric_direction(self):
+        self._sync()
+        MetricDirection.objects.create(key="accuracy", higher_is_better=True)
+        url = reverse("metric_leaderboard_api", args=[self.project.id])
+
+        accuracy = self.client.get(url, {"metric": "accuracy", "limit": 2}).json()
+        loss = self.client.get(url, {"metric": "loss"}).json()
+
+        self.assertEqual(accuracy["metric_keys"], ["accuracy", "loss"])
+        self.assertTrue(accuracy["higher_is_better"])
+        self.assertEqual([row["run_id"] for row in accuracy["leaderboard"]], ["r2", "r3"])
+        self.assertEqual([row["run_id"] for row in loss["leaderboard"]], ["r2", "r3", "r1"])
+
+    def test_eval_results_best_metric_honours_direction(self):
+        MetricDirection.objects.create(key="accuracy", higher_is_better=True)
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            body = self.client.get(reverse("eval_results_all", args=[self.project.id])).json()
+
+        self.assertEqual(body["best_metrics"]["accuracy"]["run_id"], "r2")
+        self.assertEqual(body["best_metrics"]["accuracy"]["value"], 0.9)
+
+    def test_eval_results_all_reads_synced_experiments_from_mirror(self):
+        self._sync()
+        MetricDirection.objects.create(key="accuracy", higher_is_better=True)
+        self.fake.calls.clear()
+
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            body = self.client.get(reverse("eval_results_all", args=[self.project.id])).json()
+
+        self.assertEqual(self.fake.calls, [])
+        self.assertEqual(body["latest_run_metrics"]["run_id"], "r3")
+        self.assertEqual(body["best_metrics"]["accuracy"]["run_id"], "r2")
+        self.assertEqual([row["run_id"] for row in body["all_run_metrics_chronological"]], ["r1", "r2", "r3"])
+        self.assertEqual(body["registered_models"][0]["source"], "s3://m/1")
+
+    def test_command_syncs_single_experiment(self):
+        out = io.StringIO()
+        with patch("projects.services.mlflow_client._request", side_effect=self.fake):
+            call_command("sync_mlflow_mirror", experiment=self.experiment.pk, stdout=out)
+
+        self.assertIn("Synced 3 runs", out.getvalue())
+
+
+class FakeS3:
+    """Minimal list_objects_v2/delete_objects over an in-memory, sorted key set."""
+
+    def __init__(self, keys, fail_on_call=None):
+        self.keys = set(keys)
+        self.fail_on_call = fail_on_call
+        self.delete_calls = 0
+        self._lock = threading.Lock()
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys, ContinuationToken=None, StartAfter=None):
+        after = ContinuationToken or StartAfter or ""
+        with self._lock:
+            matching = sorted(key for key in self.keys if key.startswith(Prefix) and key > after)
+        page = matching[:MaxKeys]
+        truncated = len(matching) > MaxKeys
+        return {
+            "Contents": [{"Key": key} for key in page],
+            "IsTruncated": truncated,
+            "NextContinuationToken": page[-1] if truncated else None,
+        }
+
+    def delete_objects(self, Bucket, Delete):
+        with self._lock:
+            self.delete_calls += 1
+            if self.delete_calls == self.fail_on_call:
+                return {"Errors": [{"Key": Delete["Objects"][0]["Key"], "Code": "SlowDown", "Message": "retry"}]}
+            for obj in Delete["Objects"]:
+                self.keys.discard(obj["Key"])
+        return {}
+
+
+class ArtifactPurgeTests(TestCase):
+
+    def setUp(self):
+        self.keys = [f"11/run{i:05d}/artifacts/model.pkl" for i in range(2500)] + ["110/other.txt"]
+
+    def _run(self, s3, **kwargs):
+        with patch("projects.services.artifact_purge.build_minio_client", return_value=s3):
+            purge = enqueue_artifact_purge("11")
+            return purge, run_artifact_purge(purge.pk, **kwargs)
+
+    def test_purges_every_page_of_the_prefix(self):
+        s3 = FakeS3(self.keys)
+
+        purge, status = self._run(s3)
+
+        purge.refresh_from_db()
+        self.assertEqual(status, ArtifactPurge.Status.COMPLETED)
+        self.assertEqual(purge.deleted_count, 2500)
+        self.assertEqual(s3.keys, {"110/other.txt"})
+        self.assertEqual(s3.delete_calls, 3)
+
+    def test_failed_batch_resumes_from_checkpoint(self):
+        s3 = FakeS3(self.keys, fail_on_call=2)
+
+        purge, status = self._run(s3)
+        purge.refresh_from_db()
+        self.assertEqual(status, ArtifactPurge.Status.FAILED)
+        self.assertIn("SlowDown", purge.last_error)
+        self.assertEqual(purge.start_after, "11/run00999/artifacts/model.pkl")
+
+        purge, status = self._run(s3)
+        purge.refresh_from_db()
+        self.assertEqual(status, ArtifactPurge.Status.COMPLETED)
+        self.assertEqual(purge.attempts, 2)
+        self.assertEqual(s3.keys, {"110/other.txt"})
+
+    def test_time_budget_leaves_purge_pending(self):
+        s3 = FakeS3(self.keys)
+
+        with patch("projects.services.artifact_purge.time.monotonic", side_effect=[0, 10, 20, 30, 40]):
+            purge, status = self._run(s3, time_budget=5)
+
+        self.assertEqual(status, ArtifactPurge.Status.PENDING)
+        self.assertTrue(s3.keys - {"110/other.txt"})
+
+
+class DeleteExperimentTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(username="deleter", email="deleter@example.com", password="pass")
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.project = Project.objects.create(name="Doomed", creator=self.user)
+        self.experiment = Experiment.objects.create(
+            project=self.project, creator=self.user, name="a", mlflow_experiment_id="11"
+        )
+
+    @patch("projects.services.artifact_purge.async_task")
+    @patch("projects.services.mlflow_client._request", return_value={})
+    def test_artifacts_are_purged_after_commit(self, mock_request, mock_async):
+        url = reverse("delete_experiment", args=[self.project.id, self.experiment.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Experiment.objects.filter(pk=self.experiment.pk).exists())
+        purge = ArtifactPurge.objects.get(mlflow_experiment_id="11")
+        self.assertEqual(purge.status, ArtifactPurge.Status.PENDING)
+        mock_async.assert_called_once()
+        self.assertEqual(mock_async.call_args.args[1], purge.pk)
+
+
+class ProjectDeletionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.owner = User.objects.create_user(username="owner", email="owner@example.com", password="pass")
+        self.client = Client()
+        self.client.force_login(self.owner)
+        self.project = Project.objects.create(name="Big", creator=self.owner, visibility=True)
+        for mlflow_id in ("11", "12"):
+            Experiment.objects.create(
+                project=self.project, creator=self.owner, name=f"exp {mlflow_id}", mlflow_experiment_id=mlflow_id
+            )
+
+    @staticmethod
+    def _mlflow(failing_ids=(), stages=None):
+        def fake_request(method, path, payload=None, params=None, **kwargs):
+            experiment_id = (payload or params)["experiment_id"]
+            if path == "/api/2.0/mlflow/experiments/get":
+                stage = (stages or {}).get(experiment_id, "active")
+                if stage is None:
+                    raise MlflowClientError("MLflow GET failed with 404: RESOURCE_DOES_NOT_EXIST")
+                return {"experiment": {"experiment_id": experiment_id, "lifecycle_stage": stage}}
+            if experiment_id in failing_ids:
+                raise MlflowClientError("MLflow unavailable")
+            return {}
+        return fake_request
+
+    @patch("projects.services.project_deletion.async_task")
+    @patch("projects.services.mlflow_client._request")
+    def test_request_tombstones_and_hides_project(self, mock_request, mock_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("delete_project", args=[self.project.id]))
+
+        self.assertRedirects(response, reverse("projects_list"), fetch_redirect_response=False)
+        mock_request.assert_not_called()
+        mock_async.assert_called_once()
+        self.assertEqual(mock_async.call_args.args[1], self.project.pk)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.deletion_status, Project.DeletionStatus.DELETING)
+        self.assertEqual(self.project.deletion_total, 2)
+        self.assertFalse(Project.objects.active().filter(pk=self.project.pk).exists())
+        response = self.client.get(reverse("project_details", args=[self.project.id]))
+        self.assertEqual(response.status_code, 404)
+
+    @patch("projects.services.artifact_purge.async_task")
+    @patch("projects.services.project_deletion.async_task")
+    def test_pipeline_deletes_experiments_then_project(self, mock_async, mock_purge_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("delete_project", args=[self.project.id]))
+
+        with patch("projects.services.mlflow_client._request", side_effect=self._mlflow()) as mock_request:
+            self.assertEqual(run_project_deletion(self.project.pk), "deleted")
+
+        # A lifecycle check, a rename and a delete per experiment
+        self.assertEqual(mock_request.call_count, 6)
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertEqual(
+            set(ArtifactPurge.objects.values_list("mlflow_experiment_id", flat=True)), {"11", "12"}
+        )
+
+    @patch("projects.services.artifact_purge.async_task")
+    @patch("projects.services.project_deletion.async_task")
+    def test_experiments_already_retired_in_mlflow_are_cleaned_up_locally(self, mock_async, mock_purge_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("delete_project", args=[self.project.id]))
+
+        # A previous run deleted both in MLflow, then crashed before the local cleanup
+        fake = self._mlflow(failing_ids={"11", "12"}, stages={"11": "deleted", "12": None})
+        with patch("projects.services.mlflow_client._request", side_effect=fake) as mock_request:
+            self.assertEqual(run_project_deletion(self.project.pk), "deleted")
+
+        self.assertEqual(
+            [c.args[1] for c in mock_request.call_args_list], ["/api/2.0/mlflow/experiments/get"] * 2
+        )
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+
+    @patch("projects.services.project_deletion.time")
+    @patch("projects.services.artifact_purge.async_task")
+    @patch("projects.services.project_deletion.async_task")
+    def test_failed_experiment_keeps_tombstone_and_can_be_retried(self, mock_async, mock_purge_async, mock_time):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("delete_project", args=[self.project.id]))
+
+        with patch("projects.services.mlflow_client._request", side_effect=self._mlflow({"12"})):
+            status = run_project_deletion(self.project.pk)
+
+        self.assertEqual(status, Project.DeletionStatus.FAILED)
+        self.assertEqual(mock_time.sleep.call_count, 2)
+        self.project.refresh_from_db()
+        self.assertEqual(list(self.project.experiments.values_list("mlflow_experiment_id", flat=True)), ["12"])
+        progress = project_deletion_progress(self.project)
+        self.assertEqual((progress["deleted_experiments"], progress["total_experiments"]), (1, 2))
+        self.assertIn("MLflow unavailable", progress["error"])
+
+        response = self.client.get(reverse("project_deletion_status", args=[self.project.id]))
+        self.assertEqual(response.json()["status"], "failed")
+        stranger = User.objects.create_user(username="stranger", email="stranger@example.com", password="pass")
+        self.client.force_login(stranger)
+        self.assertEqual(self.client.get(reverse("project_deletion_status", args=[self.project.id])).status_code, 404)
+        self.assertEqual(self.client.post(reverse("delete_project", args=[self.project.id])).status_code, 404)
+
+        self.client.force_login(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("delete_project", args=[self.project.id]))
+        self.assertEqual(mock_async.call_count, 2)
+        with patch("projects.services.mlflow_client._request", side_effect=self._mlflow()):
+            self.assertEqual(run_project_deletion(self.project.pk), "deleted")
+
+    @patch("projects.services.project_deletion.async_task")
+    def test_stale_deletion_is_requeued(self, mock_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("delete_project", args=[self.project.id]))
+            self.client.post(reverse("delete_project", args=[self.project.id]))
+        self.assertEqual(mock_async.call_count, 1)
+
+        # The worker died without finishing or failing the deletion
+        Project.objects.filter(pk=self.project.pk).update(
+            deletion_requested_at=timezone.now() - timedelta(hours=2)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("delete_project", args=[self.project.id]))
+
+        self.assertEqual(mock_async.call_count, 2)
+        self.project.refresh_from_db()
+        self.assertGreater(self.project.deletion_requested_at, timezone.now() - timedelta(minutes=1))
@@ -12,6 +12,8 @@ from .views import (
     eval_results,
     eval_results_all,
     experiments_list,
+    metric_leaderboard_api,
+    project_deletion_status,
     project_creation_success,
     project_details,
     project_index,
@@ -24,6 +26,7 @@ urlpatterns = [
     path('data/', ProjectsListJson.as_view(), name='projects_list_json'),
     path('project/<int:project_id>/', project_details, name='project_details'),
     path('project/<int:project_id>/delete/', delete_project, name='delete_project'),
+    path('project/<int:project_id>/deletion-status/', project_deletion_status, name='project_deletion_status'),
     path('project/<int:project_id>/experiments/', experiments_list, name='experiments_list'),
     # path(
     #     'project/<int:project_id>/experiments/add/',
@@ -55,6 +58,11 @@ urlpatterns = [
         eval_results_all,
         name='eval_results_all',
     ),
+    path(
+        'project/<int:project_id>/experiments/leaderboard/',
+        metric_leaderboard_api,
+        name='metric_leaderboard_api',
+    ),
     path('project-creation/', AddProjectView.as_view(PROJECT_FORMS), name='project_creation'),
     path('project-creation/success/', project_creation_success, name='project_creation_success'),
 ]
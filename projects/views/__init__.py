@@ -14,6 +14,8 @@ from .experiments import (
     eval_results,
     eval_results_all,
     experiments_list,
+    metric_leaderboard_api,
+    project_deletion_status,
 )
 from .listing import ProjectsListJson, projects_list
 
@@ -30,6 +32,8 @@ __all__ = [
     "eval_results",
     "eval_results_all",
     "experiments_list",
+    "metric_leaderboard_api",
+    "project_deletion_status",
     "project_creation_success",
     "project_details",
     "project_index",
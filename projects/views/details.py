@@ -7,7 +7,7 @@ from django.utils import timezone
 
 from ..forms import EditProjectForm
 from ..models import Project
-from ..services import MlflowClientError, list_experiment_runs
+from ..services import MlflowClientError, list_experiment_runs, map_concurrently, mlflow_auth_headers
 
 
 def _can_access_project(user, project: Project) -> bool:
@@ -16,17 +16,19 @@ def _can_access_project(user, project: Project) -> bool:
 
 def _latest_project_run_datetime(project: Project, user):
     latest_start_time_ms: int | None = None
+    mlflow_experiment_ids = [
+        (experiment.mlflow_experiment_id or "").strip()
+        for experiment in project.experiments.only("mlflow_experiment_id").all()
+    ]
+    headers = mlflow_auth_headers(user=user)
 
-    for experiment in project.experiments.only("mlflow_experiment_id").all():
-        mlflow_experiment_id = (experiment.mlflow_experiment_id or "").strip()
-        if not mlflow_experiment_id:
-            continue
-
+    def _latest_run(mlflow_experiment_id: str) -> list:
         try:
-            runs = list_experiment_runs(mlflow_experiment_id, max_results=1, user=user)
+            return list_experiment_runs(mlflow_experiment_id, max_results=1, user=user, headers=headers)
         except MlflowClientError:
-            continue
+            return []
 
+    for runs in map_concurrently(_latest_run, [i for i in mlflow_experiment_ids if i]):
         if not runs:
             continue
 
@@ -51,7 +53,8 @@ def _latest_project_run_datetime(project: Project, user):
 def project_details(request, project_id):
     try:
         project = (
-            Project.objects.select_related("creator")
+            Project.objects.active()
+            .select_related("creator")
             .prefetch_related("collaborators__profile")
             .get(pk=project_id)
         )
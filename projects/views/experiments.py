@@ -9,6 +9,7 @@ logger = logging.getLogger(__name__)
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import DatabaseError, transaction
+from django.db.models import Min
 from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_GET, require_POST
@@ -16,23 +17,31 @@ from django.views.decorators.http import require_GET, require_POST
 from core.views import BaseWizardView
 
 from ..forms import ExperimentEditForm, ExperimentGeneralInfoForm
-from ..models import Experiment, Project
+from ..models import Experiment, MlflowRunMetric, MlflowSyncState, Project
 from ..services import (
     MlflowClientError,
     create_experiment_permission as mlflow_create_experiment_permission,
     create_experiment as mlflow_create_experiment,
-    delete_artifacts_from_object_storage as mlflow_delete_artifacts_from_object_storage,
     delete_experiment as mlflow_delete_experiment,
-    list_experiment_runs,
+    enqueue_artifact_purge,
+    higher_is_better_metrics,
+    is_better,
     make_deleted_experiment_name as mlflow_make_deleted_experiment_name,
+    metric_leaderboard,
+    mirrored_model_versions,
+    mirrored_runs,
+    project_deletion_progress,
+    request_project_deletion,
     set_experiment_tags as mlflow_set_experiment_tags,
     update_experiment_name as mlflow_update_experiment_name,
 )
 from .creation import _cleanup_mlflow_experiment
 from ..services.mlflow_client import (
-    list_registered_model_versions_for_run,
+    list_registered_model_versions_for_runs,
     make_registered_model_links,
+    summarize_experiment_runs,
 )
+from ..services.run_metrics import RunMetricsAggregator
 
 '''
 EXPERIMENT_TEMPLATE_NAMES = {
@@ -51,7 +60,7 @@ def _user_can_access_project(user, project: Project) -> bool:
 
 
 def _get_accessible_project_or_404(user, project_id: int) -> Project:
-    project = get_object_or_404(Project.objects.select_related("creator"), pk=project_id)
+    project = get_object_or_404(Project.objects.active().select_related("creator"), pk=project_id)
     if not _user_can_access_project(user, project):
         raise Http404("Project not found")
     return project
@@ -63,11 +72,6 @@ class ExperimentDeletionError(Exception):
 
 def _delete_experiment_strict(project: Project, experiment: Experiment, user) -> None:
     if experiment.mlflow_experiment_id:
-        try:
-            mlflow_delete_artifacts_from_object_storage(experiment.mlflow_experiment_id)
-        except MlflowClientError as exc:
-            raise ExperimentDeletionError(f"failed to delete artifacts: {exc}") from exc
-
         try:
             mlflow_update_experiment_name(
                 experiment.mlflow_experiment_id,
@@ -80,6 +84,9 @@ def _delete_experiment_strict(project: Project, experiment: Experiment, user) ->
 
     try:
         experiment.delete()
+        # Artifacts are purged by a background job once the deletion commits;
+        # the purge record keeps its checkpoint if that job is interrupted.
+        enqueue_artifact_purge(experiment.mlflow_experiment_id)
     except Exception as exc:
         raise ExperimentDeletionError(f"failed to delete local database record: {exc}") from exc
 
@@ -198,37 +205,34 @@ def create_experiment_modal(request, project_id: int):
 @login_required
 @require_POST
 def delete_project(request, project_id: int):
-    project = _get_accessible_project_or_404(request.user, project_id)
+    project = get_object_or_404(Project.objects.select_related("creator"), pk=project_id)
     if project.creator_id != request.user.id:
+        if project.is_deleting or not _user_can_access_project(request.user, project):
+            raise Http404("Project not found")
         messages.error(request, "Only project owner can delete this project.")
         return redirect("project_details", project_id=project.id)
 
-    project_name = project.name
+    # Owners may re-request deletion of a tombstoned project whose previous
+    # attempt failed or went stale; the background job only revisits what is left.
     try:
-        with transaction.atomic():
-            locked_project = Project.objects.select_for_update(nowait=True).get(pk=project.id)
-            experiments = list(
-                Experiment.objects.select_for_update(nowait=True).filter(project_id=locked_project.id).order_by("id")
-            )
-            for experiment in experiments:
-                _delete_experiment_strict(locked_project, experiment, request.user)
-            locked_project.delete()
+        request_project_deletion(project.id)
     except DatabaseError:
         messages.error(request, "Project deletion is already in progress. Please try again in a moment.")
-        return redirect("project_details", project_id=project.id)
-    except ExperimentDeletionError:
-        logger.exception("Project %s deletion stopped", project.id)
-        messages.error(request, f'Project "{project.name}" could not be deleted. Please try again or contact support if the issue persists.')
-        return redirect("project_details", project_id=project.id)
-    except Exception:
-        logger.exception("Project %s deletion failed at database step", project.id)
-        messages.error(request, f'Project "{project_name}" could not be deleted. Please try again or contact support if the issue persists.')
+        if project.is_deleting:
+            return redirect("projects_list")
         return redirect("project_details", project_id=project.id)
 
-    messages.success(request, f'Project "{project_name}" deleted successfully.')
+    messages.success(request, f'Project "{project.name}" is being deleted. You can follow its progress from your projects list.')
     return redirect("projects_list")
 
 
+@login_required
+@require_GET
+def project_deletion_status(request, project_id: int):
+    project = get_object_or_404(Project, pk=project_id, creator_id=request.user.id)
+    return JsonResponse(project_deletion_progress(project))
+
+
 @login_required
 @require_POST
 def delete_experiment(request, project_id: int, experiment_id: int):
@@ -341,57 +345,77 @@ def experiments_list(request, project_id: int):
     )
 
 
-def _extract_eval_payload(experiment: Experiment, user) -> dict[str, Any]:
-    if not experiment.mlflow_experiment_id:
-        return {
-            "latest_run_metrics": {},
-            "best_metrics": {},
-            "all_run_metrics_chronological": [],
-            "registered_models": [],
+def _extract_eval_payloads(
+    experiments, user, higher_is_better: frozenset[str] | None = None
+) -> dict[int, dict[str, Any]]:
+    """Evaluation payloads keyed by experiment pk.
+
+    Each experiment's runs are streamed and summarised in parallel, then the
+    registered model versions of all their runs come from batched searches.
+    """
+    experiments = list(experiments)
+    mlflow_ids = [experiment.mlflow_experiment_id for experiment in experiments if experiment.mlflow_experiment_id]
+    if higher_is_better is None:
+        higher_is_better = higher_is_better_metrics()
+    summaries = (
+        summarize_experiment_runs(mlflow_ids, user=user, higher_is_better=higher_is_better)
+        if mlflow_ids
+        else {}
+    )
+    run_ids = [
+        row.get("run_id")
+        for summary in summaries.values()
+        for row in summary["all_run_metrics_chronological"]
+    ]
+    versions_by_run = list_registered_model_versions_for_runs(run_ids, user=user) if run_ids else {}
+
+    payloads: dict[int, dict[str, Any]] = {}
+    for experiment in experiments:
+        summary = summaries.get(str(experiment.mlflow_experiment_id)) if experiment.mlflow_experiment_id else None
+        summary = summary or RunMetricsAggregator().summary()
+        payloads[experiment.id] = {
+            **summary,
+            "registered_models": _registered_models(summary["all_run_metrics_chronological"], versions_by_run),
         }
+    return payloads
 
-    runs = list_experiment_runs(experiment.mlflow_experiment_id, max_results=1000, user=user)
-    run_rows: list[dict[str, Any]] = []
-
-    for run in runs:
-        info = run.get("info", {})
-        data = run.get("data", {})
-        run_id = info.get("run_id")
-        metrics = {m.get("key"): m.get("value") for m in data.get("metrics", []) if m.get("key")}
-        # params = {p.get("key"): p.get("value") for p in data.get("params", []) if p.get("key")}
-        # run_tags = {t.get("key"): t.get("value") for t in data.get("tags", []) if t.get("key")}
-
-        run_rows.append(
-            {
-                "run_id": run_id,
-                "status": info.get("status"),
-                "start_time": info.get("start_time"),
-                "end_time": info.get("end_time"),
-                "metrics": metrics,
-                # "params": params,
-                # "tags": run_tags,
-            }
-        )
 
-    # MLflow search API returns newest first; normalize to chronological.
-    run_rows.sort(key=lambda row: (row.get("start_time") or 0, row.get("end_time") or 0))
+def _mirrored_eval_payloads(
+    experiments, user, higher_is_better: frozenset[str]
+) -> dict[int, dict[str, Any]]:
+    """Evaluation payloads keyed by experiment pk, read from the local MLflow mirror.
 
-    latest_run_metrics = run_rows[-1] if run_rows else {}
+    Experiments the mirror has not synced yet fall back to live MLflow reads.
+    """
+    experiments = list(experiments)
+    synced_ids = set(
+        MlflowSyncState.objects
+        .filter(experiment__in=experiments, synced_at__isnull=False)
+        .values_list("experiment_id", flat=True)
+    )
+    runs_by_experiment = mirrored_runs(list(synced_ids))
+    versions_by_run = mirrored_model_versions(list(synced_ids))
+
+    payloads: dict[int, dict[str, Any]] = {}
+    for experiment_id, runs in runs_by_experiment.items():
+        summary = RunMetricsAggregator(higher_is_better).extend(runs).summary()
+        payloads[experiment_id] = {
+            **summary,
+            "registered_models": _registered_models(summary["all_run_metrics_chronological"], versions_by_run),
+        }
+    unsynced = [experiment for experiment in experiments if experiment.id not in synced_ids]
+    if unsynced:
+        payloads.update(_extract_eval_payloads(unsynced, user, higher_is_better))
+    return payloads
 
-    best_metrics: dict[str, dict[str, Any]] = {}
-    for row in run_rows:
-        for metric_name, metric_value in (row.get("metrics") or {}).items():
-            try:
-                numeric_value = float(metric_value)
-            except (TypeError, ValueError):
-                continue
-            current_best = best_metrics.get(metric_name)
-            # TODO: Change to comply with the metric (for some larger is better)
-            if current_best is None or numeric_value < current_best["value"]:
-                best_metrics[metric_name] = {
-                    "value": numeric_value,
-                    "run_id": row.get("run_id"),
-                }
+
+def _extract_eval_payload(experiment: Experiment, user) -> dict[str, Any]:
+    return _extract_eval_payloads([experiment], user)[experiment.id]
+
+
+def _registered_models(
+    run_rows: list[dict[str, Any]], versions_by_run: dict[str, list[dict[str, Any]]]
+) -> list[dict[str, Any]]:
     run_metrics_by_id = {
         str(row.get("run_id")): row.get("metrics") or {}
         for row in run_rows
@@ -404,7 +428,7 @@ def _extract_eval_payload(experiment: Experiment, user) -> dict[str, Any]:
         run_id = row.get("run_id")
         if not run_id:
             continue
-        for version in list_registered_model_versions_for_run(run_id, user=user):
+        for version in versions_by_run.get(str(run_id), []):
             name = str(version.get("name") or "").strip()
             model_version = str(version.get("version") or "").strip()
             if not name:
@@ -426,16 +450,7 @@ def _extract_eval_payload(experiment: Experiment, user) -> dict[str, Any]:
                     "model_version_link": links["model_version_link"],
                 }
             )
-
-    return {
-        "latest_run_metrics": latest_run_metrics,
-        "best_metrics": best_metrics,
-        "all_run_metrics_chronological": [
-            {"run_id": row.get("run_id"), "metrics": row.get("metrics") or {}}
-            for row in run_rows
-        ],
-        "registered_models": registered_models,
-    }
+    return registered_models
 
 
 @login_required
@@ -472,7 +487,7 @@ def eval_results(request, project_id: int, experiment_id: int):
 @require_GET
 def eval_results_all(request, project_id: int):
     project = _get_accessible_project_or_404(request.user, project_id)
-    experiments = project.experiments.all().order_by("id")
+    experiments = list(project.experiments.all().order_by("id"))
 
     latest_run_metrics: dict[str, Any] = {}
     best_metrics: dict[str, dict[str, Any]] = {}
@@ -480,8 +495,10 @@ def eval_results_all(request, project_id: int):
     registered_models: list[dict[str, Any]] = []
     seen_models: set[tuple[str, str]] = set()
 
+    higher_is_better = higher_is_better_metrics()
+    payloads = _mirrored_eval_payloads(experiments, request.user, higher_is_better)
     for experiment in experiments:
-        extracted = _extract_eval_payload(experiment, request.user)
+        extracted = payloads[experiment.id]
         experiment_ref = {
             "experiment_id": experiment.id,
             "experiment_name": experiment.name,
@@ -511,7 +528,9 @@ def eval_results_all(request, project_id: int):
                 candidate_numeric = float(candidate_value)
             except (TypeError, ValueError):
                 continue
-            if current_best is None or candidate_numeric < float(current_best["value"]):
+            if current_best is None or is_better(
+                metric_name, candidate_numeric, float(current_best["value"]), higher_is_better
+            ):
                 best_metrics[metric_name] = {
                     "value": candidate_numeric,
                     "run_id": metric_data.get("run_id"),
@@ -537,3 +556,35 @@ def eval_results_all(request, project_id: int):
             "registered_models": registered_models,
         }
     )
+
+
+@login_required
+@require_GET
+def metric_leaderboard_api(request, project_id: int):
+    """Best runs for one metric across a project's experiments, from the local MLflow mirror."""
+    project = _get_accessible_project_or_404(request.user, project_id)
+    metric = (request.GET.get("metric") or "").strip()
+    try:
+        limit = min(max(int(request.GET.get("limit", 10)), 1), 100)
+    except ValueError:
+        limit = 10
+
+    metric_keys = list(
+        MlflowRunMetric.objects
+        .filter(experiment__project=project)
+        .values_list("key", flat=True)
+        .distinct()
+        .order_by("key")
+    )
+    synced_at = (
+        MlflowSyncState.objects.filter(experiment__project=project).aggregate(oldest=Min("synced_at"))["oldest"]
+    )
+    return JsonResponse(
+        {
+            "metric": metric,
+            "higher_is_better": metric in higher_is_better_metrics(),
+            "metric_keys": metric_keys,
+            "synced_at": synced_at.isoformat() if synced_at else None,
+            "leaderboard": metric_leaderboard(project.id, metric, limit=limit) if metric else [],
+        }
+    )
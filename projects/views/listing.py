@@ -6,6 +6,7 @@ from django.shortcuts import render
 from django_datatables_view.base_datatable_view import BaseDatatableView
 
 from ..models import Project
+from ..services import project_deletion_progress
 
 
 class ProjectsListJson(LoginRequiredMixin, BaseDatatableView):
@@ -30,7 +31,7 @@ class ProjectsListJson(LoginRequiredMixin, BaseDatatableView):
     max_display_length = 25
 
     def get_initial_queryset(self):
-        return Project.objects.prefetch_related("collaborators").all()
+        return Project.objects.active().prefetch_related("collaborators")
 
     def render_column(self, row, column):
         if column == "created_at":
@@ -69,8 +70,15 @@ class ProjectsListJson(LoginRequiredMixin, BaseDatatableView):
 
 @login_required
 def projects_list(request):
-    my_qs = Project.objects.filter(creator_id=request.user.id)
-    public_qs = Project.objects.filter(visibility=True).exclude(creator_id=request.user.id)
+    my_qs = Project.objects.active().filter(creator_id=request.user.id)
+    public_qs = Project.objects.active().filter(visibility=True).exclude(creator_id=request.user.id)
+
+    deleting_projects = [
+        project_deletion_progress(project)
+        for project in Project.objects.filter(creator_id=request.user.id)
+        .exclude(deletion_status=Project.DeletionStatus.ACTIVE)
+        .order_by("deletion_requested_at")
+    ]
 
     my_counts = {
         "all": my_qs.count(),
@@ -105,6 +113,7 @@ def projects_list(request):
             "my_projects_num": my_counts,
             "public_projects_num": public_counts,
             "type_tabs": type_tabs,
+            "deleting_projects": deleting_projects,
             "type_filter": type_filter,
             "active_tab": active_tab,
             "active_navbar_page": "projects",
@@ -156,7 +156,7 @@ def _sync_trustworthiness(request, state):
     try:
         from projects.models import Project
         from trustworthiness.models import Assessment as TWAssessment
-        project = Project.objects.get(id=int(project_id))
+        project = Project.objects.active().get(id=int(project_id))
         if not project.is_accessible_by(request.user):
             logger.warning(
                 "User %s denied access to project_id=%s for Assessment creation",
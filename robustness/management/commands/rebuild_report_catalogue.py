@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import ReportCatalogueEntry
+from core.services import ReportStoreError, get_report_store
+from robustness.views import REPORT_NAMESPACE
+
+# Earlier names win when a directory holds more than one report file.
+VOLUME_REPORT_FILES = ("final_report.json", "metrics.json")
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the robustness report catalogue from the report store and any "
+        "report files left on the REPORTS_DIR volume."
+    )
+
+    def handle(self, *args, **options):
+        entries = {}
+        try:
+            for job_id, modified in get_report_store().iter_reports(REPORT_NAMESPACE, "final_report"):
+                entries[job_id] = ReportCatalogueEntry(
+                    namespace=REPORT_NAMESPACE,
+                    job_id=job_id,
+                    storage=ReportCatalogueEntry.Storage.STORE,
+                    reported_at=modified,
+                )
+        except ReportStoreError as exc:
+            raise CommandError(f"Could not list the report store: {exc}") from exc
+        stored = len(entries)
+
+        reports_dir = Path(settings.REPORTS_DIR)
+        if reports_dir.is_dir():
+            for filename in VOLUME_REPORT_FILES:
+                for path in reports_dir.rglob(filename):
+                    job_id = path.parent.relative_to(reports_dir).as_posix()
+                    if job_id == ".":
+                        job_id = path.stem
+                    if job_id in entries:
+                        continue
+                    entries[job_id] = ReportCatalogueEntry(
+                        namespace=REPORT_NAMESPACE,
+                        job_id=job_id,
+                        storage=ReportCatalogueEntry.Storage.FILE,
+                        path=str(path.resolve()),
+                        reported_at=datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc),
+                    )
+
+        with transaction.atomic():
+            ReportCatalogueEntry.objects.filter(namespace=REPORT_NAMESPACE).delete()
+            ReportCatalogueEntry.objects.bulk_create(entries.values(), batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Catalogued {len(entries)} robustness reports ({stored} stored, {len(entries) - stored} on the reports volume)."
+        ))
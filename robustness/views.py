@@ -10,36 +10,25 @@ logger = logging.getLogger(__name__)
 
 
 def fetch_metrics_json():
-    # Prefer an explicit report path, then the latest persisted run, then a demo fallback.
+    # Prefer an explicit report path, then the latest catalogued run, then a demo fallback.
     from pathlib import Path
 
-    from django.conf import settings
-
-    candidates = []
-
     env_path = os.getenv("ROBUSTNESS_REPORT_JSON")
-    if env_path:
-        candidates.append(Path(env_path).expanduser())
-
-    reports_dir = Path(getattr(settings, "REPORTS_DIR", ""))
-    if reports_dir.exists():
-        for filename in ("final_report.json", "metrics.json"):
-            matches = sorted(
-                reports_dir.rglob(filename),
-                key=lambda path: path.stat().st_mtime,
-                reverse=True,
-            )
-            candidates.extend(matches)
-
-    candidates.append(
-        Path(__file__).resolve().parents[2]
-        / "outputs/mlflow/blackbox_pytorch_regression/metrics.json"
-    )
+    if env_path and Path(env_path).expanduser().exists():
+        with open(Path(env_path).expanduser(), "r", encoding="utf-8") as f:
+            return json.load(f)
 
-    for json_path in candidates:
-        if not json_path.exists():
-            continue
-        with open(json_path, "r", encoding="utf-8") as f:
+    try:
+        data = latest_report(REPORT_NAMESPACE)
+    except (ReportStoreError, OSError, ValueError):
+        logger.exception("Failed to load the latest robustness report")
+        data = None
+    if data is not None:
+        return data
+
+    demo_path = Path(__file__).resolve().parents[2] / "outputs/mlflow/blackbox_pytorch_regression/metrics.json"
+    if demo_path.exists():
+        with open(demo_path, "r", encoding="utf-8") as f:
             return json.load(f)
 
     raise FileNotFoundError(
@@ -114,6 +103,8 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
 
+from core.services import ReportStoreError, get_client, get_report_store, latest_report, record_report
+
 
 # ---------------------------------------------------------------------------
 # In-memory job store (thread-safe)
@@ -122,6 +113,7 @@ from django.utils import timezone
 EVAL_JOBS = {}
 EVAL_JOBS_LOCK = threading.Lock()
 REPORTS_DIR = Path(settings.REPORTS_DIR)
+REPORT_NAMESPACE = "robustness"
 
 
 def _robustness_context(context=None):
@@ -154,47 +146,38 @@ def _get_job(job_id):
 # Persistence helpers
 # ---------------------------------------------------------------------------
 
-def _report_paths(job_id):
-    job_dir = REPORTS_DIR / str(job_id)
-    return {
-        "job_dir": job_dir,
-        "report": job_dir / "final_report.json",
-        "meta": job_dir / "meta.json",
-    }
-
-
 def _persist_result(job_id, config_name, result, backend_job_id=None, assessment_id=None):
-    paths = _report_paths(job_id)
-    paths["job_dir"].mkdir(parents=True, exist_ok=True)
-    paths["report"].write_text(json.dumps(result, indent=2), encoding="utf-8")
     meta = {"job_id": job_id, "config_name": config_name, "backend_job_id": backend_job_id}
     if assessment_id is not None:
         meta["assessment_id"] = assessment_id
-    paths["meta"].write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    store = get_report_store()
+    store.save(REPORT_NAMESPACE, job_id, "final_report", result)
+    store.save(REPORT_NAMESPACE, job_id, "meta", meta)
+    record_report(REPORT_NAMESPACE, job_id)
 
 
 def _load_persisted(job_id):
-    paths = _report_paths(job_id)
-    if not paths["report"].exists():
-        return None
+    store = get_report_store()
     try:
-        result = json.loads(paths["report"].read_text(encoding="utf-8"))
-    except (OSError, ValueError):
+        result = store.load(REPORT_NAMESPACE, job_id, "final_report")
+    except (ReportStoreError, OSError, ValueError):
+        logger.exception("Failed to load stored robustness report for job %s", job_id)
+        return None
+    if result is None:
         return None
 
     config_name = "Stored report"
     backend_job_id = None
     assessment_id = None
-    if paths["meta"].exists():
-        try:
-            meta = json.loads(paths["meta"].read_text(encoding="utf-8"))
-            if isinstance(meta, dict):
-                if meta.get("config_name"):
-                    config_name = str(meta["config_name"])
-                backend_job_id = meta.get("backend_job_id")
-                assessment_id = meta.get("assessment_id")
-        except (OSError, ValueError):
-            pass
+    try:
+        meta = store.load(REPORT_NAMESPACE, job_id, "meta")
+    except (ReportStoreError, OSError, ValueError):
+        meta = None
+    if isinstance(meta, dict):
+        if meta.get("config_name"):
+            config_name = str(meta["config_name"])
+        backend_job_id = meta.get("backend_job_id")
+        assessment_id = meta.get("assessment_id")
 
     return {"status": "completed", "result": result, "config_name": config_name, "error": None, "backend_job_id": backend_job_id, "assessment_id": assessment_id}
 
@@ -261,7 +244,7 @@ def _call_backend_api(config_name, temp_path):
 
     try:
         with open(temp_path, "rb") as f:
-            resp = requests.post(
+            resp = get_client("robustness").post(
                 f"{api_url}/api/evaluations",
                 files={"config": (Path(temp_path).name, f, "application/x-yaml")},
                 timeout=submit_timeout,
@@ -285,7 +268,7 @@ def _call_backend_api(config_name, temp_path):
         deadline = time.time() + max(total_timeout, 1)
 
         while time.time() < deadline:
-            status_resp = requests.get(status_url, timeout=poll_timeout)
+            status_resp = get_client("robustness").get(status_url, timeout=poll_timeout)
             if status_resp.status_code != 200:
                 raise RuntimeError(
                     f"Backend status fetch failed ({status_resp.status_code}): {status_resp.text}"
@@ -307,7 +290,7 @@ def _call_backend_api(config_name, temp_path):
             )
 
         while time.time() < deadline:
-            metrics_resp = requests.get(metrics_url, timeout=poll_timeout)
+            metrics_resp = get_client("robustness").get(metrics_url, timeout=poll_timeout)
             if metrics_resp.status_code == 200:
                 return metrics_resp.json(), backend_job_id
             if metrics_resp.status_code != 404:
@@ -426,7 +409,7 @@ def _create_assessment(user, project_id, input_data, parent_assessment=None):
     try:
         from projects.models import Project
         from trustworthiness.models import Assessment
-        project = Project.objects.get(id=int(project_id))
+        project = Project.objects.active().get(id=int(project_id))
         if not project.is_accessible_by(user):
             logger.warning("User %s denied access to project_id=%s for Assessment creation", user.id, project_id)
             return None
@@ -741,7 +724,7 @@ def list_adversarial_csvs_view(request, job_id):
         return JsonResponse({"items": []})
 
     try:
-        resp = requests.get(
+        resp = get_client("robustness").get(
             f"{api_url}/api/evaluations/{backend_job_id}/adversarial-examples",
             timeout=10,
         )
@@ -772,7 +755,7 @@ def download_adversarial_csv_view(request, job_id, attack_key):
         return JsonResponse({"error": "Backend API not configured."}, status=503)
 
     try:
-        resp = requests.get(
+        resp = get_client("robustness").get(
             f"{api_url}/api/evaluations/{backend_job_id}/adversarial-examples/{attack_key}",
             timeout=30,
             stream=True,
@@ -118,7 +118,7 @@ def trustworthiness(request):
     from projects.models import Project
 
     projects = list(
-        Project.objects
+        Project.objects.active()
         .filter(Q(creator=request.user) | Q(collaborators=request.user))
         .distinct()
         .annotate(experiments_count=Count('experiments', distinct=True))